@@ -28,3 +28,60 @@ DOC_TOPICS_FILE = os.getenv("DOC_TOPICS_FILE", "artifacts/doc_topics.csv")
 HASHTAG_STATS_FILE = os.getenv("HASHTAG_STATS_FILE", "artifacts/hashtag_stats.parquet")
 VIDLINK_MAP_FILE = os.getenv("VIDLINK_MAP_FILE", "artifacts/vidlink_map.csv")
 EVENTS_FILE = os.getenv("EVENTS_FILE", "artifacts/event_masterv2.parquet")
+SOURCE_FILES = {
+    "videos": VIDEOS_FILE,
+    "topics": TOPICS_FILE,
+    "doc_topics": DOC_TOPICS_FILE,
+    "hashtag_stats": HASHTAG_STATS_FILE,
+    "vidlink_map": VIDLINK_MAP_FILE,
+    "events": EVENTS_FILE,
+}
+
+# compiled snapshot of the sources above (scripts/compile_snapshot.py); empty = always merge sources
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR", "artifacts/snapshot")
+
+# response cache (idempotent trending/search endpoints)
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "512"))
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "300"))
+
+# pre-serialized per-video card bytes spliced into orjson responses
+CARD_FRAGMENTS = os.getenv("CARD_FRAGMENTS", "1").lower() not in ("0", "false", "no")
+
+# query embeddings (semantic search)
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "firqaaa/indo-sentence-bert-base")
+# encoder backend: torch (SentenceTransformer) | onnx (ONNX Runtime export, scripts/export_onnx_encoder.py)
+ENCODER_BACKEND = os.getenv("ENCODER_BACKEND", "torch")
+ENCODER_ONNX_DIR = os.getenv("ENCODER_ONNX_DIR", "artifacts/encoder_onnx")
+ENCODER_ONNX_QUANTIZED = os.getenv("ENCODER_ONNX_QUANTIZED", "1").lower() not in ("0", "false", "no")
+ENCODER_MAX_SEQ_LENGTH = int(os.getenv("ENCODER_MAX_SEQ_LENGTH", "64"))  # tokens per query; 0 = model default
+ENCODER_THREADS = int(os.getenv("ENCODER_THREADS", "0"))  # ONNX Runtime intra-op threads; 0 = default
+QUERY_CACHE_SIZE = int(os.getenv("QUERY_CACHE_SIZE", "4096"))
+QUERY_CACHE_DIR = os.getenv("QUERY_CACHE_DIR", "")  # empty = memory only
+ENCODER_BATCH_WINDOW_MS = float(os.getenv("ENCODER_BATCH_WINDOW_MS", "5"))
+ENCODER_MAX_BATCH = int(os.getenv("ENCODER_MAX_BATCH", "32"))
+
+# semantic search startup: eager (load model + FAISS index before serving), background
+# (serve right away, load in a background thread) or on_demand (load on the first semantic request)
+SEMANTIC_LOAD = os.getenv("SEMANTIC_LOAD", "background")
+SEMANTIC_WAIT_SECONDS = float(os.getenv("SEMANTIC_WAIT_SECONDS", "30"))  # semantic requests wait this long for a lazy load
+
+# inference executor (FAISS search for explore / similar videos; bounds queued query encodes too)
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", "2"))
+INFERENCE_MAX_QUEUE = int(os.getenv("INFERENCE_MAX_QUEUE", "32"))
+INFERENCE_WAIT_TIMEOUT_SECONDS = float(os.getenv("INFERENCE_WAIT_TIMEOUT_SECONDS", "10"))  # longest wait on a queued encode
+
+# FAISS index variant (see scripts/build_faiss_index.py) and query-time tuning
+FAISS_INDEX_TYPE = os.getenv("FAISS_INDEX_TYPE", "flat")  # flat | ivf_flat | hnsw | ivf_pq
+FAISS_NPROBE = int(os.getenv("FAISS_NPROBE", "16"))
+FAISS_EF_SEARCH = int(os.getenv("FAISS_EF_SEARCH", "64"))
+FAISS_MMAP = os.getenv("FAISS_MMAP", "1").lower() not in ("0", "false", "no")
+
+# "more like this" (/api/videos/{id}/similar)
+SIMILAR_PRECOMPUTE_TOP_N = int(os.getenv("SIMILAR_PRECOMPUTE_TOP_N", "1000"))
+SIMILAR_K = int(os.getenv("SIMILAR_K", "24"))
+
+# hot reload of data artifacts (POST /api/system/reload, or polling when > 0)
+RELOAD_POLL_SECONDS = float(os.getenv("RELOAD_POLL_SECONDS", "0"))
+RELOAD_DRAIN_TIMEOUT_SECONDS = float(os.getenv("RELOAD_DRAIN_TIMEOUT_SECONDS", "10"))
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")  # empty = reload endpoint disabled
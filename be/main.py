@@ -2,147 +2,333 @@ from __future__ import annotations
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-import faiss
 import numpy as np
-from sentence_transformers import SentenceTransformer
-import pandas as pd
-import json
-import re
+import os
+import asyncio
+import threading
 from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict
 
 import config
-from utils.data_loaders import extract_topic_keywords
-from routes import search, explore, trending,events
+from utils.data_loaders import artifacts_version
+from utils.snapshot import load_data, SOURCE_KEYS, META_FILE
+from utils.reload import SwapGate, SwapGateMiddleware, Reloader
+from utils.lazy_loader import LazyLoader
+from utils.response_cache import response_cache
+from utils.pagination import ranking_cache
+from utils.fast_json import ORJSONResponse
+from utils.query_encoder import QueryEmbeddingCache, BatchingEncoder
+from utils.encoder_backends import load_query_model
+from utils.inference import InferenceExecutor
+from utils.faiss_index import index_path, load_index, apply_search_params, describe
+from utils.startup_report import StartupReport
+from utils.similar_videos import SimilarVideos
+from utils.corpus import build_corpus
+from utils.trend_stats import TrendStats
+from utils.rollup import HourlyRollup
+from utils.event_catalog import EventCatalog
+from utils.suggest_index import SuggestIndex
+from routes import search, explore, trending,events, system, videos
 
 # Global variables
 df = None
 topics_data = None
 hashtag_stats = None
-doc_topics = None
 topic_keywords = {}
+corpus = None
+trend_stats = None
+hourly_rollup = None
 faiss_index = None
 embedding_model = None
 embeddings = None
-
-
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    global df, topics_data, hashtag_stats, doc_topics, topic_keywords, event_data
-
-    # Load data
-    df = pd.read_parquet(config.VIDEOS_FILE)
-    print(f"📊 Loaded videos.parquet with {len(df)} rows")
-
-    with open(config.TOPICS_FILE, "r") as f:
-        topics_data = json.load(f)
-
-    doc_topics = pd.read_csv(config.DOC_TOPICS_FILE)
-    hashtag_stats = pd.read_parquet(config.HASHTAG_STATS_FILE)
-
-    # Load vidlink mapping
+query_encoder = None
+inference_executor = None
+startup_report = None
+similar_videos = None
+event_catalog = None
+suggest_index = None
+reloader = None
+# Event loop serving requests; worker threads publish swaps onto it through swap_gate
+main_loop = None
+# Holds requests back while reloaded data is swapped in
+swap_gate = SwapGate()
+
+# Keys of the semantic-search part of a data build (see build_vectors)
+VECTOR_KEYS = ("faiss_index", "embeddings", "similar_videos")
+
+
+def artifacts_on_disk() -> str:
+    """Cheap token (sizes + mtimes) of every file a data build reads; the reload watcher polls it."""
+    paths = [config.SOURCE_FILES[k] for k in SOURCE_KEYS] + [
+        os.path.join(config.SNAPSHOT_DIR, META_FILE) if config.SNAPSHOT_DIR else "",
+        index_path(config.ARTIFACTS_DIR, config.FAISS_INDEX_TYPE),
+        index_path(config.ARTIFACTS_DIR, "flat"),
+        f"{config.ARTIFACTS_DIR}/embeddings.npy",
+    ]
+    return artifacts_version(paths)
+
+
+def build_vectors(df, corpus, report: StartupReport) -> Dict[str, Any]:
+    """FAISS index, memory-mapped embeddings and the similar-videos table for `df` (all None if unavailable)."""
     try:
-        vidlink_map = pd.read_csv(config.VIDLINK_MAP_FILE)
-        print(f"✅ Loaded {len(vidlink_map)} video links")
-
-        event_data = pd.read_parquet(config.EVENTS_FILE)
-
-        # Extract numeric Id from vidlink name (e.g., "0249.mp4" -> 249)
-        def extract_id(name):
-            if pd.isna(name):
-                return None
-            match = re.match(r'(\d+)', str(name))
-            return int(match.group(1)) if match else None
-
-        vidlink_map['video_id'] = vidlink_map['name'].apply(extract_id)
-
-        print(f"📋 Sample name -> video_id: {vidlink_map[['name', 'video_id']].head(3).to_dict('records')}")
-
-        # Merge on Id
-        df = df.merge(
-            vidlink_map[['video_id', 'id', 'webViewLink', 'preview_link', 'name']],
-            left_on='Id',
-            right_on='video_id',
-            how='left'
-        )
-
-        # Rename for clarity
-        df.rename(columns={
-            'id': 'drive_file_id',
-            'name': 'drive_filename'
-        }, inplace=True)
-
-        print(f"✅ Merged vidlink data")
-        print(f"📊 Videos with drive_file_id: {df['drive_file_id'].notna().sum()}/{len(df)}")
+        # Load FAISS index (variant picked by FAISS_INDEX_TYPE, exact flat index as fallback)
+        faiss_index_path = index_path(config.ARTIFACTS_DIR, config.FAISS_INDEX_TYPE)
+        if not os.path.exists(faiss_index_path):
+            print(f"⚠️ {faiss_index_path} not found, falling back to the flat index")
+            faiss_index_path = index_path(config.ARTIFACTS_DIR, "flat")
+        index, load_mode = load_index(faiss_index_path, mmap=config.FAISS_MMAP)
+        apply_search_params(index, config.FAISS_NPROBE, config.FAISS_EF_SEARCH)
+        print(f"✅ Loaded FAISS index: {index.ntotal:,} vectors, {describe(index)} ({load_mode})")
+        report.lap("faiss index", mode=load_mode)
+
+        # Load embeddings (optional) - memory-mapped: nothing reads them on the request path,
+        # and mapped pages are shared between worker processes
+        embeddings_path = f"{config.ARTIFACTS_DIR}/embeddings.npy"
+        vectors = np.load(embeddings_path, mmap_mode='r')
+        print(f"✅ Loaded embeddings: {vectors.shape} (mmap)")
+        report.lap("embeddings.npy", mode="mmap")
 
-        # Create embed URLs from Google Drive
-        df['embed_url'] = df['drive_file_id'].apply(
-            lambda x: f"https://drive.google.com/file/d/{x}/preview" if pd.notna(x) else None
-        )
+        # Verify alignment
+        if index.ntotal != len(df):
+            print(f"⚠️ Warning: FAISS vectors ({index.ntotal}) != DataFrame rows ({len(df)})")
 
-        # ALWAYS use Google Drive thumbnails (Instagram CDN gets blocked in browsers)
-        df['thumbnail_url'] = df['drive_file_id'].apply(
-            lambda x: f"https://drive.google.com/thumbnail?id={x}&sz=w400" if pd.notna(x) else None
+        # "More like this" neighbours of the most viewed videos, from stored vectors
+        similar = SimilarVideos(
+            index, vectors, corpus.frame['view_count'].to_numpy(),
+            top_n=config.SIMILAR_PRECOMPUTE_TOP_N, k=config.SIMILAR_K
         )
-
-        print(f"✅ Created embed URLs for {df['embed_url'].notna().sum()} videos")
-        print(f"✅ Thumbnail URLs available for {df['thumbnail_url'].notna().sum()} videos")
-
-        # Show sample
-        sample = df[df['embed_url'].notna()].head(1)
-        if len(sample) > 0:
-            row = sample.iloc[0]
-            print(f"📋 Sample: Id={row['Id']} -> drive_file: {row['drive_filename']} -> embed_url set ✓")
+        print(f"✅ Precomputed similar videos for {similar.precomputed} videos "
+              f"({similar.nbytes / 1024:.0f} KB)")
+        report.lap("similar-videos table")
 
     except Exception as e:
-        print(f"⚠️ Could not load vidlink_map.csv: {e}")
-        import traceback
-        traceback.print_exc()
-        df['embed_url'] = None
-        df['thumbnail_url'] = df.get('display_url')  # Fallback to IG thumbnail
+        print(f"❌ Error loading FAISS: {e}")
+        return dict.fromkeys(VECTOR_KEYS)
+
+    return {"faiss_index": index, "embeddings": vectors, "similar_videos": similar}
+
+
+def load_encoder(report: StartupReport):
+    """The query encoder (model + embedding cache + micro-batching); loaded once per process."""
+    model_name = config.EMBEDDING_MODEL
+    print(f"⏳ Loading embedding model: {model_name} ({config.ENCODER_BACKEND})...")
+    model = load_query_model(
+        config.ENCODER_BACKEND, model_name, config.ENCODER_ONNX_DIR, config.ENCODER_ONNX_QUANTIZED,
+        config.ENCODER_MAX_SEQ_LENGTH, config.ENCODER_THREADS
+    )
+    print(f"✅ Loaded embedding model ({type(model).__name__})")
+    report.lap("embedding model", backend=type(model).__name__)
+
+    # Query embeddings are cached (optionally on disk) and cache misses micro-batched
+    query_cache = QueryEmbeddingCache(
+        config.QUERY_CACHE_SIZE, config.QUERY_CACHE_DIR or None,
+        namespace=getattr(model, "cache_namespace", model_name)
+    )
+    return model, BatchingEncoder(
+        model, query_cache, config.ENCODER_BATCH_WINDOW_MS, config.ENCODER_MAX_BATCH
+    )
+
+
+def load_semantic() -> Dict[str, Any]:
+    """
+    Semantic search resources for the data currently served: FAISS index,
+    embeddings and similar-videos table, plus the encoder on first load.
+    Runs on the LazyLoader thread.
+    """
+    report = StartupReport()
+    version = response_cache.data_version
+    result = {"version": version, **build_vectors(df, corpus, report)}
+    if result["faiss_index"] is not None and query_encoder is None:
+        result["model"], result["encoder"] = load_encoder(report)
+    report.print()
+    if result["faiss_index"] is None:
+        raise RuntimeError("FAISS index not available")
+    return result
+
+
+def swap_from_thread(fn: Callable[[], Any]) -> Any:
+    """Run `fn` through swap_gate (no request in flight) from a worker thread and return its result."""
+    if main_loop is None or not main_loop.is_running():
+        return fn()
+    out = []
+    asyncio.run_coroutine_threadsafe(
+        swap_gate.swap(lambda: out.append(fn()), config.RELOAD_DRAIN_TIMEOUT_SECONDS), main_loop
+    ).result()
+    return out[0]
+
+
+def install_semantic(result: Dict[str, Any]) -> bool:
+    """Swap in a load_semantic() result; False (vectors not installed) when the data was reloaded meanwhile."""
+    global embedding_model, query_encoder, faiss_index, embeddings, similar_videos
+    if "encoder" in result:
+        previous = query_encoder
+        embedding_model, query_encoder = result.pop("model"), result.pop("encoder")
+        system.set_globals(query_encoder, inference_executor)
+        explore.set_globals(corpus, faiss_index, query_encoder, inference_executor)
+        # No request is in flight, so nothing is queued on the encoder being replaced
+        if previous is not None and previous is not query_encoder:
+            previous.close()
+    if result["version"] != response_cache.data_version:
+        return False
+    faiss_index, embeddings, similar_videos = result["faiss_index"], result["embeddings"], result["similar_videos"]
+    explore.set_globals(corpus, faiss_index, query_encoder, inference_executor)
+    videos.set_globals(corpus, similar_videos, inference_executor)
+    return True
+
+
+def apply_semantic(result: Dict[str, Any]):
+    """
+    Install a load_semantic() result (on the LazyLoader thread) through the
+    same SwapGate as data reloads. Vectors built for data that has since been
+    reloaded are rebuilt for the new data.
+    """
+    while not swap_from_thread(lambda: install_semantic(result)):
+        print("ℹ️ Data reloaded while loading semantic search, rebuilding its vectors")
+        result = load_semantic()
+
+
+semantic_loader = LazyLoader("semantic search", load_semantic, apply_semantic)
+
+
+def build_data(report: StartupReport, with_vectors: bool = False, warm: bool = False) -> Dict[str, Any]:
+    """
+    Load the artifacts and build everything derived from them: frame, corpus
+    indexes, trend stats, rollup, events and, `with_vectors`, the FAISS index
+    and similar-videos table (otherwise semantic_loader builds those). The
+    corpus text indexes build on first use unless `warm`.
+    Only new objects are created and no global is touched, so a reload can run
+    this in the background while the current data keeps serving.
+    """
+    # Load data: the compiled snapshot (one memory-mapped read) or, without one, the source merge
+    bundle = load_data(config.SOURCE_FILES, config.SNAPSHOT_DIR or None)
+    df = bundle.df
+    print(f"📊 Loaded {len(df)} videos from {bundle.source} (data version {bundle.version})")
+    report.lap(f"data ({bundle.source})", rows=len(df))
+
+    # Normalize + index once for explore/trending (numerics, lowercased text, parsed hashtags, trigram index)
+    corpus = build_corpus(df)
+    corpus.cards.enable_fragments(config.CARD_FRAGMENTS)
+    report.lap("corpus + indexes")
+    if warm:
+        corpus.warm()
+        report.lap("text indexes")
+    trend_stats = TrendStats(df, corpus.hashtags)
+    report.lap("trend stats")
+    hourly_rollup = HourlyRollup(df, corpus.hashtags)
+    report.lap("hourly rollup")
+    # Events compiled once: parsed lists, split summaries, resolved video cards
+    event_catalog = None
+    if bundle.event_data is not None:
+        event_catalog = EventCatalog(bundle.event_data, corpus.videos)
+        report.lap("event catalog", events=len(event_catalog))
+    # Autocomplete prefix index over topic names, hashtags and keyword phrases
+    suggest_index = SuggestIndex(bundle.topics_data, bundle.topic_keywords, bundle.hashtag_stats, corpus.frame)
+    report.lap("suggest index", entries=len(suggest_index))
+    print("✅ Precomputed trend statistics and hourly rollup")
+
+    vectors = build_vectors(df, corpus, report) if with_vectors else dict.fromkeys(VECTOR_KEYS)
+    return {
+        "version": bundle.version,
+        "df": df,
+        "topics_data": bundle.topics_data,
+        "topic_keywords": bundle.topic_keywords,
+        "hashtag_stats": bundle.hashtag_stats,
+        "corpus": corpus,
+        "trend_stats": trend_stats,
+        "hourly_rollup": hourly_rollup,
+        "event_catalog": event_catalog,
+        "suggest_index": suggest_index,
+        **vectors,
+    }
 
-    # Merge topic assignments
-    df = df.merge(doc_topics, on='Id', how='left')
-    df['topic_name'] = df['Topic'].astype(str).map(topics_data)
 
-    # Extract keywords
-    topic_keywords = extract_topic_keywords(df, topics_data)
-
-    try:
-        # Load FAISS index
-        faiss_index_path = f"{config.ARTIFACTS_DIR}/faiss.index"
-        faiss_index = faiss.read_index(faiss_index_path)
-        print(f"✅ Loaded FAISS index: {faiss_index.ntotal:,} vectors")
-        
-        # Load embeddings (optional)
-        embeddings_path = f"{config.ARTIFACTS_DIR}/embeddings.npy"
-        embeddings = np.load(embeddings_path)
-        print(f"✅ Loaded embeddings: {embeddings.shape}")
-        
-        # Load embedding model
-        model_name = 'firqaaa/indo-sentence-bert-base'
-        print(f"⏳ Loading embedding model: {model_name}...")
-        embedding_model = SentenceTransformer(model_name)
-        print(f"✅ Loaded embedding model")
-        
-        # Verify alignment
-        if faiss_index.ntotal != len(df):
-            print(f"⚠️ Warning: FAISS vectors ({faiss_index.ntotal}) != DataFrame rows ({len(df)})")
-        
-        print("✅ FAISS setup complete!")
-        
-    except Exception as e:
-        print(f"❌ Error loading FAISS: {e}")
-        faiss_index = None
-        embedding_model = None
-        embeddings = None
+def apply_data(data: Dict[str, Any]):
+    """
+    Install a build_data() result: module globals, caches and every route
+    module. Runs on the event loop with no request in flight (SwapGate), so
+    requests see either the old data or the new, never a mix.
+    """
+    global df, topics_data, hashtag_stats, topic_keywords, event_catalog, suggest_index, corpus, trend_stats, hourly_rollup, faiss_index, embeddings, similar_videos
+    df = data["df"]
+    topics_data = data["topics_data"]
+    topic_keywords = data["topic_keywords"]
+    hashtag_stats = data["hashtag_stats"]
+    corpus = data["corpus"]
+    trend_stats = data["trend_stats"]
+    hourly_rollup = data["hourly_rollup"]
+    event_catalog = data["event_catalog"]
+    suggest_index = data["suggest_index"]
+    faiss_index = data["faiss_index"]
+    embeddings = data["embeddings"]
+    similar_videos = data["similar_videos"]
+
+    # Cached responses are keyed by this token, so a new data load never serves stale ones
+    response_cache.set_data_version(data["version"])
+    # Rankings behind pagination cursors hold row positions of this snapshot
+    ranking_cache.set_data_version(data["version"])
 
     # Share with route modules
-    search.set_globals(topic_keywords, hashtag_stats, topics_data)
-    explore.set_globals(df, faiss_index, embedding_model) 
-    trending.set_globals(df)
-    events.set_globals(event_data,df)
+    search.set_globals(topic_keywords, hashtag_stats, topics_data, suggest_index)
+    explore.set_globals(corpus, faiss_index, query_encoder, inference_executor)
+    trending.set_globals(df, corpus, trend_stats, hourly_rollup)
+    events.set_globals(event_catalog)
+    videos.set_globals(corpus, similar_videos, inference_executor)
+
+    # Reloaded without vectors while semantic search was loaded (or had failed): load them for the new data.
+    # A load still in progress rebuilds its vectors for this data itself (apply_semantic).
+    if faiss_index is None and semantic_loader.state in ("ready", "failed"):
+        semantic_loader.reset()
+        semantic_loader.start()
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global inference_executor, startup_report, reloader, main_loop
+
+    main_loop = asyncio.get_running_loop()
+    report = StartupReport()
+    response_cache.configure(
+        config.RESPONSE_CACHE_MAX_ENTRIES, config.RESPONSE_CACHE_MAX_BYTES, config.RESPONSE_CACHE_TTL_SECONDS
+    )
+    data = build_data(report)
+
+    # Encoding + FAISS search get their own bounded pool, separate from the route threadpool
+    inference_executor = InferenceExecutor(config.INFERENCE_WORKERS, config.INFERENCE_MAX_QUEUE,
+                                            wait_timeout=config.INFERENCE_WAIT_TIMEOUT_SECONDS)
+    system.set_globals(query_encoder, inference_executor)
+
+    apply_data(data)
+    print(f"✅ Response cache ready (data version {response_cache.data_version})")
+
+    report.lap("route setup")
+
+    # Trigram + BM25 indexes: built off the request path, or by the first search that needs one
+    threading.Thread(target=corpus.warm, name="corpus-warm", daemon=True).start()
+
+    # Model + FAISS index: loaded before serving (eager), right after in the background,
+    # or by the first semantic request (on_demand); GET /api/system/ready reports the state
+    explore.set_semantic_loader(semantic_loader, config.SEMANTIC_WAIT_SECONDS)
+    videos.set_semantic_loader(semantic_loader, config.SEMANTIC_WAIT_SECONDS)
+    system.set_semantic_loader(semantic_loader)
+    if config.SEMANTIC_LOAD == "eager":
+        await asyncio.wrap_future(semantic_loader.start())
+        report.lap("semantic search", state=semantic_loader.state)
+    elif config.SEMANTIC_LOAD == "background":
+        semantic_loader.start()
+    report.print()
+    startup_report = report
+    system.set_startup_report(report)
+
+    # Later artifact changes are picked up without a restart: POST /api/system/reload or polling
+    # Vectors are rebuilt with the data only once semantic search is loaded
+    reloader = Reloader(swap_gate, lambda: build_data(StartupReport(), with_vectors=semantic_loader.ready, warm=True),
+                        apply_data, artifacts_on_disk,
+                        drain_timeout=config.RELOAD_DRAIN_TIMEOUT_SECONDS)
+    system.set_reloader(reloader)
+    watcher = None
+    if config.RELOAD_POLL_SECONDS > 0:
+        watcher = asyncio.create_task(reloader.watch(config.RELOAD_POLL_SECONDS))
+
     print(f"✅ Loaded {len(df)} videos")
     print(f"✅ Loaded {len(topics_data)} topics")
     print(f"✅ Loaded {len(hashtag_stats)} hashtags")
@@ -151,9 +337,17 @@ async def lifespan(app: FastAPI):
     yield
 
     print("Shutting down...")
+    if watcher is not None:
+        watcher.cancel()
+    if query_encoder is not None:
+        query_encoder.close()
+    if inference_executor is not None:
+        inference_executor.shutdown()
+
 
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
-app = FastAPI(lifespan=lifespan)
+app.add_middleware(SwapGateMiddleware, gate=swap_gate)
 
 app.add_middleware(
     CORSMiddleware,
@@ -169,6 +363,8 @@ app.include_router(search.router)
 app.include_router(explore.router)
 app.include_router(trending.router)
 app.include_router(events.router)
+app.include_router(videos.router)
+app.include_router(system.router)
 
 
 @app.get("/")
@@ -177,6 +373,7 @@ async def root():
         "message": "Shorts Analytics API",
         "status": "running",
         "faiss_enabled": faiss_index is not None,  # NEW
+        "semantic": semantic_loader.state,
         "endpoints": {
             "random_suggestions": "/api/search/random-suggestions?limit=5",
             "search_suggestions": "/api/search/suggestions?q=beauty&limit=10",
@@ -1,304 +1,269 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Query
-from typing import Dict, Any, List
+from fastapi import APIRouter, Query, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from typing import Dict, Any, List, Optional, Tuple
 import pandas as pd
 import numpy as np
-import os
 import random
-from utils.text_processing import normalize_text, as_list
+from utils.text_processing import normalize_text
+from utils.inference import InferenceBusy, stage_latency
+from utils.faiss_index import search_filtered
+from utils.hybrid import fuse, HYBRID_DEPTH
+from utils.pagination import rankings, decode_cursor, CursorError, MAX_RANKING
+from utils.fast_json import ORJSONResponse
 
 router = APIRouter(prefix="/api", tags=["explore"])
 
 # Will be set by main.py
+corpus = None
 df = None
 faiss_index = None
-embedding_model = None
+query_encoder = None
+inference = None
+semantic_loader = None
+semantic_wait = 0.0
 
 
-def set_globals(dataframe, index=None, model=None):
+def set_globals(prepared_corpus, index=None, encoder=None, executor=None):
     """Set module-level globals from main"""
-    global df, faiss_index, embedding_model
-    df = dataframe
+    global corpus, df, faiss_index, query_encoder, inference
+    corpus = prepared_corpus
+    df = prepared_corpus.frame if prepared_corpus is not None else None
     faiss_index = index
-    embedding_model = model
+    query_encoder = encoder
+    inference = executor
 
 
-def _safe_int(x):
-    try:
-        if pd.isna(x):
-            return 0
-        return int(x)
-    except Exception:
-        return 0
+def set_semantic_loader(loader, wait: float = 0.0):
+    """Lazy model/index loader from main; semantic endpoints wait up to `wait` seconds for it"""
+    global semantic_loader, semantic_wait
+    semantic_loader = loader
+    semantic_wait = wait
 
 
-def _safe_float(x):
-    try:
-        if pd.isna(x):
-            return 0.0
-        val = float(x)
-        if np.isinf(val):
-            return 0.0
-        return val
-    except Exception:
-        return 0.0
-
-
-def _filename(path: str) -> str:
-    if not isinstance(path, str) or not path:
-        return ""
-    return os.path.basename(path)
-
-
-def _topk(df: pd.DataFrame, k: int, sort_cols: List[str]) -> pd.DataFrame:
-    d = df.copy()
-    for c in sort_cols:
-        if c not in d.columns:
-            d[c] = 0
-    return d.sort_values(sort_cols, ascending=[False] * len(sort_cols)).head(k)
-
-
-def _ensure_cols(df: pd.DataFrame):
-    need = [
-        "Id", "caption", "text", "full_text", "owner_username", "category", "hashtags",
-        "raw_video_path", "display_url", "view_count", "like_count", "engagement_rate",
-        "embed_url", "thumbnail_url"
-    ]
-    for c in need:
-        if c not in df.columns:
-            df[c] = None
-
-    df["view_count"] = pd.to_numeric(df["view_count"], errors="coerce").fillna(0)
-    df["like_count"] = pd.to_numeric(df["like_count"], errors="coerce").fillna(0)
-    df["engagement_rate"] = pd.to_numeric(df["engagement_rate"], errors="coerce").fillna(0.0)
-    df["hashtags_list"] = df["hashtags"].apply(as_list)
-    df["lc_caption"] = df["caption"].astype(str).str.lower()
-    df["lc_text"] = df["text"].astype(str).str.lower()
-    df["lc_full_text"] = df["full_text"].astype(str).str.lower()
-    df["lc_creator"] = df["owner_username"].astype(str).str.lower()
-    df["lc_category"] = df["category"].astype(str).str.lower()
-    return df
-
-
-def _video_card(row: pd.Series) -> Dict[str, Any]:
-    """Convert DataFrame row to video card - with proper None/NaN handling"""
-    import re
-    
-    # FIXED: Proper title handling to avoid "nan"
-    caption = row.get("caption")
-    full_text = row.get("full_text")
-    text = row.get("text")
-    
-    title = None
-    
-    # Try caption first
-    if pd.notna(caption) and str(caption).strip() and str(caption).lower() != 'nan':
-        title = str(caption).strip()
-    # Try text next
-    elif pd.notna(text) and str(text).strip() and str(text).lower() != 'nan':
-        title = str(text).strip()
-    # Try full_text
-    elif pd.notna(full_text) and str(full_text).strip() and str(full_text).lower() != 'nan':
-        title = str(full_text).strip()
-    
-    # Fallback if still no title
-    if not title:
-        category = row.get("category")
-        if pd.notna(category) and str(category).strip() and str(category).lower() not in ['nan', 'none', '']:
-            title = f"{category} video"
-        else:
-            title = "Video"
-    
-    # Clean up whitespace
-    title = re.sub(r"\s+", " ", title).strip()
-    
-    # Truncate to first 5 words
-    words = title.split()
-    if len(words) > 5:
-        title = ' '.join(words[:5]) + "..."
-    else:
-        title = ' '.join(words)
-
-    embed_url = row.get("embed_url")
-    thumbnail_url = row.get("thumbnail_url")
-    video_url = embed_url if pd.notna(embed_url) else row.get("display_url")
-    thumbnail = thumbnail_url if pd.notna(thumbnail_url) else row.get("display_url")
-
-    return {
-        "id": _safe_int(row.get("Id")),
-        "title": title,
-        "creator": str(row.get("owner_username", "")).strip() or "Unknown",
-        "category": str(row.get("category", "")).strip() or "General",
-        "views": _safe_int(row.get("view_count")),
-        "likes": _safe_int(row.get("like_count")),
-        "engagement_rate": round(_safe_float(row.get("engagement_rate")), 5),
-        "thumbnail": thumbnail if pd.notna(thumbnail) else "",
-        "video_url": video_url if pd.notna(video_url) else "",
-        "embed_url": embed_url if pd.notna(embed_url) else None,
-        "instagram_url": row.get("display_url") if pd.notna(row.get("display_url")) else "",
-        "hashtags": as_list(row.get("hashtags")),
-    }
+async def _semantic_ready(wait: float) -> bool:
+    """Index + encoder usable; otherwise start the lazy load and wait up to `wait` seconds for it."""
+    if faiss_index is None or query_encoder is None:
+        if semantic_loader is None or not await semantic_loader.ensure(wait):
+            return False
+    return faiss_index is not None and query_encoder is not None and inference is not None
+
+
+def _ranked(df: pd.DataFrame, sort_cols: List[str]) -> np.ndarray:
+    """Row positions sorted best-first, capped at the deepest page a cursor can reach."""
+    # sort_values returns a new frame, so the shared corpus is never touched
+    return df.sort_values(sort_cols, ascending=[False] * len(sort_cols)).head(MAX_RANKING).index.to_numpy()
+
+
+def _section_ranking(q: str, section: str, build, **params) -> Tuple[str, np.ndarray]:
+    """
+    Stored ranking of one explore section, keyed by (data version, q, section)
+    like the trending lists: built on the first request, then shared by every
+    /explore and /explore/section call for the same query until evicted.
+    """
+    return rankings.get_or_build("explore", {"q": q, "section": section, **params}, build)
+
+
+def _shuffled_head(ranked: np.ndarray, pool: int, n: int, seed: int) -> np.ndarray:
+    """`n` rows drawn in random order from the top `pool` of `ranked`."""
+    return pd.Series(ranked[:pool]).sample(frac=1, random_state=seed).head(n).to_numpy()
+
+
+def _paged_section(section: Dict[str, Any], ranking_id: str, ranked: np.ndarray, page: np.ndarray,
+                   pool: int) -> Dict[str, Any]:
+    """
+    Fill `section` with cards for `page` (its first page, drawn from the top
+    `pool` of `ranked`); `next_cursor` continues the stored ranking after that
+    pool, so "load more" only slices it and never repeats a first-page video.
+    """
+    section["items"] = corpus.cards.video_cards(page)
+    section["next_cursor"] = rankings.next_cursor(ranking_id, ranked, 0, max(pool, len(page)))
+    return section
 
 
-def _semantic_search_section(q: str, per_row: int, exclude_ids: set) -> Dict[str, Any] | None:
+async def _semantic_rows(q: str, k: int, row_mask: np.ndarray | None = None):
+    """
+    Encode `q` and return up to `k` (similarity, row position) pairs, restricted
+    to `row_mask` inside FAISS. Encoding waits on the encoder's batcher (no
+    pool worker held, so concurrent queries share a batch); the search runs
+    on the inference executor.
+    """
+    query_embedding = await inference.wait("encode", query_encoder.submit, q)
+    distances, indices = await inference.run("search", search_filtered, faiss_index, query_embedding, k, row_mask)
+    # Approximate indexes pad with -1 when they find fewer than k neighbours
+    found = indices[0] >= 0
+    return distances[0][found], indices[0][found]
+
+
+def _similarity_cards(distances: np.ndarray, rows: np.ndarray) -> List[Dict[str, Any]]:
+    with stage_latency.track("cards"):
+        items = corpus.cards.video_cards(rows)
+        # Clean NaN similarity scores
+        similarity_scores = np.nan_to_num(distances.astype(np.float64), nan=0.0, posinf=0.0, neginf=0.0).round(4).tolist()
+        for card, similarity in zip(items, similarity_scores):
+            card['similarity_score'] = similarity
+    return items
+
+
+async def _semantic_search_section(q: str, per_row: int, exclude_ids: set) -> Dict[str, Any] | None:
     """
     NEW: FAISS semantic search section
     Returns videos similar by MEANING, not just keywords
+    Already shown videos are excluded inside the FAISS search, so the row is full.
     """
-    if faiss_index is None or embedding_model is None:
+    # Never held up by a lazy load: this request skips the section, later ones get it
+    if not await _semantic_ready(0):
         print("   ⚠️ FAISS not available, skipping semantic section")
         return None
     
     try:
-        # Encode query
-        query_embedding = embedding_model.encode(
-            [q],
-            normalize_embeddings=True,
-            show_progress_bar=False
-        ).astype('float32')
-        
-        # Search FAISS
-        distances, indices = faiss_index.search(query_embedding, k=per_row * 3)
-        
-        # Get results
-        results_df = df.iloc[indices[0]].copy()
-        
-        # Clean NaN similarity scores
-        similarity_scores = np.nan_to_num(distances[0], nan=0.0, posinf=0.0, neginf=0.0)
-        results_df['similarity_score'] = similarity_scores
-        
-        # Exclude already shown videos
-        if exclude_ids:
-            results_df = results_df[~results_df['Id'].isin(exclude_ids)]
-        
-        if results_df.empty:
+        row_mask = corpus.row_filter.mask(exclude_ids=exclude_ids)
+        distances, rows = await _semantic_rows(q, per_row, row_mask)
+        if len(rows) == 0:
             return None
-        
-        # Take top results
-        results_df = results_df.head(per_row)
-        
-        items = []
-        for _, row in results_df.iterrows():
-            card = _video_card(row)
-            similarity = _safe_float(row.get('similarity_score', 0))
-            card['similarity_score'] = round(similarity, 4)
-            items.append(card)
-        
+
+        items = await run_in_threadpool(_similarity_cards, distances, rows)
         print(f"   ✓ Semantic section: {len(items)} videos")
         
         return {
             "key": "semantic",
             "title": f"Related to \"{q}\"",
             "reason": "FAISS",
-            "items": items
+            "items": items,
+            "next_cursor": None  # deeper semantic results: /api/hybrid-search
         }
         
+    except InferenceBusy:
+        raise
     except Exception as e:
         print(f"   ❌ Semantic search error: {e}")
         return None
 
 
+def _parse_date(value: Optional[str], name: str, end_of_day: bool = False) -> pd.Timestamp | None:
+    """ISO date/datetime query param as a UTC timestamp; a bare date used as an upper bound covers the whole day."""
+    if not value:
+        return None
+    try:
+        ts = pd.Timestamp(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid {name}: '{value}'")
+    ts = ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+    if end_of_day and len(value.strip()) == 10:
+        ts = ts + pd.Timedelta(days=1) - pd.Timedelta(1, "ns")
+    return ts
+
+
+def _parse_ids(value: Optional[str]) -> List[int]:
+    try:
+        return [int(v) for v in (value or "").split(",") if v.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="exclude_ids must be comma-separated video ids")
+
+
 def _section_by_category(df: pd.DataFrame, q: str, per_row: int) -> Dict[str, Any] | None:
     ql = normalize_text(q)
     if not ql: return None
-    hit = df[df["lc_category"].str.contains(ql, na=False)]
+    hit = df.iloc[corpus.match_rows(["lc_category"], ql)]
     if hit.empty: return None
     top_cat = (hit.groupby("category")["view_count"].sum().sort_values(ascending=False).index[0])
-    subset = df[df["category"] == top_cat]
-    subset = _topk(subset, per_row, ["engagement_rate", "view_count"])
-    items = [_video_card(r) for _, r in subset.iterrows()]
-    return {"key": "category", "title": f"Because you searched '{q}'", "reason": f"Top in {top_cat}", "items": items}
+    ranking_id, ranked = _section_ranking(
+        q, "category", lambda: _ranked(df[df["category"] == top_cat], ["engagement_rate", "view_count"]),
+        category=top_cat
+    )
+    section = {"key": "category", "title": f"Because you searched '{q}'", "reason": f"Top in {top_cat}"}
+    return _paged_section(section, ranking_id, ranked, ranked[:per_row], per_row)
 
 
 def _section_by_creator(df: pd.DataFrame, q: str, per_row: int, max_creators: int = 2) -> List[Dict[str, Any]]:
     ql = normalize_text(q)
     if not ql: return []
-    cand = df[df["lc_creator"].str.contains(ql, na=False)]
+    cand = df.iloc[corpus.match_rows(["lc_creator"], ql)]
     if cand.empty: return []
     top_creators = (cand.groupby("owner_username")["view_count"]
                     .sum().sort_values(ascending=False).head(max_creators).index.tolist())
     out = []
     for c in top_creators:
-        vids = df[df["owner_username"] == c]
-        vids = _topk(vids, per_row, ["engagement_rate", "view_count"])
-        items = [_video_card(r) for _, r in vids.iterrows()]
-        out.append({"key": "creator", "title": f"Popular from @{c}", "reason": "Creator match", "items": items})
+        ranking_id, ranked = _section_ranking(
+            q, "creator", lambda c=c: _ranked(df[df["owner_username"] == c], ["engagement_rate", "view_count"]),
+            creator=c
+        )
+        section = {"key": "creator", "title": f"Popular from @{c}", "reason": "Creator match"}
+        out.append(_paged_section(section, ranking_id, ranked, ranked[:per_row], per_row))
     return out
 
 
 def _section_by_hashtag(df: pd.DataFrame, q: str, per_row: int, max_tags: int = 2) -> List[Dict[str, Any]]:
     ql = normalize_text(q)
     if not ql: return []
-    ex = df.explode("hashtags_list")
-    ex["lc_tag"] = ex["hashtags_list"].astype(str).str.lower()
-    hit = ex[ex["lc_tag"].str.contains(ql, na=False) & ex["lc_tag"].notnull()]
-    if hit.empty: return []
-    top_tags = (hit.groupby("lc_tag")["view_count"].sum().sort_values(ascending=False).head(max_tags).index.tolist())
+    tags = corpus.hashtag_index
     out = []
-    for tag in top_tags:
-        vids = ex[ex["lc_tag"] == tag]
-        base = _topk(vids, per_row, ["engagement_rate", "view_count"])
-        base = base.sample(frac=1, random_state=random.randint(1, 10)).head(per_row)
-        items = [_video_card(r) for _, r in base.iterrows()]
-        out.append({"key": "hashtag", "title": f"Trending with #{tag}", "reason": "Hashtag match", "items": items})
+    for tag_id in tags.top_matching(ql, max_tags):
+        tag = tags.vocab[tag_id]
+        ranking_id, ranked = _section_ranking(
+            q, "hashtag", lambda tag_id=tag_id: _ranked(df.iloc[tags.rows_for(tag_id)], ["engagement_rate", "view_count"]),
+            hashtag=tag
+        )
+        base = _shuffled_head(ranked, per_row, per_row, random.randint(1, 10))
+        section = {"key": "hashtag", "title": f"Trending with #{tag}", "reason": "Hashtag match"}
+        out.append(_paged_section(section, ranking_id, ranked, base, per_row))
     return out
 
 
 def _section_by_text(df: pd.DataFrame, q: str, per_row: int) -> Dict[str, Any] | None:
     ql = normalize_text(q)
     if not ql: return None
-    mask = (
-            df["lc_caption"].str.contains(ql, na=False) |
-            df["lc_text"].str.contains(ql, na=False) |
-            df["lc_full_text"].str.contains(ql, na=False)
+    hit_rows = corpus.match_rows(["lc_caption", "lc_text", "lc_full_text"], ql)
+    if len(hit_rows) == 0: return None
+    ranking_id, ranked = _section_ranking(
+        q, "similar", lambda: _ranked(df.iloc[hit_rows], ["engagement_rate", "view_count"])
     )
-    hit = df[mask]
-    if hit.empty: return None
-    hit = _topk(hit, per_row * 2, ["engagement_rate", "view_count"])
-    hit = hit.sample(frac=1, random_state=random.randint(1, 99)).head(per_row)
-    items = [_video_card(r) for _, r in hit.iterrows()]
-    return {"key": "similar", "title": f"Similar to \"{q}\"", "reason": "Text match", "items": items}
+    page = _shuffled_head(ranked, per_row * 2, per_row, random.randint(1, 99))
+    section = {"key": "similar", "title": f"Similar to \"{q}\"", "reason": "Text match"}
+    return _paged_section(section, ranking_id, ranked, page, per_row * 2)
 
 
-def _section_spotlight(df: pd.DataFrame, per_row: int) -> Dict[str, Any]:
-    base = _topk(df, per_row * 3, ["engagement_rate", "view_count"])
-    base = base.sample(frac=1, random_state=random.randint(1, 99)).head(per_row)
-    items = [_video_card(r) for _, r in base.iterrows()]
-    return {"key": "spotlight", "title": "Now Trending", "reason": "High engagement overall", "items": items}
+def _section_spotlight(df: pd.DataFrame, q: str, per_row: int) -> Dict[str, Any]:
+    ranking_id, ranked = _section_ranking(q, "spotlight", lambda: _ranked(df, ["engagement_rate", "view_count"]))
+    base = _shuffled_head(ranked, per_row * 3, per_row, random.randint(1, 99))
+    section = {"key": "spotlight", "title": "Now Trending", "reason": "High engagement overall"}
+    return _paged_section(section, ranking_id, ranked, base, per_row * 3)
 
 
-def _section_more_from_category(df: pd.DataFrame, dominant_category: str, per_row: int, exclude_ids: set) -> Dict[str, Any] | None:
+def _section_more_from_category(df: pd.DataFrame, q: str, dominant_category: str, per_row: int,
+                                exclude_ids: set) -> Dict[str, Any] | None:
     """Return random videos from the dominant category, excluding already shown videos."""
     if not dominant_category or dominant_category == "None" or pd.isna(dominant_category):
         return None
 
-    cat_videos = df[df["category"] == dominant_category]
-
-    if exclude_ids:
-        cat_videos = cat_videos[~cat_videos["Id"].isin(exclude_ids)]
+    unshown = corpus.row_filter.mask(category=dominant_category, exclude_ids=exclude_ids)
 
-    if cat_videos.empty or len(cat_videos) < 3:
+    if unshown.sum() < 3:
         return None
 
-    top_candidates = _topk(cat_videos, per_row * 2, ["engagement_rate", "view_count"])
-    random_selection = top_candidates.sample(
-        n=min(per_row, len(top_candidates)),
-        random_state=random.randint(1, 999)
+    # Ranked over the whole category, so the key is (q, category) whatever other sections showed
+    ranking_id, ranked = _section_ranking(
+        q, "more_from_category",
+        lambda: _ranked(df[df["category"] == dominant_category], ["engagement_rate", "view_count"]),
+        category=dominant_category
     )
+    # The first page is drawn from the top per_row * 2 videos not shown yet; "load more" continues after them
+    candidates = np.flatnonzero(unshown[ranked])[:per_row * 2]
+    if len(candidates) == 0:
+        return None
+    random_selection = _shuffled_head(ranked[candidates], len(candidates), per_row, random.randint(1, 999))
 
-    items = [_video_card(r) for _, r in random_selection.iterrows()]
-
-    return {
+    section = {
         "key": "more_from_category",
         "title": f"More videos about {dominant_category}",
-        "reason": f"Popular in {dominant_category}",
-        "items": items
+        "reason": f"Popular in {dominant_category}"
     }
+    return _paged_section(section, ranking_id, ranked, random_selection, int(candidates[-1]) + 1)
 
 
 @router.get("/explore")
-def explore(q: str = Query(..., min_length=1), rows_per_section: int = 16):
+async def explore(q: str = Query(..., min_length=1), rows_per_section: int = Query(16, ge=1, le=MAX_RANKING)):
     """
     ENHANCED: Netflix-style Explore with SEMANTIC SEARCH + all keyword matching
     
@@ -309,56 +274,114 @@ def explore(q: str = Query(..., min_length=1), rows_per_section: int = 16):
     4. Text matches (keyword)
     5. SEMANTIC MATCHES (FAISS) ← NEW!
     6. More from category
+
+    Keyword sections and card building run in the threadpool; encoding and
+    FAISS search go through the inference executor, which answers 503 when full.
     """
     print(f"🔍 EXPLORE: q='{q}', rows_per_section={rows_per_section}")
-    print(f"   FAISS available: {faiss_index is not None and embedding_model is not None}")
+    print(f"   FAISS available: {faiss_index is not None and query_encoder is not None}")
 
     if df is None:
         return {"query": q, "sections": []}
 
-    data = _ensure_cols(df.copy())
-    sections: List[Dict[str, Any]] = []
-    all_shown_ids = set()
-
-    # 1. CATEGORY SECTION (keyword match)
-    cat = _section_by_category(data, q, rows_per_section)
-    if cat:
-        sections.append(cat)
-        all_shown_ids.update(item["id"] for item in cat["items"])
-        print(f"   ✓ Category section: {len(cat['items'])} videos")
-
-    # 2. CREATOR SECTIONS (keyword match)
-    creator_sections = _section_by_creator(data, q, min(rows_per_section, 12))
-    for sec in creator_sections:
-        sections.append(sec)
-        all_shown_ids.update(item["id"] for item in sec["items"])
-    if creator_sections:
-        print(f"   ✓ Creator sections: {len(creator_sections)} sections")
-
-    # 3. HASHTAG SECTIONS (keyword match)
-    hashtag_sections = _section_by_hashtag(data, q, min(rows_per_section, 12))
-    for sec in hashtag_sections:
-        sections.append(sec)
-        all_shown_ids.update(item["id"] for item in sec["items"])
-    if hashtag_sections:
-        print(f"   ✓ Hashtag sections: {len(hashtag_sections)} sections")
-
-    # 4. TEXT SECTION (keyword match)
-    txt = _section_by_text(data, q, rows_per_section)
-    if txt:
-        sections.append(txt)
-        all_shown_ids.update(item["id"] for item in txt["items"])
-        print(f"   ✓ Text section: {len(txt['items'])} videos")
+    sections, all_shown_ids = await run_in_threadpool(_keyword_sections, q, rows_per_section)
 
     # 5. ⭐ NEW: SEMANTIC SECTION (FAISS - finds related content by meaning)
-    semantic = _semantic_search_section(q, rows_per_section, all_shown_ids)
+    try:
+        semantic = await _semantic_search_section(q, rows_per_section, all_shown_ids)
+    except InferenceBusy as e:
+        print(f"   ⚠️ Shedding explore request: {e}")
+        raise HTTPException(status_code=503, detail="Semantic search is busy, retry shortly",
+                            headers={"Retry-After": "1"})
     if semantic:
         sections.append(semantic)
         all_shown_ids.update(item["id"] for item in semantic["items"])
 
+    sections = await run_in_threadpool(_finish_sections, q, sections, all_shown_ids, rows_per_section)
+
+    total_videos = sum(len(s['items']) for s in sections)
+    print(f"✅ Returning {len(sections)} sections with {total_videos} total videos")
+    
+    return ORJSONResponse({
+        "query": q,
+        "sections": sections
+    })
+
+
+@router.get("/explore/section")
+async def explore_section(
+    cursor: str = Query(..., min_length=1),
+    limit: int = Query(16, ge=1, le=50)
+):
+    """
+    Next page of one explore section: `cursor` is the section's `next_cursor`.
+    Slices the ranking stored by /explore and builds cards for this page only;
+    a cursor whose ranking has expired answers 410 (re-run /explore).
+    """
+    if df is None:
+        raise HTTPException(status_code=500, detail="Video data not loaded")
+    try:
+        ranking_id, offset = decode_cursor(cursor)
+    except CursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    rows = rankings.get(ranking_id)
+    if rows is None:
+        raise HTTPException(status_code=410, detail="Cursor expired, reload explore")
+
+    return ORJSONResponse({
+        "items": corpus.cards.video_cards(rows[offset:offset + limit], serialized=True),
+        "next_cursor": rankings.next_cursor(ranking_id, rows, offset, limit)
+    })
+
+
+def _keyword_sections(q: str, rows_per_section: int):
+    """Sections 1-4 (keyword matches) plus the ids they show."""
+    with stage_latency.track("keyword"):
+        # Prepared once at startup - read-only, no per-request copy
+        data = df
+        sections: List[Dict[str, Any]] = []
+        all_shown_ids = set()
+
+        # 1. CATEGORY SECTION (keyword match)
+        cat = _section_by_category(data, q, rows_per_section)
+        if cat:
+            sections.append(cat)
+            all_shown_ids.update(item["id"] for item in cat["items"])
+            print(f"   ✓ Category section: {len(cat['items'])} videos")
+
+        # 2. CREATOR SECTIONS (keyword match)
+        creator_sections = _section_by_creator(data, q, min(rows_per_section, 12))
+        for sec in creator_sections:
+            sections.append(sec)
+            all_shown_ids.update(item["id"] for item in sec["items"])
+        if creator_sections:
+            print(f"   ✓ Creator sections: {len(creator_sections)} sections")
+
+        # 3. HASHTAG SECTIONS (keyword match)
+        hashtag_sections = _section_by_hashtag(data, q, min(rows_per_section, 12))
+        for sec in hashtag_sections:
+            sections.append(sec)
+            all_shown_ids.update(item["id"] for item in sec["items"])
+        if hashtag_sections:
+            print(f"   ✓ Hashtag sections: {len(hashtag_sections)} sections")
+
+        # 4. TEXT SECTION (keyword match)
+        txt = _section_by_text(data, q, rows_per_section)
+        if txt:
+            sections.append(txt)
+            all_shown_ids.update(item["id"] for item in txt["items"])
+            print(f"   ✓ Text section: {len(txt['items'])} videos")
+
+    return sections, all_shown_ids
+
+
+def _finish_sections(q: str, sections: List[Dict[str, Any]], all_shown_ids: set, rows_per_section: int) -> List[Dict[str, Any]]:
+    """Fallback, de-duplication and "More from category" sections."""
+    data = df
+
     # 6. FALLBACK: If no results, show trending
     if not sections:
-        spotlight = _section_spotlight(data, rows_per_section)
+        spotlight = _section_spotlight(data, q, rows_per_section)
         sections.append(spotlight)
         all_shown_ids.update(item["id"] for item in spotlight["items"])
         print(f"   ⚠️ No matches, showing trending: {len(spotlight['items'])} videos")
@@ -391,6 +414,7 @@ def explore(q: str = Query(..., min_length=1), rows_per_section: int = 16):
         for cat_name, count in sorted_categories:
             more_section = _section_more_from_category(
                 data,
+                q,
                 cat_name,
                 rows_per_section,
                 all_shown_ids
@@ -400,10 +424,108 @@ def explore(q: str = Query(..., min_length=1), rows_per_section: int = 16):
                 all_shown_ids.update(item["id"] for item in more_section["items"])
                 print(f"   ✓ More from {cat_name}: {len(more_section['items'])} videos")
 
-    total_videos = sum(len(s['items']) for s in sections)
-    print(f"✅ Returning {len(sections)} sections with {total_videos} total videos")
-    
-    return {
+    return sections
+
+
+@router.get("/semantic-search")
+async def semantic_search(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(20, ge=1, le=100),
+    category: Optional[str] = None,
+    creator: Optional[str] = None,
+    hashtag: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    exclude_ids: Optional[str] = Query(None, description="Comma-separated video ids")
+):
+    """
+    Semantic (FAISS) search with filters applied inside the search: only
+    videos matching every given filter are considered, so a filtered query
+    still returns up to `limit` results.
+    """
+    if df is None or not await _semantic_ready(semantic_wait):
+        raise HTTPException(status_code=503, detail="Semantic search is not available",
+                            headers={"Retry-After": "5"} if semantic_loader is not None and semantic_loader.state == "loading" else None)
+
+    filters = {
+        "category": category,
+        "creator": creator,
+        "hashtag": hashtag,
+        "date_from": _parse_date(date_from, "date_from"),
+        "date_to": _parse_date(date_to, "date_to", end_of_day=True),
+        "exclude_ids": _parse_ids(exclude_ids),
+    }
+    row_mask = corpus.row_filter.mask(**filters)
+
+    try:
+        distances, rows = await _semantic_rows(q, limit, row_mask)
+    except InferenceBusy as e:
+        print(f"   ⚠️ Shedding semantic search request: {e}")
+        raise HTTPException(status_code=503, detail="Semantic search is busy, retry shortly",
+                            headers={"Retry-After": "1"})
+
+    items = await run_in_threadpool(_similarity_cards, distances, rows) if len(rows) else []
+    return ORJSONResponse({
         "query": q,
-        "sections": sections
-    }
\ No newline at end of file
+        "filters": {k: (str(v) if isinstance(v, pd.Timestamp) else v) for k, v in filters.items() if v},
+        "total": len(items),
+        "items": items
+    })
+
+
+def _hybrid_cards(fused: Dict[str, np.ndarray], start: int, stop: int) -> List[Dict[str, Any]]:
+    items = corpus.cards.video_cards(fused["rows"][start:stop])
+    for rank, card in zip(range(start, stop), items):
+        card["rank"] = rank + 1
+        card["score"] = round(float(fused["score"][rank]), 6)
+        card["bm25_score"] = None if np.isnan(fused["bm25"][rank]) else round(float(fused["bm25"][rank]), 4)
+        card["similarity_score"] = None if np.isnan(fused["semantic"][rank]) else round(float(fused["semantic"][rank]), 4)
+    return items
+
+
+@router.get("/hybrid-search")
+async def hybrid_search(
+    q: str = Query(..., min_length=1),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    method: str = Query("rrf", pattern="^(rrf|weighted)$"),
+    alpha: float = Query(0.5, ge=0.0, le=1.0, description="Semantic weight for method=weighted"),
+    category: Optional[str] = None,
+    creator: Optional[str] = None,
+    hashtag: Optional[str] = None
+):
+    """
+    One ranked list fusing BM25 (caption + full_text) and FAISS similarity,
+    by reciprocal rank fusion or weighted normalized scores. Deterministic
+    (ties by corpus order) and paginated. Without FAISS it is BM25 only.
+    """
+    if df is None:
+        return {"query": q, "total": 0, "items": []}
+
+    row_mask = corpus.row_filter.mask(category=category, creator=creator, hashtag=hashtag)
+    keyword = await run_in_threadpool(corpus.bm25.search, q, HYBRID_DEPTH, row_mask)
+
+    semantic = (np.empty(0, dtype=np.float32), np.empty(0, dtype=np.int64))
+    if await _semantic_ready(semantic_wait):
+        try:
+            semantic = await _semantic_rows(q, HYBRID_DEPTH, row_mask)
+        except InferenceBusy as e:
+            print(f"   ⚠️ Shedding hybrid search request: {e}")
+            raise HTTPException(status_code=503, detail="Semantic search is busy, retry shortly",
+                                headers={"Retry-After": "1"})
+
+    fused = fuse(keyword, semantic, len(df), method=method, alpha=alpha)
+    total = len(fused["rows"])
+    start = min((page - 1) * page_size, total)
+    stop = min(start + page_size, total)
+    items = await run_in_threadpool(_hybrid_cards, fused, start, stop)
+
+    return ORJSONResponse({
+        "query": q,
+        "method": method,
+        "page": page,
+        "page_size": page_size,
+        "total": total,
+        "has_more": stop < total,
+        "items": items
+    })
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Query
 import random
 from utils.text_processing import is_interesting_query
+from utils.response_cache import cached_response
 
 router = APIRouter(prefix="/api/search", tags=["search"])
 
@@ -8,14 +9,16 @@ router = APIRouter(prefix="/api/search", tags=["search"])
 topic_keywords = {}
 hashtag_stats = None
 topics_data = None
+suggest_index = None
 
 
-def set_globals(tk, hs, td):
+def set_globals(tk, hs, td, suggest=None):
     """Set module-level globals from main"""
-    global topic_keywords, hashtag_stats, topics_data
+    global topic_keywords, hashtag_stats, topics_data, suggest_index
     topic_keywords = tk
     hashtag_stats = hs
     topics_data = td
+    suggest_index = suggest
 
 
 def generate_2word_phrases_per_topic():
@@ -67,60 +70,18 @@ async def get_random_suggestions(limit: int = Query(5, ge=1, le=10)):
 
 
 @router.get("/suggestions")
+@cached_response("search/suggestions")
 async def get_search_suggestions(
     q: str = Query(..., min_length=1),
-    limit: int = Query(10, ge=1, le=20)
+    limit: int = Query(10, ge=1, le=20),
+    fuzzy: bool = Query(False, description="Also match words one typo away from the query")
 ):
-    """Returns search suggestions based on user query."""
-    query = q.lower().strip()
-    suggestions = []
-
-    # Match topic names
-    for topic_name in topics_data.values():
-        if query in topic_name.lower() and is_interesting_query(topic_name):
-            suggestions.append({
-                "text": topic_name,
-                "type": "category",
-                "icon": "🏷"
-            })
-
-    # Match hashtags
-    if hashtag_stats is not None and len(hashtag_stats) > 0:
-        hashtag_matches = hashtag_stats[
-            hashtag_stats['tag'].astype(str).str.contains(query, case=False, na=False)
-        ].nlargest(5, 'mean_eng')
-
-        for _, row in hashtag_matches.iterrows():
-            hashtag = row['tag']
-            if is_interesting_query(str(hashtag), min_length=3):
-                suggestions.append({
-                    "text": f"#{hashtag}",
-                    "type": "hashtag",
-                    "icon": "#️⃣"
-                })
-
-    # Match keywords in topics
-    for topic_name, keywords in topic_keywords.items():
-        matching_keywords = [kw for kw in keywords if query in kw]
-        if matching_keywords:
-            idx = keywords.index(matching_keywords[0])
-            if idx < len(keywords) - 1:
-                phrase = f"{keywords[idx]} {keywords[idx + 1]}"
-                if is_interesting_query(phrase):
-                    suggestions.append({
-                        "text": phrase,
-                        "type": "topic_phrase",
-                        "icon": "🔍"
-                    })
-
-    # Return unique suggestions
-    seen = set()
-    unique_suggestions = []
-    for s in suggestions:
-        if s['text'] not in seen:
-            seen.add(s['text'])
-            unique_suggestions.append(s)
-            if len(unique_suggestions) >= limit:
-                break
-
-    return {"query": q, "suggestions": unique_suggestions}
\ No newline at end of file
+    """
+    Returns search suggestions for what the user has typed so far: topic
+    names, hashtags and topic keyword phrases with a word starting with `q`,
+    most popular (mean engagement) first. Served from the prefix index built
+    at load (see SuggestIndex).
+    """
+    if suggest_index is None:
+        return {"query": q, "suggestions": []}
+    return {"query": q, "suggestions": suggest_index.suggest(q, limit, fuzzy)}
@@ -0,0 +1,105 @@
+import hmac
+
+from fastapi import APIRouter, Header, HTTPException
+from typing import Optional
+
+import config
+from utils.response_cache import response_cache
+from utils.inference import stage_latency
+
+router = APIRouter(prefix="/api/system", tags=["system"])
+
+# Will be set by main.py
+query_encoder = None
+inference_executor = None
+startup_report = None
+reloader = None
+semantic_loader = None
+
+
+def set_globals(encoder=None, executor=None):
+    """Set module-level globals from main"""
+    global query_encoder, inference_executor
+    query_encoder = encoder
+    inference_executor = executor
+
+
+def set_startup_report(report):
+    """Set by main once lifespan has finished loading"""
+    global startup_report
+    startup_report = report
+
+
+def set_reloader(r):
+    """Set by main once lifespan has finished loading"""
+    global reloader
+    reloader = r
+
+
+def set_semantic_loader(loader):
+    """Set by main once lifespan has finished loading"""
+    global semantic_loader
+    semantic_loader = loader
+
+
+@router.get("/cache")
+def get_cache_stats():
+    """Response cache counters (hits, misses, evictions, size) for the current data version."""
+    return response_cache.stats()
+
+
+@router.get("/encoder")
+def get_encoder_stats():
+    """Query-embedding cache and micro-batching counters."""
+    if query_encoder is None:
+        return {"enabled": False}
+    return {"enabled": True, **query_encoder.stats()}
+
+
+@router.get("/inference")
+def get_inference_stats():
+    """Inference executor queue depth / load shedding, and per-stage explore latency (keyword, encode, search, cards)."""
+    return {
+        "executor": inference_executor.stats() if inference_executor is not None else None,
+        "stages": stage_latency.stats(),
+    }
+
+
+@router.get("/ready")
+def get_readiness():
+    """
+    Readiness per feature. Data routes (trending, events, search) serve as soon
+    as startup finishes; semantic search (model + FAISS index) loads per
+    SEMANTIC_LOAD and reports its own state.
+    """
+    semantic = semantic_loader.stats() if semantic_loader is not None else {"state": "not_loaded"}
+    return {"data": True, "semantic": {"mode": config.SEMANTIC_LOAD, **semantic}}
+
+
+@router.get("/startup")
+def get_startup_report():
+    """How long each artifact / precompute step took in the last startup."""
+    return startup_report.as_dict() if startup_report is not None else {"steps": []}
+
+
+@router.post("/reload", status_code=202)
+async def trigger_reload(x_admin_token: Optional[str] = Header(None)):
+    """
+    Rebuild the data from the artifacts on disk in the background and swap it
+    in once in-flight requests finish. Returns immediately; poll GET /reload.
+    """
+    if not config.ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Reload endpoint disabled (ADMIN_TOKEN not set)")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, config.ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+    if reloader is None:
+        raise HTTPException(status_code=503, detail="Service is still starting")
+    if not reloader.trigger():
+        raise HTTPException(status_code=409, detail="A reload is already running")
+    return {"status": "reloading", **reloader.stats()}
+
+
+@router.get("/reload")
+def get_reload_status():
+    """Artifacts version currently served and the outcome of the last reload."""
+    return reloader.stats() if reloader is not None else {"in_progress": False}
@@ -1,67 +1,66 @@
 from fastapi import APIRouter, Query, HTTPException
-from typing import Dict, Any, List,Optional
-from datetime import datetime, timedelta
+from typing import List, Optional
 import pandas as pd
-from collections import Counter
+import numpy as np
+from utils.response_cache import cached_response
+from utils.pagination import rankings, decode_cursor, CursorError
+from utils.fast_json import ORJSONResponse
+
+# Compact cards of the top-videos / relevant-videos lists
+LIST_CARD_FIELDS = ["title", "creator", "views", "category"]
+
+# Trend detail top_videos cards
+DETAIL_CARD_FIELDS = ["id", "title", "creator", "thumbnail", "embed_url", "views", "likes", "engagement_rate", "category"]
 
 router = APIRouter(prefix="/api/trending", tags=["trending"])
 
 # Will be set by main.py
 df = None
+corpus = None
+trend_stats = None
+hourly_rollup = None
 
 
-import pandas as pd
+def _search_rows(q: str) -> pd.DataFrame:
+    """
+    Rows whose caption/full_text/creator/category/hashtags contain `q`
+    (case-insensitive, non-regex), resolved through the corpus trigram index.
+    """
+    return df.iloc[corpus.search_rows(q)]
 
-# def _ensure_utc_naive(s: pd.Series) -> pd.Series:
-#     ts = pd.to_datetime(s, errors="coerce", utc=True)
-#     return ts.dt.tz_convert("UTC").dt.tz_localize(None)
 
-# --- add this helper near your other helpers ---
+def _ranked_rows(rows: np.ndarray, by: List[str], ascending: List[bool]) -> np.ndarray:
+    """Row positions `rows` in the order df.iloc[rows].sort_values(by, ascending) gives them."""
+    order = df[by].iloc[rows].reset_index(drop=True).sort_values(by, ascending=ascending).index.to_numpy()
+    return rows[order]
 
-def _split_recent_all(frame: pd.DataFrame, mode: str) -> pd.DataFrame:
-    if not isinstance(frame, pd.DataFrame) or len(frame) == 0:
-        return frame
 
-    if 'taken_at' in frame.columns:
-        f = frame.copy()
-        f['taken_at_dt'] = _to_utc_aware(f['taken_at'])
-        valid = f['taken_at_dt'].notna()
-        if mode == 'recent' and valid.any():
-            cutoff = f.loc[valid, 'taken_at_dt'].quantile(0.75)  # latest 25%
-            return f[valid & (f['taken_at_dt'] >= cutoff)]
-        return f
-    else:
-        # no timestamp — if Id exists, approximate “recent” by top quartile of Id
-        if mode == 'recent' and 'Id' in frame.columns and len(frame) > 0:
-            q = pd.Series(frame['Id']).dropna()
-            if len(q) > 0:
-                cut = q.quantile(0.75)
-                return frame[frame['Id'] >= cut]
-        return frame
-
-def _safe_series(frame: pd.DataFrame, col: str) -> pd.Series:
-    """Return a string Series for `col` if it exists, else an empty Series."""
-    if col in frame.columns:
-        return frame[col].fillna("").astype(str)
-    return pd.Series([""] * len(frame), index=frame.index, dtype="object")
-
-def _search_mask(frame: pd.DataFrame, q: str) -> pd.Series:
-    """
-    Build a robust text blob from multiple columns and do a case-insensitive,
-    non-regex contains() to avoid KeyError and regex pitfalls.
-    """
-    text = _safe_series(frame, "caption")
-    # fallbacks / enrichers
-    for c in ("full_text", "owner_username", "category", "hashtags"):
-        text = text.str.cat(_safe_series(frame, c), sep=" ")
-    # regex=False so queries like "c++", "wardah" etc. don't explode
-    return text.str.contains(q, case=False, na=False, regex=False)
+def _category_rows(category: str, rows: Optional[np.ndarray] = None) -> np.ndarray:
+    """Positions (of `rows`, or of every row) whose category is `category`."""
+    mask = corpus.row_filter.mask(category=category)
+    return np.flatnonzero(mask) if rows is None else rows[mask[rows]]
+
+
+def _cursor_offset(cursor: Optional[str], ranking_id: str) -> int:
+    """Offset a cursor points at; it must have been issued for this exact ranking."""
+    if not cursor:
+        return 0
+    try:
+        cursor_ranking, offset = decode_cursor(cursor)
+    except CursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if cursor_ranking != ranking_id:
+        raise HTTPException(status_code=400, detail="Cursor does not belong to this query")
+    return offset
 
 
-def set_globals(dataframe):
+def set_globals(dataframe, prepared_corpus=None, stats=None, rollup=None):
     """Set module-level globals from main"""
-    global df
+    global df, corpus, trend_stats, hourly_rollup
     df = dataframe
+    corpus = prepared_corpus
+    trend_stats = stats
+    hourly_rollup = rollup
 
 
 @router.get("/debug")
@@ -81,6 +80,7 @@ def debug_data():
 
 
 @router.get("/viral-topics")
+@cached_response("trending/viral-topics")
 def get_viral_topics(limit: int = Query(5, ge=1, le=20)):
     """
     Returns viral trending topics based on categories.
@@ -122,27 +122,6 @@ def get_viral_topics(limit: int = Query(5, ge=1, le=20)):
             total_views = int(group['view_count'].sum())
             avg_engagement = float(group['engagement_rate'].mean())
 
-            # Get top hashtags for this category
-            all_hashtags = []
-            for hashtags_raw in group['hashtags'].dropna().head(30):
-                try:
-                    hashtags_str = str(hashtags_raw)
-
-                    # Parse hashtags
-                    if hashtags_str.startswith('['):
-                        import ast
-                        hashtags = ast.literal_eval(hashtags_str)
-                    else:
-                        hashtags = hashtags_str.split(',')
-
-                    # Clean hashtags
-                    for tag in hashtags:
-                        tag = str(tag).strip().strip("'\"").strip()
-                        if tag and len(tag) > 0 and tag.lower() not in ['none', 'nan']:
-                            all_hashtags.append(tag)
-                except:
-                    pass
-
             # Build query string - JUST USE CATEGORY NAME
             # Don't add random hashtags that make no sense
             query = str(category)
@@ -169,6 +148,7 @@ def get_viral_topics(limit: int = Query(5, ge=1, le=20)):
 
 
 @router.get("/simple-topics")
+@cached_response("trending/simple-topics")
 def get_simple_topics(limit: int = Query(5, ge=1, le=10)):
     """
     Absolute simplest: Just return categories with counts
@@ -197,16 +177,24 @@ def get_simple_topics(limit: int = Query(5, ge=1, le=10)):
 
 
 @router.get("/viral-by-category")
+@cached_response("trending/viral-by-category")
 def get_viral_by_category(
         top_n: int = Query(10, ge=1, le=50),
         category: Optional[str] = None,
-        sort_by: str = Query('engagement', regex='^(engagement|latest|views)$')
+        sort_by: str = Query('engagement', regex='^(engagement|latest|views)$'),
+        cursor: Optional[str] = Query(None, description="next_cursor of a section; requires its category")
 ):
+    """
+    Top videos per category. Each section carries a `next_cursor`; pass it
+    back with the same category/sort_by to get the next `top_n` of that section.
+    """
     if df is None:
         raise HTTPException(status_code=500, detail="Video data not loaded")
+    if cursor and (not category or category == 'All categories'):
+        raise HTTPException(status_code=400, detail="cursor requires the section's category")
 
-    # Apply category filter if specified
-    working_df = df.copy()
+    # Apply category filter if specified (filtering builds a new frame; df itself is never mutated)
+    working_df = df
     if category and category != 'All categories':
         working_df = working_df[working_df['category'] == category]
         categories = [category]
@@ -216,105 +204,77 @@ def get_viral_by_category(
     sections = []
 
     for cat in sorted(categories):
-        # Filter by category
-        cat_df = working_df[working_df['category'] == cat].copy()  # <-- Changed from df to working_df
-
-        if len(cat_df) == 0:
+        def rank_category(cat=cat):
+            # Filter by category
+            cat_rows = _category_rows(cat)
+
+            if sort_by == 'latest':
+                return _ranked_rows(cat_rows, ['taken_at'], [False])
+            elif sort_by == 'views':
+                return _ranked_rows(cat_rows, ['view_count'], [False])
+            else:  # engagement
+                return _ranked_rows(cat_rows, ['engagement_rate', 'view_count'], [False, False])
+
+        ranking_id, ranked = rankings.get_or_build(
+            "viral-by-category", {"category": cat, "sort_by": sort_by}, rank_category
+        )
+        if len(ranked) == 0:
             continue
 
-        if sort_by == 'latest':
-            cat_df = cat_df.sort_values('taken_at', ascending=False)
-        elif sort_by == 'views':
-            cat_df = cat_df.sort_values('view_count', ascending=False)
-        else:  # engagement
-            cat_df = cat_df.sort_values(['engagement_rate', 'view_count'], ascending=[False, False])
-
-        # Take top N
-        top_videos = cat_df.head(top_n)
-
-        # Format videos
-        videos = []
-        for _, row in top_videos.iterrows():
-            video = {
-                "id": int(row['Id']),
-                "title": (row.get("caption") or row.get("full_text")[:50] or "") or f"Video {row['Id']}",
-                "creator": row.get('owner_username', 'unknown'),
-                "thumbnail": f"https://drive.google.com/thumbnail?id={row.get('drive_file_id')}&sz=w400" if pd.notna(
-                    row.get('drive_file_id')) else row.get('display_url'),
-                "embed_url": f"https://drive.google.com/file/d/{row.get('drive_file_id')}/preview" if pd.notna(
-                    row.get('drive_file_id')) else None,
-                "views": int(row.get('view_count', 0)),
-                "likes": int(row.get('like_count', 0)),
-                "engagement_rate": float(row.get('engagement_rate', 0)),
-                "category": row.get('category', ''),
-                "hashtags": eval(row.get('hashtags', '[]')) if isinstance(row.get('hashtags'), str) else (
-                        row.get('hashtags', []) or []),
-                "instagram_url": row.get('shortcode_url') or row.get('video_url')
-            }
-            videos.append(video)
+        # Take the requested page of N
+        offset = _cursor_offset(cursor, ranking_id)
+        videos = corpus.cards.trend_cards(ranked[offset:offset + top_n], title="short", serialized=True)
 
         if videos:
             sections.append({
                 "key": f"category_{cat.lower().replace(' ', '_')}",
                 "title": f"🔥 Trending in {cat}",
-                "reason": f"Most viral content",
-                "items": videos
+                "reason": "Most viral content",
+                "items": videos,
+                "next_cursor": rankings.next_cursor(ranking_id, ranked, offset, top_n)
             })
 
-    return {"sections": sections}
+    return ORJSONResponse({"sections": sections})
 
 
 @router.get("/overall-viral")
-def get_overall_viral(limit: int = 50):
+@cached_response("trending/overall-viral")
+def get_overall_viral(limit: int = Query(50, ge=1, le=100), cursor: Optional[str] = None):
     """
-    Get overall most viral videos across all categories.
+    Get overall most viral videos across all categories, `limit` per page;
+    pass the section's `next_cursor` back to continue.
     """
     if df is None:
         raise HTTPException(status_code=500, detail="Video data not loaded")
 
     # Sort by engagement rate
-    viral_df = df.sort_values(
+    ranking_id, ranked = rankings.get_or_build("overall-viral", {}, lambda: _ranked_rows(
+        np.arange(len(df)),
         ['engagement_rate', 'view_count'],
-        ascending=[False, False]
-    ).head(limit)
-
-    videos = []
-    for _, row in viral_df.iterrows():
-        video = {
-            "id": int(row['Id']),
-            "title": row.get('caption', '')[:100] or f"Video {row['Id']}",
-            "creator": row.get('owner_username', 'unknown'),
-            "thumbnail": f"https://drive.google.com/thumbnail?id={row.get('drive_file_id')}&sz=w400" if pd.notna(
-                row.get('drive_file_id')) else row.get('display_url'),
-            "embed_url": f"https://drive.google.com/file/d/{row.get('drive_file_id')}/preview" if pd.notna(
-                row.get('drive_file_id')) else None,
-            "views": int(row.get('view_count', 0)),
-            "likes": int(row.get('like_count', 0)),
-            "engagement_rate": float(row.get('engagement_rate', 0)),
-            "category": row.get('category', ''),
-            "hashtags": eval(row.get('hashtags', '[]')) if isinstance(row.get('hashtags'), str) else (
-                        row.get('hashtags', []) or []),
-            "instagram_url": row.get('shortcode_url') or row.get('video_url')
-        }
-        videos.append(video)
+        [False, False]
+    ))
+    offset = _cursor_offset(cursor, ranking_id)
+    videos = corpus.cards.trend_cards(ranked[offset:offset + limit], title="long", serialized=True)
 
-    return {
+    return ORJSONResponse({
         "sections": [{
             "key": "overall_viral",
             "title": "🔥 Most Viral Videos",
             "reason": "Top engagement across all categories",
-            "items": videos
+            "items": videos,
+            "next_cursor": rankings.next_cursor(ranking_id, ranked, offset, limit)
         }]
-    }
+    })
 
 @router.get("/top-topics")
+@cached_response("trending/top-topics")
 def get_top_topics(limit: int = 10, category: str = None):
     """Get top topics (categories) by video count and engagement."""
     if df is None:
         raise HTTPException(status_code=500, detail="Video data not loaded")
 
     # Apply category filter if specified
-    working_df = df.copy()
+    working_df = df
     if category and category != 'All':
         working_df = working_df[working_df['category'] == category]
 
@@ -343,11 +303,12 @@ def get_top_topics(limit: int = 10, category: str = None):
 
 
 @router.get("/relevant-topics")
+@cached_response("trending/relevant-topics")
 def get_relevant_topics(q: str, limit: int = 10, category: str = None):
     if df is None:
         raise HTTPException(status_code=500, detail="Video data not loaded")
 
-    relevant = df[_search_mask(df, q)]
+    relevant = _search_rows(q)
 
     if category and category != 'All':
         relevant = relevant[relevant['category'] == category]
@@ -374,13 +335,14 @@ def get_relevant_topics(q: str, limit: int = 10, category: str = None):
 
 
 @router.get("/top-creators")
+@cached_response("trending/top-creators")
 def get_top_creators(limit: int = 10, category: str = None):
     """Get top creators by engagement and followers."""
     if df is None:
         raise HTTPException(status_code=500, detail="Video data not loaded")
 
     # Apply category filter if specified
-    working_df = df.copy()
+    working_df = df
     if category and category != 'All':
         working_df = working_df[working_df['category'] == category]
 
@@ -410,11 +372,12 @@ def get_top_creators(limit: int = 10, category: str = None):
 
 
 @router.get("/relevant-creators")
+@cached_response("trending/relevant-creators")
 def get_relevant_creators(q: str, limit: int = 10, category: str = None):
     if df is None:
         raise HTTPException(status_code=500, detail="Video data not loaded")
 
-    relevant = df[_search_mask(df, q)]
+    relevant = _search_rows(q)
     if category and category != 'All':
         relevant = relevant[relevant['category'] == category]
     if len(relevant) == 0:
@@ -439,37 +402,23 @@ def get_relevant_creators(q: str, limit: int = 10, category: str = None):
 
 
 @router.get("/top-hashtags")
+@cached_response("trending/top-hashtags")
 def get_top_hashtags(limit: int = 10, category: str = None):
     """Get top hashtags by frequency."""
     if df is None:
         raise HTTPException(status_code=500, detail="Video data not loaded")
 
     # Apply category filter if specified
-    working_df = df.copy()
+    row_mask = None
     if category and category != 'All':
-        working_df = working_df[working_df['category'] == category]
+        row_mask = (df['category'] == category).to_numpy()
+        if not row_mask.any():
+            return {"hashtags": []}
 
-    if len(working_df) == 0:
-        return {"hashtags": []}
-
-    all_hashtags = []
-    for hashtags in working_df['hashtags'].dropna():
-        if isinstance(hashtags, str):
-            try:
-                tags = eval(hashtags)
-                all_hashtags.extend(tags)
-            except:
-                pass
-        elif isinstance(hashtags, list):
-            all_hashtags.extend(hashtags)
-
-    if len(all_hashtags) == 0:
-        return {"hashtags": []}
-
-    hashtag_counts = pd.Series(all_hashtags).value_counts().head(limit)
+    hashtag_counts = corpus.hashtag_index.top_tags(row_mask, limit)
 
     hashtags = []
-    for tag, count in hashtag_counts.items():
+    for tag, count in hashtag_counts:
         hashtags.append({
             "hashtag": tag,
             "count": int(count),
@@ -480,92 +429,60 @@ def get_top_hashtags(limit: int = 10, category: str = None):
 
 
 @router.get("/relevant-hashtags")
+@cached_response("trending/relevant-hashtags")
 def get_relevant_hashtags(q: str, limit: int = 10, category: str = None):
     if df is None:
         raise HTTPException(status_code=500, detail="Video data not loaded")
 
-    relevant = df[_search_mask(df, q)]
+    relevant = corpus.search_rows(q)
     if category and category != 'All':
-        relevant = relevant[relevant['category'] == category]
+        relevant = _category_rows(category, relevant)
     if len(relevant) == 0:
         return {"hashtags": []}
 
-    all_hashtags = []
-    for hashtags in relevant.get('hashtags', pd.Series([], dtype="object")).dropna():
-        try:
-            if isinstance(hashtags, str) and hashtags.strip().startswith('['):
-                import ast
-                tags = ast.literal_eval(hashtags)
-            elif isinstance(hashtags, str):
-                tags = [h.strip() for h in hashtags.split(',')]
-            else:
-                tags = list(hashtags) if hasattr(hashtags, '__iter__') else []
-            all_hashtags.extend([t for t in tags if t])
-        except Exception:
-            pass
-
-    if not all_hashtags:
-        return {"hashtags": []}
-
-    counts = pd.Series(all_hashtags).value_counts().head(limit)
-    return {"hashtags": [{"hashtag": tag, "count": int(cnt), "trend": "↗"} for tag, cnt in counts.items()]}
+    counts = corpus.hashtag_index.top_tags_for_rows(relevant, len(df), limit)
+    return {"hashtags": [{"hashtag": tag, "count": cnt, "trend": "↗"} for tag, cnt in counts]}
 
 
 
 @router.get("/top-videos")
+@cached_response("trending/top-videos")
 def get_top_videos(limit: int = 10, category: str = None):
     """Get top videos overall."""
     if df is None:
         raise HTTPException(status_code=500, detail="Video data not loaded")
 
     # Apply category filter if specified
-    working_df = df.copy()
+    rows = np.arange(len(df))
     if category and category != 'All':
-        working_df = working_df[working_df['category'] == category]
+        rows = _category_rows(category)
 
-    if len(working_df) == 0:
+    if len(rows) == 0:
         return {"videos": []}
 
-    top = working_df.sort_values(['engagement_rate', 'view_count'], ascending=[False, False]).head(limit)
+    top = _ranked_rows(rows, ['engagement_rate', 'view_count'], [False, False])[:limit]
 
-    videos = []
-    for _, row in top.iterrows():
-        videos.append({
-            "title": (row.get("caption") or row.get("full_text")[:50] or "") or f"Video {row['Id']}",
-            "creator": row.get('owner_username', 'unknown'),
-            "views": int(row.get('view_count', 0)),
-            "category": row.get('category', '')
-        })
+    videos = corpus.cards.trend_cards(top, fields=LIST_CARD_FIELDS, serialized=True)
 
-    return {"videos": videos}
+    return ORJSONResponse({"videos": videos})
 
 
 @router.get("/relevant-videos")
+@cached_response("trending/relevant-videos")
 def get_relevant_videos(q: str, limit: int = 10, category: str = None):
     if df is None:
         raise HTTPException(status_code=500, detail="Video data not loaded")
 
-    relevant = df[_search_mask(df, q)]
+    relevant = corpus.search_rows(q)
     if category and category != 'All':
-        relevant = relevant[relevant['category'] == category]
+        relevant = _category_rows(category, relevant)
     if len(relevant) == 0:
         return {"videos": []}
 
-    top = relevant.sort_values(['engagement_rate', 'view_count'], ascending=[False, False]).head(limit)
-
-    videos = []
-    for _, row in top.iterrows():
-        videos.append({
-            "title": (row.get("caption") or (row.get("full_text") or "")[:50]) or f"Video {row['Id']}",
-            "creator": row.get('owner_username', 'unknown'),
-            "views": int(row.get('view_count', 0)),
-            "category": row.get('category', '')
-        })
-    return {"videos": videos}
+    top = _ranked_rows(relevant, ['engagement_rate', 'view_count'], [False, False])[:limit]
 
-def _to_utc_aware(s: pd.Series) -> pd.Series:
-    return pd.to_datetime(s, errors="coerce", utc=True)
-# --- replace your /trending-now entirely with this ---
+    videos = corpus.cards.trend_cards(top, fields=LIST_CARD_FIELDS, serialized=True)
+    return ORJSONResponse({"videos": videos})
 
 @router.get("/trending-now")
 def get_trending_now(
@@ -577,283 +494,103 @@ def get_trending_now(
     'recent' uses the latest quartile of the dataset (no fixed day windows).
     'all' uses the full dataset.
     Growth is computed as delta in share (recent share vs overall share).
+    Served from the TrendStats tables precomputed at load.
     """
-    if df is None:
+    if df is None or trend_stats is None:
         raise HTTPException(status_code=500, detail="Video data not loaded")
 
-    working_df = df.copy()
     now_utc = pd.Timestamp.now(tz="UTC")
+    return {"trends": trend_stats.trends(category, time_range, limit, now_utc)}
 
-    # ensure tz-aware for time strings & timeseries
-    if 'taken_at' in working_df.columns:
-        working_df['taken_at_dt'] = _to_utc_aware(working_df['taken_at'])
-
-    # category slice (for both recent and all)
-    if category and category != 'All categories':
-        working_df = working_df[working_df['category'] == category]
-
-    # split
-    recent_df = _split_recent_all(working_df, 'recent')
-    selected_df = recent_df if time_range == 'recent' else working_df
-
-    if len(selected_df) == 0:
-        return {"trends": []}
-
-    trends = []
-
-    # ---------- Categories ----------
-    # counts in selected vs overall (shares)
-    sel_cat = selected_df.groupby('category', dropna=True)['Id'].count()
-    all_cat = working_df.groupby('category', dropna=True)['Id'].count()
-    sel_total = max(int(sel_cat.sum()), 1)
-    all_total = max(int(all_cat.sum()), 1)
-
-    cat_stats = (
-        selected_df.groupby('category', dropna=True)
-        .agg(view_count=('view_count', 'sum'),
-             engagement_rate=('engagement_rate', 'mean'),
-             taken_at_dt=('taken_at_dt', 'max'),
-             Id=('Id', 'count'))
-        .reset_index()
-    )
-
-    for _, row in cat_stats.iterrows():
-        cat = row['category']
-        if pd.isna(cat) or str(cat).strip().lower() == 'none':
-            continue
-
-        sel_share = float(sel_cat.get(cat, 0)) / sel_total
-        all_share = float(all_cat.get(cat, 0)) / all_total
-        growth_pct = 100.0 * ((sel_share - all_share) / all_share) if all_share > 0 else 100.0
-
-        ts = row.get('taken_at_dt')
-        hours_ago_str = "N/A" if pd.isna(ts) else f"{int((now_utc - ts).total_seconds() / 3600)}h ago"
-
-        trends.append({
-            'name': cat,
-            'type': 'category',
-            'volume': f"{int(row['Id'])}+",
-            'growth': f"+{int(growth_pct)}%",
-            'time': hours_ago_str,
-            'total_views': int(row['view_count']),
-            'avg_engagement': float(row['engagement_rate']),
-            'related_tag': '',
-            'timeseries': _generate_trend_line(selected_df[selected_df['category'] == cat])
-        })
-
-    # ---------- Hashtags ----------
-    def _explode_hashtags(frame: pd.DataFrame) -> pd.Series:
-        out = []
-        for val in frame.get('hashtags', pd.Series([], dtype="object")).dropna():
-            try:
-                if isinstance(val, str) and val.strip().startswith('['):
-                    import ast
-                    out.extend(ast.literal_eval(val))
-                elif isinstance(val, str):
-                    out.extend([h.strip() for h in val.split(',') if h.strip()])
-                elif isinstance(val, list):
-                    out.extend(val)
-            except Exception:
-                pass
-        return pd.Series([str(x).strip().strip("#'\"") for x in out if str(x).strip()])
-
-    sel_tags = _explode_hashtags(selected_df)
-    all_tags = _explode_hashtags(working_df)
-
-    tag_counts_sel = sel_tags.value_counts()
-    tag_counts_all = all_tags.value_counts()
-
-    for tag, cnt in tag_counts_sel.head(200).items():
-        if cnt < 2:
-            continue
-        sel_share = float(cnt) / max(tag_counts_sel.sum(), 1)
-        all_share = float(tag_counts_all.get(tag, 0)) / max(tag_counts_all.sum(), 1)
-        growth_pct = 100.0 * ((sel_share - all_share) / all_share) if all_share > 0 else 100.0
-
-        tag_videos = selected_df[selected_df['hashtags'].astype(str).str.contains(tag, case=False, na=False)]
-        related_cat = tag_videos['category'].mode()[0] if len(tag_videos) > 0 else ''
-        max_ts = tag_videos['taken_at_dt'].max() if 'taken_at_dt' in tag_videos.columns else pd.NaT
-        hours_ago_str = "N/A" if pd.isna(max_ts) else f"{int((now_utc - max_ts).total_seconds() / 3600)}h ago"
-
-        trends.append({
-            'name': f"#{tag}",
-            'type': 'hashtag',
-            'volume': f"{int(cnt)}+",
-            'growth': f"+{int(growth_pct)}%",
-            'time': hours_ago_str,
-            'total_views': int(tag_videos['view_count'].sum()) if len(tag_videos) > 0 else 0,
-            'avg_engagement': float(tag_videos['engagement_rate'].mean() if len(tag_videos) > 0 else 0.0),
-            'related_tag': related_cat,
-            'timeseries': _generate_trend_line(tag_videos)
-        })
-
-    # ---------- Creators ----------
-    sel_creator = selected_df.groupby('owner_username', dropna=True)['Id'].count()
-    all_creator = working_df.groupby('owner_username', dropna=True)['Id'].count()
-    sel_total_c = max(int(sel_creator.sum()), 1)
-    all_total_c = max(int(all_creator.sum()), 1)
-
-    creator_stats = (
-        selected_df.groupby('owner_username', dropna=True)
-        .agg(Id=('Id', 'count'),
-             view_count=('view_count', 'sum'),
-             engagement_rate=('engagement_rate', 'mean'),
-             taken_at_dt=('taken_at_dt', 'max'))
-        .reset_index()
-    )
-    creator_stats = creator_stats[creator_stats['Id'] >= 2]
-
-    for _, row in creator_stats.head(100).iterrows():
-        name = row['owner_username']
-        sel_share = float(sel_creator.get(name, 0)) / sel_total_c
-        all_share = float(all_creator.get(name, 0)) / all_total_c
-        growth_pct = 100.0 * ((sel_share - all_share) / all_share) if all_share > 0 else 100.0
-
-        ts = row.get('taken_at_dt')
-        hours_ago_str = "N/A" if pd.isna(ts) else f"{int((now_utc - ts).total_seconds() / 3600)}h ago"
-
-        creator_videos = selected_df[selected_df['owner_username'] == name]
-        main_category = creator_videos['category'].mode()[0] if len(creator_videos) > 0 else ''
-
-        trends.append({
-            'name': f"@{name}",
-            'type': 'creator',
-            'volume': f"{int(row['Id'])}+",
-            'growth': f"+{int(growth_pct)}%",
-            'time': hours_ago_str,
-            'total_views': int(row['view_count']),
-            'avg_engagement': float(row['engagement_rate']),
-            'related_tag': main_category,
-            'timeseries': _generate_trend_line(creator_videos)
-        })
-
-    trends.sort(key=lambda x: int(str(x['growth']).replace('+', '').replace('%', '') or 0), reverse=True)
-    return {"trends": trends[:limit]}
 
-def _generate_trend_line(df_subset: pd.DataFrame) -> List[int]:
-    """Generate a simple 6-point trend line for visualization."""
-    if len(df_subset) == 0:
-        return [0, 0, 0, 0, 0, 0]
+# --- replace your /trending-detail entirely with this ---
 
-    if 'taken_at_dt' in df_subset.columns:
-        sorted_df = df_subset[df_subset['taken_at_dt'].notna()].sort_values('taken_at_dt')
-        if len(sorted_df) == 0:
-            return [0, 0, 0, 0, 0, 0]
-        bucket_size = max(len(sorted_df) // 6, 1)
-        out: List[int] = []
-        for i in range(6):
-            start = i * bucket_size
-            end = start + bucket_size if i < 5 else len(sorted_df)
-            out.append(len(sorted_df.iloc[start:end]))
-        return out
+def _trend_rows(trend_name: str, time_range: str):
+    """Row positions of `trend_name` within the time scope, plus its rollup (kind, key)."""
+    recent = time_range == 'recent'
 
-    # Fallback
-    import random
-    base = len(df_subset) // 6
-    return [max(base + random.randint(-max(base//2, 1), max(base//2, 1)), 0) for _ in range(6)]
+    # Normalize input
+    name_clean = trend_name.strip().lstrip('#@')
 
+    if trend_name.startswith('#'):
+        tag_rows = corpus.hashtag_index.rows_for_query(name_clean)
+        mask = np.zeros(len(df), dtype=bool)
+        mask[tag_rows] = True
+        scope = corpus.row_filter.mask(recent=recent)
+        if scope is not None:
+            mask &= scope
+        # The rollup has one series per exact tag; a query other tags also contain is served from the rows
+        tag_id = corpus.hashtag_index.lookup(name_clean)
+        only_tag = tag_id is not None and len(tag_rows) == corpus.hashtag_index.tag_counts[tag_id]
+        kind, key = ('hashtag', name_clean.lower()) if only_tag else (None, None)
+    elif trend_name.startswith('@'):
+        mask = corpus.row_filter.mask(creator=name_clean, recent=recent) if name_clean else np.zeros(len(df), dtype=bool)
+        kind, key = 'creator', name_clean.lower()
+    else:
+        mask = corpus.row_filter.mask(category=trend_name, recent=recent)
+        kind, key = 'category', trend_name
+    rows = np.arange(len(df)) if mask is None else np.flatnonzero(mask)
+    return rows, kind, key
 
-# --- replace your /trending-detail entirely with this ---
 
 @router.get("/trending-detail/{trend_name}")
+@cached_response("trending/trending-detail")
 def get_trending_detail(
     trend_name: str,
     time_range: str = Query('recent', regex='^(recent|all)$'),
-    limit: int = Query(20, ge=1, le=50)
+    limit: int = Query(20, ge=1, le=50),
+    granularity: str = Query('hour', regex='^(hour|day|week)$'),
+    cursor: Optional[str] = Query(None, description="next_cursor from a previous response")
 ):
     """
     Detail view honors the same scope:
     - recent: latest quartile
     - all: entire dataset
+    Timeseries come from the hourly rollup cube at hour/day/week granularity.
+    `top_videos` is paged by `limit`; with a `cursor` only the next page of
+    top_videos (and its `next_cursor`) is returned.
     """
     if df is None:
         raise HTTPException(status_code=500, detail="Video data not loaded")
 
-    working_df = df.copy()
-    if 'taken_at' in working_df.columns:
-        working_df['taken_at_dt'] = _to_utc_aware(working_df['taken_at'])
+    trend = {}
 
-    scoped = _split_recent_all(working_df, 'recent' if time_range == 'recent' else 'all')
+    def rank_trend():
+        trend['rows'] = _trend_rows(trend_name, time_range)
+        return _ranked_rows(trend['rows'][0], ['engagement_rate', 'view_count'], [False, False])
 
-    # Normalize input
-    name_clean = trend_name.strip().lstrip('#@')
-
-    if trend_name.startswith('#'):
-        filtered = scoped[scoped['hashtags'].astype(str).str.contains(name_clean, case=False, na=False)]
-    elif trend_name.startswith('@'):
-        filtered = scoped[scoped['owner_username'].str.lower() == name_clean.lower()]
-    else:
-        filtered = scoped[scoped['category'] == trend_name]
-
-    if len(filtered) == 0:
+    ranking_id, ranked = rankings.get_or_build(
+        "trending-detail", {"trend_name": trend_name, "time_range": time_range}, rank_trend
+    )
+    if len(ranked) == 0:
         raise HTTPException(status_code=404, detail="Trend not found")
 
-    top_videos = filtered.sort_values(['engagement_rate', 'view_count'], ascending=[False, False]).head(limit)
-
-    videos = []
-    for _, row in top_videos.iterrows():
-        videos.append({
-            "id": int(row['Id']),
-            "title": (row.get("caption") or (row.get("full_text") or "")[:50]) or f"Video {row['Id']}",
-            "creator": row.get('owner_username', 'unknown'),
-            "thumbnail": (
-                f"https://drive.google.com/thumbnail?id={row.get('drive_file_id')}&sz=w400"
-                if pd.notna(row.get('drive_file_id')) else row.get('display_url')
-            ),
-            "embed_url": (
-                f"https://drive.google.com/file/d/{row.get('drive_file_id')}/preview"
-                if pd.notna(row.get('drive_file_id')) else None
-            ),
-            "views": int(row.get('view_count', 0)),
-            "likes": int(row.get('like_count', 0)),
-            "engagement_rate": float(row.get('engagement_rate', 0)),
-            "category": row.get('category', ''),
-        })
+    offset = _cursor_offset(cursor, ranking_id)
+    videos = corpus.cards.trend_cards(ranked[offset:offset + limit], title="short", fields=DETAIL_CARD_FIELDS, serialized=True)
+
+    next_cursor = rankings.next_cursor(ranking_id, ranked, offset, limit)
+    if cursor:
+        return ORJSONResponse({"trend_name": trend_name, "top_videos": videos, "next_cursor": next_cursor})
 
+    rows, kind, key = trend['rows'] if trend else _trend_rows(trend_name, time_range)
+    filtered = df.iloc[rows]
     related_categories = filtered['category'].value_counts().head(5).to_dict()
 
-    all_hashtags = []
-    for hashtags in filtered.get('hashtags', pd.Series([], dtype="object")).dropna():
-        try:
-            if isinstance(hashtags, str) and hashtags.strip().startswith('['):
-                import ast
-                all_hashtags.extend(ast.literal_eval(hashtags))
-        except Exception:
-            pass
-    top_hashtags = pd.Series(all_hashtags).value_counts().head(10).to_dict() if all_hashtags else {}
+    top_hashtags = dict(corpus.hashtag_index.top_tags_for_rows(rows, len(df), 10))
 
-    return {
+    # Slice the cube; hashtag queries matching more than one tag fall back to the matched rows
+    timeseries = hourly_rollup.timeseries(time_range, kind, key, granularity) if kind else None
+    if timeseries is None:
+        timeseries = hourly_rollup.timeseries_for_rows(rows, granularity)
+
+    return ORJSONResponse({
         "trend_name": trend_name,
         "total_videos": len(filtered),
         "total_views": int(filtered['view_count'].sum()),
         "avg_engagement": float(filtered['engagement_rate'].mean()),
         "top_videos": videos,
+        "next_cursor": next_cursor,
         "related_categories": related_categories,
         "top_hashtags": top_hashtags,
-        "timeseries": _generate_detailed_timeseries(filtered)
-    }
-
-def _generate_detailed_timeseries(df_subset: pd.DataFrame) -> Dict[str, List]:
-    """Generate detailed timeseries (hourly) for charts."""
-    if 'taken_at_dt' not in df_subset.columns or len(df_subset) == 0:
-        return {"timestamps": [], "views": [], "engagement": [], "video_count": []}
-
-    # Keep only valid datetimes and ensure UTC tz-aware index
-    df_subset = df_subset[df_subset['taken_at_dt'].notna()].sort_values('taken_at_dt').set_index('taken_at_dt')
-    if df_subset.index.tz is None:
-        df_subset = df_subset.tz_localize('UTC')
-    else:
-        df_subset = df_subset.tz_convert('UTC')
-
-    hourly = df_subset.resample('H').agg({
-        'view_count': 'sum',
-        'engagement_rate': 'mean',
-        'Id': 'count'
-    }).fillna(0)
-
-    return {
-        "timestamps": [str(ts) for ts in hourly.index],
-        "views": hourly['view_count'].tolist(),
-        "engagement": hourly['engagement_rate'].tolist(),
-        "video_count": hourly['Id'].tolist()
-    }
+        "timeseries": timeseries
+    })
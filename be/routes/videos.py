@@ -0,0 +1,74 @@
+from fastapi import APIRouter, Query, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from typing import Dict, Any, List
+import numpy as np
+
+from utils.inference import InferenceBusy
+from utils.fast_json import ORJSONResponse
+
+router = APIRouter(prefix="/api/videos", tags=["videos"])
+
+# Will be set by main.py
+corpus = None
+df = None
+similar_videos = None
+inference = None
+semantic_loader = None
+semantic_wait = 0.0
+
+
+def set_globals(prepared_corpus, similar=None, executor=None):
+    """Set module-level globals from main"""
+    global corpus, df, similar_videos, inference
+    corpus = prepared_corpus
+    df = prepared_corpus.frame if prepared_corpus is not None else None
+    similar_videos = similar
+    inference = executor
+
+
+def set_semantic_loader(loader, wait: float = 0.0):
+    """Lazy model/index loader from main; waits up to `wait` seconds for the similar-videos table"""
+    global semantic_loader, semantic_wait
+    semantic_loader = loader
+    semantic_wait = wait
+
+
+def _cards(scores: np.ndarray, rows: np.ndarray) -> List[Dict[str, Any]]:
+    items = corpus.cards.video_cards(rows)
+    for card, score in zip(items, np.nan_to_num(scores.astype(np.float64)).round(4).tolist()):
+        card["similarity_score"] = score
+    return items
+
+
+@router.get("/{video_id}/similar")
+async def get_similar_videos(video_id: int, limit: int = Query(12, ge=1, le=50)):
+    """
+    "More like this": nearest videos by stored embedding. Popular videos are
+    served from the precomputed k-NN table, others by a FAISS search.
+    """
+    if df is None:
+        raise HTTPException(status_code=500, detail="Video data not loaded")
+    if similar_videos is None and semantic_loader is not None:
+        await semantic_loader.ensure(semantic_wait)
+    if similar_videos is None:
+        raise HTTPException(status_code=503, detail="Similarity search is not available")
+
+    row = corpus.videos.row_of(video_id)
+    if row is None:
+        raise HTTPException(status_code=404, detail="Video not found")
+    if not similar_videos.has_vector(row):
+        raise HTTPException(status_code=404, detail="Video has no stored embedding")
+
+    if similar_videos.is_precomputed(row, limit):
+        source = "precomputed"
+        scores, neighbours = similar_videos.lookup(row, limit)
+    else:
+        source = "search"
+        try:
+            scores, neighbours = await inference.run("similar", similar_videos.search, row, limit)
+        except InferenceBusy:
+            raise HTTPException(status_code=503, detail="Similarity search is busy, retry shortly",
+                                headers={"Retry-After": "1"})
+
+    items = await run_in_threadpool(_cards, scores, neighbours)
+    return ORJSONResponse({"id": video_id, "source": source, "items": items})
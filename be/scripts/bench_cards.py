@@ -0,0 +1,110 @@
+"""
+Card serialization cost: the columnar CardTable against the previous per-row
+path (`iterrows` + `_video_card`), for N-card responses over the real corpus.
+
+Usage (from be/):
+    python -m scripts.bench_cards --cards 1000 --repeat 20
+"""
+import argparse
+import re
+import statistics
+import time
+from typing import Any, Dict
+
+import numpy as np
+import pandas as pd
+
+import config
+from utils.corpus import build_corpus
+
+
+def _safe_int(x):
+    try:
+        if pd.isna(x):
+            return 0
+        return int(x)
+    except Exception:
+        return 0
+
+
+def _safe_float(x):
+    try:
+        if pd.isna(x):
+            return 0.0
+        val = float(x)
+        if np.isinf(val):
+            return 0.0
+        return val
+    except Exception:
+        return 0.0
+
+
+def _reference_card(row: pd.Series) -> Dict[str, Any]:
+    """The per-row card explore used to build for every item."""
+    title = None
+    for value in (row.get("caption"), row.get("text"), row.get("full_text")):
+        if pd.notna(value) and str(value).strip() and str(value).lower() != 'nan':
+            title = str(value).strip()
+            break
+    if not title:
+        category = row.get("category")
+        if pd.notna(category) and str(category).strip() and str(category).lower() not in ['nan', 'none', '']:
+            title = f"{category} video"
+        else:
+            title = "Video"
+    words = re.sub(r"\s+", " ", title).strip().split()
+    title = ' '.join(words[:5]) + "..." if len(words) > 5 else ' '.join(words)
+
+    embed_url = row.get("embed_url")
+    thumbnail_url = row.get("thumbnail_url")
+    video_url = embed_url if pd.notna(embed_url) else row.get("display_url")
+    thumbnail = thumbnail_url if pd.notna(thumbnail_url) else row.get("display_url")
+    return {
+        "id": _safe_int(row.get("Id")),
+        "title": title,
+        "creator": str(row.get("owner_username", "")).strip() or "Unknown",
+        "category": str(row.get("category", "")).strip() or "General",
+        "views": _safe_int(row.get("view_count")),
+        "likes": _safe_int(row.get("like_count")),
+        "engagement_rate": round(_safe_float(row.get("engagement_rate")), 5),
+        "thumbnail": thumbnail if pd.notna(thumbnail) else "",
+        "video_url": video_url if pd.notna(video_url) else "",
+        "embed_url": embed_url if pd.notna(embed_url) else None,
+        "instagram_url": row.get("display_url") if pd.notna(row.get("display_url")) else "",
+        "hashtags": list(row.get("hashtags_list") or []),
+    }
+
+
+def _time(fn, repeat: int) -> list:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cards", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    corpus = build_corpus(pd.read_parquet(config.VIDEOS_FILE))
+    frame = corpus.frame
+    rows = np.random.default_rng(args.seed).integers(0, len(frame), args.cards)
+    print(f"📊 {args.cards} cards from {len(frame)} videos, x{args.repeat}")
+
+    reference = [_reference_card(r) for _, r in frame.iloc[rows].iterrows()]
+    assert corpus.cards.video_cards(rows) == reference, "columnar cards differ from the per-row path"
+
+    per_row = _time(lambda: [_reference_card(r) for _, r in frame.iloc[rows].iterrows()], args.repeat)
+    columnar = _time(lambda: corpus.cards.video_cards(rows), args.repeat)
+    for label, timings in (("iterrows", per_row), ("columnar", columnar)):
+        print(f"{label:<10} p50={statistics.median(timings):8.2f} ms  mean={statistics.mean(timings):8.2f} ms")
+    print(f"columnar is {statistics.median(per_row) / statistics.median(columnar):.0f}x faster, outputs identical")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Agreement, latency and memory of the query-encoder backends (ENCODER_BACKEND).
+
+Each backend (torch fp32, onnx fp32, onnx int8) runs in its own subprocess so
+its RSS is its own. It encodes the query set one query at a time, like cache
+misses on the request path, plus a sample of video texts in batches. The query
+set is topic names plus short caption prefixes. Every backend is then
+compared with torch, the model embeddings.npy was built with:
+- query cos: cosine between its vector and torch's for the same query
+- top-k overlap: share of torch's top-k neighbours in embeddings.npy it also finds
+- doc cos: cosine between a re-encoded video text and that video's stored
+  row in embeddings.npy (torch's value is the baseline for the text column)
+
+Exits non-zero when a backend's mean query cosine or top-k overlap is below
+--min-cosine / --min-overlap. Export the ONNX models first with
+scripts/export_onnx_encoder.py.
+
+Usage (from be/):
+    python -m scripts.bench_encoder --queries 200 --k 10
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+import config
+from utils.encoder_backends import load_query_model
+from utils.snapshot import load_data
+
+# name -> (ENCODER_BACKEND, quantized)
+BACKENDS = {
+    "torch": ("torch", False),
+    "onnx": ("onnx", False),
+    "onnx_int8": ("onnx", True),
+}
+
+
+def _rss_mb() -> float:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+def _texts(n_queries: int, n_docs: int, doc_column: str, seed: int):
+    """Queries (topic names + 3-6 word caption prefixes), and (row, text) pairs of sampled videos."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        bundle = load_data(config.SOURCE_FILES, config.SNAPSHOT_DIR or None)
+    df = bundle.df
+    rng = np.random.default_rng(seed)
+
+    queries = [" ".join(name.split("_")[1:]) for topic_id, name in bundle.topics_data.items() if topic_id != "-1"]
+    captions = [c.split() for c in df["caption"].dropna().astype(str) if len(c.split()) >= 3]
+    for i in rng.permutation(len(captions)):
+        if len(queries) >= n_queries:
+            break
+        queries.append(" ".join(captions[i][:rng.integers(3, 7)]))
+
+    text = df[doc_column].fillna("").astype(str)
+    rows = [int(r) for r in rng.permutation(np.flatnonzero(text.str.len() > 0))[:n_docs]]
+    return queries[:n_queries], rows, [text.iloc[r] for r in rows]
+
+
+def _worker(name: str, texts_path: str, out_path: str):
+    backend, quantized = BACKENDS[name]
+    with open(texts_path) as f:
+        texts = json.load(f)
+
+    rss_before = _rss_mb()
+    start = time.perf_counter()
+    model = load_query_model(backend, config.EMBEDDING_MODEL, config.ENCODER_ONNX_DIR, quantized,
+                             config.ENCODER_MAX_SEQ_LENGTH, config.ENCODER_THREADS)
+    load_s = time.perf_counter() - start
+    if backend == "onnx" and type(model).__name__ != "OnnxQueryModel":
+        raise SystemExit(f"{name}: no ONNX export in {config.ENCODER_ONNX_DIR}")
+
+    for q in texts["queries"][:5]:  # warm-up
+        model.encode([q], normalize_embeddings=True, show_progress_bar=False)
+    latencies, vectors = [], []
+    for q in texts["queries"]:
+        start = time.perf_counter()
+        vectors.append(model.encode([q], normalize_embeddings=True, show_progress_bar=False)[0])
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    docs = model.encode(texts["docs"], normalize_embeddings=True, batch_size=32, show_progress_bar=False)
+    docs_s = time.perf_counter() - start
+
+    np.savez(
+        out_path,
+        queries=np.asarray(vectors, dtype=np.float32),
+        docs=np.asarray(docs, dtype=np.float32),
+        latencies=np.asarray(latencies),
+        stats=np.asarray([load_s, docs_s, _rss_mb() - rss_before,
+                          resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024]),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=list(BACKENDS))
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--docs", type=int, default=200)
+    parser.add_argument("--doc-column", default="full_text", help="text embeddings.npy was encoded from")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--min-cosine", type=float, default=0.98)
+    parser.add_argument("--min-overlap", type=float, default=0.9)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--worker", choices=list(BACKENDS), help=argparse.SUPPRESS)
+    parser.add_argument("--texts", help=argparse.SUPPRESS)
+    parser.add_argument("--out", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        _worker(args.worker, args.texts, args.out)
+        return
+
+    queries, rows, docs = _texts(args.queries, args.docs, args.doc_column, args.seed)
+    stored = np.load(f"{config.ARTIFACTS_DIR}/embeddings.npy", mmap_mode="r")
+    stored = np.asarray(stored, dtype=np.float32)
+    stored /= np.maximum(np.linalg.norm(stored, axis=1, keepdims=True), 1e-12)
+    print(f"📊 {len(queries)} queries, {len(docs)} docs ({args.doc_column}), embeddings.npy {stored.shape}, "
+          f"max_seq_length={config.ENCODER_MAX_SEQ_LENGTH}")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        texts_path = os.path.join(tmp, "texts.json")
+        with open(texts_path, "w") as f:
+            json.dump({"queries": queries, "docs": docs}, f)
+        for name in dict.fromkeys(["torch"] + args.backends):
+            out_path = os.path.join(tmp, f"{name}.npz")
+            proc = subprocess.run([sys.executable, "-m", "scripts.bench_encoder", "--worker", name,
+                                   "--texts", texts_path, "--out", out_path], capture_output=True, text=True)
+            if proc.returncode != 0:
+                print(f"❌ {name} failed:\n{proc.stderr.strip().splitlines()[-1] if proc.stderr else proc.stdout}")
+                continue
+            with np.load(out_path) as data:
+                results[name] = {key: data[key] for key in data.files}
+
+    if "torch" not in results:
+        raise SystemExit("torch reference failed, nothing to compare against")
+    reference = results["torch"]
+    ref_top = np.argsort(-(reference["queries"] @ stored.T), axis=1)[:, :args.k]
+
+    print(f"{'backend':<11}{'load s':>8}{'p50 ms':>8}{'p95 ms':>8}{'docs/s':>8}{'RSS MB':>8}{'peak MB':>9}"
+          f"{'query cos':>11}{'min cos':>9}{f'top-{args.k}':>8}{'doc cos':>9}")
+    failed = []
+    for name, r in results.items():
+        load_s, docs_s, rss_mb, peak_mb = r["stats"]
+        query_cos = (r["queries"] * reference["queries"]).sum(axis=1)
+        top = np.argsort(-(r["queries"] @ stored.T), axis=1)[:, :args.k]
+        overlap = np.mean([len(np.intersect1d(a, b)) / args.k for a, b in zip(top, ref_top)])
+        doc_cos = (r["docs"] * stored[rows]).sum(axis=1).mean()
+        print(f"{name:<11}{load_s:>8.1f}{np.percentile(r['latencies'], 50):>8.2f}"
+              f"{np.percentile(r['latencies'], 95):>8.2f}{len(docs) / docs_s:>8.0f}{rss_mb:>8.0f}{peak_mb:>9.0f}"
+              f"{query_cos.mean():>11.4f}{query_cos.min():>9.4f}{overlap:>8.3f}{doc_cos:>9.4f}")
+        if query_cos.mean() < args.min_cosine or overlap < args.min_overlap:
+            failed.append(name)
+
+    if failed:
+        raise SystemExit(f"❌ Below agreement thresholds (cosine {args.min_cosine}, overlap {args.min_overlap}): "
+                         f"{', '.join(failed)}")
+    print(f"✅ All backends agree with torch (mean cosine >= {args.min_cosine}, top-{args.k} overlap >= {args.min_overlap})")
+
+
+if __name__ == "__main__":
+    main()
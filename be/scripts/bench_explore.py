@@ -0,0 +1,78 @@
+"""
+Per-request latency of /api/explore: preparing the corpus inside every request
+(the old copy + normalize path) against the shared prepared corpus.
+
+Section rankings are cached per (data version, q, section), so repeated
+queries mostly time cache hits. "cold" clears the ranking store before every
+request (each one filters, sorts and ranks its sections); "warm" is the
+steady state with every query's rankings cached.
+
+Usage (from be/):
+    python -m scripts.bench_explore --queries gym mobil skincare --repeat 20 --scale 4
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import statistics
+import time
+
+import pandas as pd
+
+import config
+from routes import explore
+from utils.corpus import build_corpus, PreparedCorpus
+from utils.pagination import rankings
+
+
+def _load(scale: int) -> pd.DataFrame:
+    df = pd.read_parquet(config.VIDEOS_FILE)
+    if scale > 1:
+        df = pd.concat([df] * scale, ignore_index=True)
+    return df
+
+
+def _time_requests(queries, repeat: int, corpus_for_request, cold: bool = True) -> list:
+    timings = []
+    for _ in range(repeat):
+        for q in queries:
+            if cold:
+                rankings.cache.clear()
+            start = time.perf_counter()
+            explore.set_globals(corpus_for_request())
+            with contextlib.redirect_stdout(io.StringIO()):
+                asyncio.run(explore.explore(q=q, rows_per_section=16))
+            timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def _report(label: str, timings: list):
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"{label:<16} mean={statistics.mean(timings):8.2f} ms  p50={statistics.median(timings):8.2f} ms  p95={p95:8.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", nargs="+", default=["gym", "mobil", "skincare", "fitness", "zzzz"])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--scale", type=int, default=1, help="replicate the corpus N times")
+    args = parser.parse_args()
+
+    raw = _load(args.scale)
+    print(f"📊 Benchmarking explore over {len(raw)} videos, {len(args.queries)} queries x {args.repeat}")
+
+    # Old path: copy + normalize the whole frame inside every request
+    _report("per-request", _time_requests(args.queries, args.repeat, lambda: PreparedCorpus(raw)))
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        prepared = build_corpus(raw)
+        prepared.warm()  # lifespan builds the text indexes in the background
+    _report("prepared, cold", _time_requests(args.queries, args.repeat, lambda: prepared))
+
+    _time_requests(args.queries, 1, lambda: prepared)  # fill the ranking store
+    _report("prepared, warm", _time_requests(args.queries, args.repeat, lambda: prepared, cold=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Recall@k, latency and memory of FAISS index variants against exact search.
+
+Queries are held-out corpus vectors plus a little noise; ground truth is an
+exact IndexFlatIP over the same vectors. Each variant is built in memory and
+swept over its search knob (nprobe for IVF, efSearch for HNSW). Latency is
+per single-query search, as explore issues them. Memory is the serialized
+index size.
+
+Usage (from be/):
+    python -m scripts.bench_faiss --k 48 --queries 200 --scale 20
+"""
+import argparse
+import time
+
+import faiss
+import numpy as np
+
+import config
+from utils.faiss_index import apply_search_params, build_index
+
+SWEEPS = {
+    "flat": [None],
+    "ivf_flat": [1, 4, 8, 16, 32],
+    "ivf_pq": [1, 4, 8, 16, 32],
+    "hnsw": [16, 32, 64, 128, 256],
+}
+
+
+def _corpus(scale: int, seed: int) -> np.ndarray:
+    """The real embeddings, replicated `scale` times with jitter to mimic a larger corpus."""
+    base = np.load(f"{config.ARTIFACTS_DIR}/embeddings.npy").astype(np.float32)
+    rng = np.random.default_rng(seed)
+    parts = [base] + [base + rng.normal(0, 0.02, base.shape).astype(np.float32) for _ in range(scale - 1)]
+    vectors = np.ascontiguousarray(np.concatenate(parts))
+    faiss.normalize_L2(vectors)
+    return vectors
+
+
+def _recall(found: np.ndarray, truth: np.ndarray) -> float:
+    hits = sum(len(np.intersect1d(f[f >= 0], t)) for f, t in zip(found, truth))
+    return hits / truth.size
+
+
+def _latencies(index, queries: np.ndarray, k: int) -> np.ndarray:
+    out = np.empty(len(queries))
+    for i in range(len(queries)):
+        start = time.perf_counter()
+        index.search(queries[i:i + 1], k)
+        out[i] = (time.perf_counter() - start) * 1000
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--k", type=int, default=48, help="explore searches per_row * 3 = 48 by default")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--scale", type=int, default=1, help="replicate the corpus N times")
+    parser.add_argument("--types", nargs="+", default=list(SWEEPS))
+    parser.add_argument("--threads", type=int, default=1, help="FAISS OpenMP threads")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    faiss.omp_set_num_threads(args.threads)
+    vectors = _corpus(args.scale, args.seed)
+    rng = np.random.default_rng(args.seed)
+    picks = rng.choice(len(vectors), size=min(args.queries, len(vectors)), replace=False)
+    queries = vectors[picks] + rng.normal(0, 0.01, (len(picks), vectors.shape[1])).astype(np.float32)
+    faiss.normalize_L2(queries)
+
+    exact = build_index("flat", vectors)
+    _, truth = exact.search(queries, args.k)
+    print(f"📊 {len(vectors):,} vectors x {vectors.shape[1]} dims, {len(queries)} queries, k={args.k}")
+    print(f"{'index':<10}{'param':>8}{'recall@k':>10}{'p50 ms':>9}{'p99 ms':>9}{'memory MB':>11}{'build s':>9}")
+
+    for index_type in args.types:
+        start = time.perf_counter()
+        index = build_index(index_type, vectors)
+        build_s = time.perf_counter() - start
+        memory_mb = faiss.serialize_index(index).nbytes / 1e6
+        for param in SWEEPS[index_type]:
+            if param is not None:
+                apply_search_params(index, nprobe=param, ef_search=param)
+            _, found = index.search(queries, args.k)
+            lat = _latencies(index, queries, args.k)
+            print(f"{index_type:<10}{str(param or '-'):>8}{_recall(found, truth):>10.3f}"
+                  f"{np.percentile(lat, 50):>9.3f}{np.percentile(lat, 99):>9.3f}{memory_mb:>11.2f}{build_s:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
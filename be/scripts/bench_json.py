@@ -0,0 +1,80 @@
+"""
+Serialization cost of big card payloads: FastAPI's default path
+(jsonable_encoder + JSONResponse) against ORJSONResponse on card dicts and on
+pre-serialized card fragments (warm cache), over the real corpus.
+
+Usage (from be/):
+    python -m scripts.bench_json --sections 12 --cards 50 --repeat 20
+"""
+import argparse
+import json
+import statistics
+import time
+
+import numpy as np
+import pandas as pd
+from fastapi.encoders import jsonable_encoder
+from starlette.responses import JSONResponse
+
+import config
+from utils.corpus import build_corpus
+from utils.fast_json import ORJSONResponse
+
+
+def _payload(cards, rows_per_section, serialized: bool) -> dict:
+    return {
+        "query": "bench",
+        "sections": [
+            {"key": f"section_{i}", "title": f"Section {i}", "reason": "bench",
+             "items": cards.video_cards(rows, serialized=serialized), "next_cursor": None}
+            for i, rows in enumerate(rows_per_section)
+        ],
+    }
+
+
+def _time(fn, repeat: int) -> list:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sections", type=int, default=12)
+    parser.add_argument("--cards", type=int, default=50, help="cards per section")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    corpus = build_corpus(pd.read_parquet(config.VIDEOS_FILE))
+    cards = corpus.cards
+    cards.enable_fragments(True)
+    rng = np.random.default_rng(args.seed)
+    rows_per_section = [rng.integers(0, len(corpus), args.cards) for _ in range(args.sections)]
+    print(f"📊 {args.sections} sections x {args.cards} cards, x{args.repeat}")
+
+    plain = _payload(cards, rows_per_section, serialized=False)
+    _payload(cards, rows_per_section, serialized=True)  # warm the fragment cache
+
+    default = JSONResponse(jsonable_encoder(plain)).body
+    assert json.loads(ORJSONResponse(plain).body) == json.loads(default)
+    assert json.loads(ORJSONResponse(_payload(cards, rows_per_section, True)).body) == json.loads(default)
+    print(f"payload {len(default) / 1024:.0f} KB, outputs identical")
+
+    # Card building is included in every variant, so only serialization differs
+    results = {
+        "jsonable_encoder": _time(lambda: JSONResponse(jsonable_encoder(_payload(cards, rows_per_section, False))), args.repeat),
+        "orjson": _time(lambda: ORJSONResponse(_payload(cards, rows_per_section, False)), args.repeat),
+        "orjson+fragments": _time(lambda: ORJSONResponse(_payload(cards, rows_per_section, True)), args.repeat),
+    }
+    base = statistics.median(results["jsonable_encoder"])
+    for label, timings in results.items():
+        p50 = statistics.median(timings)
+        print(f"{label:<18} p50={p50:8.2f} ms  mean={statistics.mean(timings):8.2f} ms  ({base / p50:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Latency of /api/search/suggestions: the per-keystroke scan it used to run
+(substring match over every topic name, str.contains + nlargest over
+hashtag_stats, a loop over every topic keyword) against the SuggestIndex
+prefix lookup, exact and fuzzy. Queries are every prefix (1..8 chars) of
+topic keywords and hashtags, as typed; a typo set swaps two letters.
+
+Usage (from be/):
+    python -m scripts.bench_suggest [--limit 10] [--repeat 3]
+"""
+import argparse
+import contextlib
+import io
+import time
+
+import numpy as np
+
+import config
+from utils.corpus import build_corpus
+from utils.snapshot import load_data
+from utils.suggest_index import SuggestIndex
+from utils.text_processing import is_interesting_query
+
+
+def _scan(q, limit, topics_data, topic_keywords, hashtag_stats):
+    """The previous get_search_suggestions body."""
+    query = q.lower().strip()
+    suggestions = []
+    for topic_name in topics_data.values():
+        if query in topic_name.lower() and is_interesting_query(topic_name):
+            suggestions.append({"text": topic_name, "type": "category", "icon": "🏷"})
+    hashtag_matches = hashtag_stats[
+        hashtag_stats['tag'].astype(str).str.contains(query, case=False, na=False)
+    ].nlargest(5, 'mean_eng')
+    for _, row in hashtag_matches.iterrows():
+        if is_interesting_query(str(row['tag']), min_length=3):
+            suggestions.append({"text": f"#{row['tag']}", "type": "hashtag", "icon": "#️⃣"})
+    for topic_name, keywords in topic_keywords.items():
+        matching = [kw for kw in keywords if query in kw]
+        if matching:
+            idx = keywords.index(matching[0])
+            if idx < len(keywords) - 1:
+                phrase = f"{keywords[idx]} {keywords[idx + 1]}"
+                if is_interesting_query(phrase):
+                    suggestions.append({"text": phrase, "type": "topic_phrase", "icon": "🔍"})
+    seen, out = set(), []
+    for s in suggestions:
+        if s['text'] not in seen:
+            seen.add(s['text'])
+            out.append(s)
+            if len(out) >= limit:
+                break
+    return out
+
+
+def _timed(fn, queries, repeat):
+    times = []
+    for _ in range(repeat):
+        for q in queries:
+            start = time.perf_counter()
+            fn(q)
+            times.append((time.perf_counter() - start) * 1e6)
+    return np.percentile(times, 50), np.percentile(times, 99)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        bundle = load_data(config.SOURCE_FILES, config.SNAPSHOT_DIR or None)
+        corpus = build_corpus(bundle.df)
+    start = time.perf_counter()
+    index = SuggestIndex(bundle.topics_data, bundle.topic_keywords, bundle.hashtag_stats, corpus.frame)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    words = sorted({kw for kws in bundle.topic_keywords.values() for kw in kws}
+                   | set(bundle.hashtag_stats["tag"].astype(str).head(200)))
+    queries = sorted({w[:n] for w in words for n in range(1, min(len(w), 8) + 1)})
+    typos = [w[0] + w[2] + w[1] + w[3:] for w in words if len(w) >= 4]
+    print(f"📊 {len(index)} suggestions indexed in {build_ms:.1f} ms; {len(queries)} prefixes, {len(typos)} typos")
+
+    scan = lambda q: _scan(q, args.limit, bundle.topics_data, bundle.topic_keywords, bundle.hashtag_stats)
+    rows = [
+        ("scan (before)", _timed(scan, queries, 1)),
+        ("prefix index", _timed(lambda q: index.suggest(q, args.limit), queries, args.repeat)),
+        ("prefix + fuzzy", _timed(lambda q: index.suggest(q, args.limit, fuzzy=True), queries, args.repeat)),
+        ("fuzzy, typos", _timed(lambda q: index.suggest(q, args.limit, fuzzy=True), typos, args.repeat)),
+    ]
+    print(f"{'path':<16}{'p50 us':>10}{'p99 us':>10}")
+    for name, (p50, p99) in rows:
+        print(f"{name:<16}{p50:>10.1f}{p99:>10.1f}")
+
+    fixed = sum(1 for w in words if len(w) >= 4 and any(
+        s["text"].lstrip("#").lower().startswith(w) or f" {w}" in s["text"].lower()
+        for s in index.suggest(w[0] + w[2] + w[1] + w[3:], args.limit, fuzzy=True)))
+    print(f"typos whose word is suggested with fuzzy=True: {fixed}/{len(typos)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Build FAISS index variants from artifacts/embeddings.npy.
+
+Writes one file per type next to the existing exact index:
+    flat     -> faiss.index          (IndexFlatIP, exact)
+    ivf_flat -> faiss_ivf_flat.index (IndexIVFFlat)
+    hnsw     -> faiss_hnsw.index     (IndexHNSWFlat)
+    ivf_pq   -> faiss_ivf_pq.index   (IndexIVFPQ)
+Pick one at startup with FAISS_INDEX_TYPE (tune with FAISS_NPROBE / FAISS_EF_SEARCH).
+
+Usage (from be/):
+    python -m scripts.build_faiss_index --types ivf_flat hnsw ivf_pq
+"""
+import argparse
+import time
+
+import faiss
+import numpy as np
+
+import config
+from utils.faiss_index import INDEX_TYPES, build_index, index_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--types", nargs="+", choices=INDEX_TYPES, default=["ivf_flat", "hnsw", "ivf_pq"])
+    parser.add_argument("--embeddings", default=f"{config.ARTIFACTS_DIR}/embeddings.npy")
+    parser.add_argument("--out-dir", default=config.ARTIFACTS_DIR)
+    parser.add_argument("--nlist", type=int, default=None, help="IVF lists (default ~4*sqrt(n))")
+    parser.add_argument("--pq-m", type=int, default=64, help="PQ sub-quantizers (must divide the dimension)")
+    parser.add_argument("--hnsw-m", type=int, default=32)
+    parser.add_argument("--ef-construction", type=int, default=200)
+    args = parser.parse_args()
+
+    vectors = np.load(args.embeddings).astype(np.float32)
+    faiss.normalize_L2(vectors)
+    print(f"📊 Loaded embeddings: {vectors.shape}")
+
+    for index_type in args.types:
+        start = time.perf_counter()
+        index = build_index(index_type, vectors, nlist=args.nlist, pq_m=args.pq_m,
+                            hnsw_m=args.hnsw_m, ef_construction=args.ef_construction)
+        path = index_path(args.out_dir, index_type)
+        faiss.write_index(index, path)
+        print(f"✅ {index_type:<8} {index.ntotal:,} vectors -> {path} ({time.perf_counter() - start:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
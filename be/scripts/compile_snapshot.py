@@ -0,0 +1,49 @@
+"""
+Compile the source artifacts (videos.parquet, topics.json, doc_topics.csv,
+hashtag_stats.parquet, vidlink_map.csv, events parquet) into one versioned
+snapshot: the merged videos frame with its derived Drive/topic columns, hashtag
+stats and events as uncompressed Arrow IPC tables, topics and topic keywords in
+meta.json. lifespan loads it instead of re-merging the sources on every boot.
+meta.json also records each source's size, mtime and sha1: a snapshot is only
+considered stale when a source's contents change, not when a checkout or copy
+just moves its mtime.
+
+Usage (from be/):
+    python -m scripts.compile_snapshot [--out-dir artifacts/snapshot]
+"""
+import argparse
+import contextlib
+import io
+import os
+import time
+
+import config
+from utils.snapshot import DIGEST_CACHE_FILE, merge_sources, write_snapshot, read_meta, load_snapshot
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out-dir", default=config.SNAPSHOT_DIR or f"{config.ARTIFACTS_DIR}/snapshot")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    bundle = merge_sources(config.SOURCE_FILES, os.path.join(args.out_dir, DIGEST_CACHE_FILE))
+    merge_s = time.perf_counter() - start
+
+    meta = write_snapshot(bundle, args.out_dir)
+    size = sum(os.path.getsize(os.path.join(args.out_dir, name)) for name in meta["tables"])
+    print(f"✅ Snapshot {meta['version']}: {meta['rows']} videos, {len(meta['tables'])} tables "
+          f"({size / 1024 / 1024:.1f} MB) -> {args.out_dir}")
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        loaded = load_snapshot(args.out_dir, read_meta(args.out_dir))
+    load_s = time.perf_counter() - start
+    assert len(loaded.df) == len(bundle.df) and list(loaded.df.columns) == list(bundle.df.columns)
+
+    print(f"merge sources  {merge_s * 1000:10.1f} ms")
+    print(f"load snapshot  {load_s * 1000:10.1f} ms  ({merge_s / load_s:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
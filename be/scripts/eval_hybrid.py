@@ -0,0 +1,117 @@
+"""
+Offline evaluation of hybrid retrieval with BERTopic assignments as weak labels.
+
+For every topic (outliers excluded) queries are built from the topic name
+("3_mobil_ban_mesin_listrik" -> "mobil ban mesin listrik") and from adjacent
+pairs of its top keywords; a video counts as relevant when doc_topics assigns
+it to that topic. Reports P@10, nDCG@10, Recall@100 and MRR for BM25 only,
+FAISS only, RRF and weighted fusion (alpha sweep).
+
+Semantic runs need the sentence-transformers model; with --no-semantic (or
+when it is not installed) only BM25 is evaluated.
+
+Usage (from be/):
+    python -m scripts.eval_hybrid --alphas 0.3 0.5 0.7
+"""
+import argparse
+import contextlib
+import io
+import json
+
+import faiss
+import numpy as np
+import pandas as pd
+
+import config
+from utils.corpus import build_corpus
+from utils.data_loaders import extract_topic_keywords
+from utils.hybrid import HYBRID_DEPTH, fuse
+
+MODEL_NAME = 'firqaaa/indo-sentence-bert-base'
+
+
+def _queries(topics: dict, keywords: dict, pairs: int):
+    out = []
+    for topic_id, name in topics.items():
+        if topic_id == '-1' or 'outlier' in name.lower():
+            continue
+        out.append((int(topic_id), " ".join(name.split("_")[1:])))
+        words = keywords.get(name, [])
+        for i in range(min(pairs, len(words) - 1)):
+            out.append((int(topic_id), f"{words[i]} {words[i + 1]}"))
+    return out
+
+
+def _metrics(ranked: np.ndarray, relevant: np.ndarray) -> dict:
+    rel = np.isin(ranked, relevant)
+    gains = rel[:10] / np.log2(np.arange(2, min(len(ranked), 10) + 2))
+    ideal = 1 / np.log2(np.arange(2, min(len(relevant), 10) + 2))
+    first = np.flatnonzero(rel)
+    return {
+        "P@10": rel[:10].sum() / 10,
+        "nDCG@10": gains.sum() / ideal.sum() if len(ideal) else 0.0,
+        "R@100": rel[:100].sum() / len(relevant) if len(relevant) else 0.0,
+        "MRR": 1 / (first[0] + 1) if len(first) else 0.0,
+    }
+
+
+def _load_encoder(disabled: bool):
+    if disabled:
+        return None
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError:
+        print("⚠️ sentence-transformers not installed, evaluating BM25 only")
+        return None
+    return SentenceTransformer(MODEL_NAME)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pairs", type=int, default=5, help="keyword-pair queries per topic")
+    parser.add_argument("--alphas", type=float, nargs="+", default=[0.3, 0.5, 0.7])
+    parser.add_argument("--no-semantic", action="store_true")
+    args = parser.parse_args()
+
+    df = pd.read_parquet(config.VIDEOS_FILE)
+    with open(config.TOPICS_FILE) as f:
+        topics = json.load(f)
+    df = df.merge(pd.read_csv(config.DOC_TOPICS_FILE), on='Id', how='left')
+    keywords = extract_topic_keywords(df, topics)
+    with contextlib.redirect_stdout(io.StringIO()):
+        corpus = build_corpus(df)
+    labels = corpus.frame['Topic'].fillna(-1).astype(int).to_numpy()
+
+    encoder = _load_encoder(args.no_semantic)
+    index = faiss.read_index(f"{config.ARTIFACTS_DIR}/faiss.index") if encoder is not None else None
+
+    queries = _queries(topics, keywords, args.pairs)
+    runs = {"bm25": []}
+    if encoder is not None:
+        runs.update({"faiss": [], "rrf": []})
+        runs.update({f"weighted a={a}": [] for a in args.alphas})
+
+    for topic, q in queries:
+        relevant = np.flatnonzero(labels == topic)
+        keyword = corpus.bm25.search(q, HYBRID_DEPTH)
+        runs["bm25"].append(_metrics(keyword[1], relevant))
+        if encoder is None:
+            continue
+        vec = encoder.encode([q], normalize_embeddings=True, show_progress_bar=False).astype('float32')
+        distances, ids = index.search(vec, HYBRID_DEPTH)
+        semantic = (distances[0][ids[0] >= 0], ids[0][ids[0] >= 0])
+        runs["faiss"].append(_metrics(semantic[1], relevant))
+        runs["rrf"].append(_metrics(fuse(keyword, semantic, len(corpus))["rows"], relevant))
+        for a in args.alphas:
+            fused = fuse(keyword, semantic, len(corpus), method="weighted", alpha=a)
+            runs[f"weighted a={a}"].append(_metrics(fused["rows"], relevant))
+
+    print(f"📊 {len(queries)} queries over {len(corpus)} videos, {len(set(t for t, _ in queries))} topics")
+    print(f"{'run':<16}{'P@10':>8}{'nDCG@10':>9}{'R@100':>8}{'MRR':>8}")
+    for name, rows in runs.items():
+        m = pd.DataFrame(rows).mean()
+        print(f"{name:<16}{m['P@10']:>8.3f}{m['nDCG@10']:>9.3f}{m['R@100']:>8.3f}{m['MRR']:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
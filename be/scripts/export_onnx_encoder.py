@@ -0,0 +1,106 @@
+"""
+Export the query-encoding model to ONNX for the onnx encoder backend
+(ENCODER_BACKEND=onnx): the transformer as model.onnx (token embeddings out,
+dynamic batch and sequence axes), an int8 dynamically quantized copy as
+model.int8.onnx, the tokenizer files and encoder.json (pooling, dimension).
+Pooling and normalization stay in numpy (utils/encoder_backends.py).
+
+Needs torch + sentence-transformers (already required) and the `onnx`
+package for quantization. Validate the result with scripts/bench_encoder.py.
+
+Usage (from be/):
+    python -m scripts.export_onnx_encoder [--out-dir artifacts/encoder_onnx] [--opset 14]
+"""
+import argparse
+import json
+import os
+import time
+
+import torch
+from onnxruntime.quantization import QuantType, quantize_dynamic
+from sentence_transformers import SentenceTransformer
+from sentence_transformers.models import Normalize, Pooling
+
+import config
+from utils.encoder_backends import ONNX_MODEL_FILE, ONNX_INT8_MODEL_FILE, ONNX_META_FILE
+
+
+class _TokenEmbeddings(torch.nn.Module):
+    """The bare transformer: (input_ids, attention_mask[, token_type_ids]) -> last hidden state."""
+
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+    def forward(self, input_ids, attention_mask, token_type_ids=None):
+        return self.model(input_ids=input_ids, attention_mask=attention_mask,
+                          token_type_ids=token_type_ids).last_hidden_state
+
+
+def _pooling_mode(st: SentenceTransformer) -> str:
+    for module in st:
+        if isinstance(module, Pooling):
+            mode = module.get_pooling_mode_str()
+            if mode not in ("mean", "cls", "max"):
+                raise SystemExit(f"Unsupported pooling mode {mode!r}")
+            return mode
+    return "mean"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=config.EMBEDDING_MODEL)
+    parser.add_argument("--out-dir", default=config.ENCODER_ONNX_DIR)
+    parser.add_argument("--opset", type=int, default=14)
+    args = parser.parse_args()
+
+    st = SentenceTransformer(args.model, device="cpu")
+    st.eval()
+    transformer = st[0].auto_model
+    tokenizer = st.tokenizer
+    os.makedirs(args.out_dir, exist_ok=True)
+
+    sample = tokenizer(["contoh kueri pencarian", "skincare"], padding=True, return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["token_embeddings"] = {0: "batch", 1: "sequence"}
+
+    start = time.perf_counter()
+    model_path = os.path.join(args.out_dir, ONNX_MODEL_FILE)
+    with torch.no_grad():
+        torch.onnx.export(
+            _TokenEmbeddings(transformer),
+            tuple(sample[name] for name in input_names),
+            model_path,
+            input_names=input_names,
+            output_names=["token_embeddings"],
+            dynamic_axes=dynamic_axes,
+            opset_version=args.opset,
+            do_constant_folding=True,
+        )
+    print(f"✅ Exported {model_path} ({os.path.getsize(model_path) / 1024 / 1024:.0f} MB, "
+          f"{time.perf_counter() - start:.1f}s)")
+
+    # Weights of MatMul/Gemm to int8, activations quantized on the fly per batch
+    int8_path = os.path.join(args.out_dir, ONNX_INT8_MODEL_FILE)
+    quantize_dynamic(model_path, int8_path, weight_type=QuantType.QInt8, per_channel=True)
+    print(f"✅ Quantized {int8_path} ({os.path.getsize(int8_path) / 1024 / 1024:.0f} MB)")
+
+    tokenizer.save_pretrained(args.out_dir)
+    meta = {
+        "model_name": args.model,
+        "pooling": _pooling_mode(st),
+        "normalize": any(isinstance(module, Normalize) for module in st),
+        "dim": st.get_sentence_embedding_dimension(),
+        "max_seq_length": st.max_seq_length,
+        "inputs": input_names,
+        "opset": args.opset,
+        "exported_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+    with open(os.path.join(args.out_dir, ONNX_META_FILE), "w") as f:
+        json.dump(meta, f, indent=2)
+    print(f"✅ Wrote tokenizer + {ONNX_META_FILE} (pooling={meta['pooling']}, dim={meta['dim']}) -> {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
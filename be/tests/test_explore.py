@@ -0,0 +1,17 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from routes import explore
+from utils.pagination import MAX_RANKING
+
+app = FastAPI()
+app.include_router(explore.router)
+client = TestClient(app)
+
+
+def test_rows_per_section_is_bounded():
+    assert client.get("/api/explore", params={"q": "gym", "rows_per_section": MAX_RANKING + 1}).status_code == 422
+    assert client.get("/api/explore", params={"q": "gym", "rows_per_section": 0}).status_code == 422
+    # Within bounds the request is served (no data loaded here: no sections)
+    r = client.get("/api/explore", params={"q": "gym", "rows_per_section": MAX_RANKING})
+    assert r.status_code == 200 and r.json()["sections"] == []
@@ -0,0 +1,84 @@
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from utils.inference import InferenceExecutor, InferenceTimeout, StageLatency
+from utils.query_encoder import BatchingEncoder, QueryEmbeddingCache
+
+
+class FakeModel:
+    """Deterministic 4-d "embeddings"; blocks while `gate` is cleared."""
+
+    def __init__(self):
+        self.gate = threading.Event()
+        self.gate.set()
+        self.calls = []
+
+    def encode(self, texts, normalize_embeddings=True, show_progress_bar=False):
+        self.gate.wait()
+        self.calls.append(list(texts))
+        return np.asarray([[len(t), 1.0, 0.0, 0.0] for t in texts], dtype=np.float64)
+
+
+def _encoder(model, window_ms=5.0):
+    return BatchingEncoder(model, QueryEmbeddingCache(max_entries=16), window_ms=window_ms)
+
+
+def test_cancelled_caller_does_not_kill_encoder_thread():
+    model = FakeModel()
+    encoder = _encoder(model, window_ms=100.0)
+    executor = InferenceExecutor(workers=1, max_queue=4, latency=StageLatency())
+
+    async def scenario():
+        waiting = asyncio.ensure_future(executor.wait("encode", encoder.submit, "gone"))
+        await asyncio.sleep(0.01)  # queued inside the batch window
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        return await executor.wait("encode", encoder.submit, "still here")
+
+    try:
+        vec = asyncio.run(scenario())
+        assert vec.shape == (1, 4) and vec[0, 0] == len("still here")
+        assert encoder._thread.is_alive()
+        assert ["gone"] not in model.calls  # a batch of only cancelled queries is not encoded
+        assert executor.stats()["awaiting_external"] == 0
+    finally:
+        encoder.close()
+
+
+def test_stalled_encoder_times_out_and_frees_the_slot():
+    model = FakeModel()
+    model.gate.clear()
+    encoder = _encoder(model)
+    executor = InferenceExecutor(workers=1, max_queue=1, latency=StageLatency(), wait_timeout=0.05)
+
+    try:
+        with pytest.raises(InferenceTimeout):
+            asyncio.run(executor.wait("encode", encoder.submit, "stuck"))
+        stats = executor.stats()
+        assert stats["timed_out"] == 1 and stats["awaiting_external"] == 0
+
+        model.gate.set()
+        vec = asyncio.run(executor.wait("encode", encoder.submit, "next"))
+        assert vec[0, 0] == len("next")
+    finally:
+        model.gate.set()
+        encoder.close()
+
+
+def test_failed_batch_is_reported_and_thread_survives():
+    model = FakeModel()
+    encoder = _encoder(model)
+    original = model.encode
+    model.encode = lambda *a, **k: (_ for _ in ()).throw(RuntimeError("boom"))
+
+    try:
+        with pytest.raises(RuntimeError):
+            encoder.encode("bad", timeout=2)
+        model.encode = original
+        assert encoder.encode("good", timeout=2)[0, 0] == len("good")
+    finally:
+        encoder.close()
@@ -0,0 +1,79 @@
+import re
+from collections import Counter
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .text_processing import STOPWORDS
+
+_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens, minus stopwords and single characters."""
+    return [t for t in _TOKEN.findall(str(text).lower()) if len(t) > 1 and t not in STOPWORDS]
+
+
+def rank_desc(scores: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    """Order for (scores, rows) by score descending, ties by row ascending - deterministic."""
+    return np.lexsort((rows, -scores))
+
+
+class BM25Index:
+    """
+    Okapi BM25 over one text per row, with the whole term x document weight
+    matrix precomputed at load in CSR form (one row per term):
+    weights[indptr[t]:indptr[t + 1]] are the BM25 contributions of term t to
+    documents docs[indptr[t]:indptr[t + 1]]. Scoring a query is a scatter-add
+    of the query terms' rows - no per-request tokenization of the corpus.
+    """
+
+    def __init__(self, texts: Iterable[str], k1: float = 1.5, b: float = 0.75):
+        docs = [Counter(tokenize(t)) for t in texts]
+        self.n_docs = len(docs)
+        lengths = np.asarray([sum(d.values()) for d in docs], dtype=np.float64)
+        avgdl = lengths.mean() if self.n_docs and lengths.mean() > 0 else 1.0
+
+        self.vocab = {term: i for i, term in enumerate(sorted({t for d in docs for t in d}))}
+        term_ids, doc_ids, tfs = [], [], []
+        for doc, counts in enumerate(docs):
+            for term, tf in counts.items():
+                term_ids.append(self.vocab[term])
+                doc_ids.append(doc)
+                tfs.append(tf)
+        term_ids = np.asarray(term_ids, dtype=np.int64)
+        doc_ids = np.asarray(doc_ids, dtype=np.int32)
+        tfs = np.asarray(tfs, dtype=np.float64)
+
+        order = np.lexsort((doc_ids, term_ids))
+        term_ids, doc_ids, tfs = term_ids[order], doc_ids[order], tfs[order]
+        df = np.bincount(term_ids, minlength=len(self.vocab))
+        self.idf = np.log1p((self.n_docs - df + 0.5) / (df + 0.5))
+
+        norm = k1 * (1 - b + b * lengths[doc_ids] / avgdl)
+        self.weights = (self.idf[term_ids] * tfs * (k1 + 1) / (tfs + norm)).astype(np.float32)
+        self.docs = doc_ids
+        self.indptr = np.concatenate(([0], np.cumsum(df))).astype(np.int64)
+
+    def __len__(self):
+        return self.n_docs
+
+    def scores(self, q: str) -> np.ndarray:
+        """BM25 score of every document for `q` (0 where no query term occurs)."""
+        out = np.zeros(self.n_docs, dtype=np.float32)
+        for term in set(tokenize(q)):
+            t = self.vocab.get(term)
+            if t is not None:
+                sl = slice(self.indptr[t], self.indptr[t + 1])
+                out[self.docs[sl]] += self.weights[sl]
+        return out
+
+    def search(self, q: str, k: Optional[int] = None, row_mask: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Top-`k` (scores, rows) with a positive score, restricted to `row_mask`, best first."""
+        scores = self.scores(q)
+        hit = scores > 0
+        if row_mask is not None:
+            hit &= row_mask
+        rows = np.flatnonzero(hit)
+        order = rank_desc(scores[rows], rows)[:k]
+        return scores[rows[order]], rows[order]
@@ -0,0 +1,174 @@
+import numpy as np
+import orjson
+import pandas as pd
+from typing import Any, Dict, List, Sequence
+
+from .hashtag_index import HashtagColumn
+
+# Explore/search card fields, in response order
+VIDEO_CARD_FIELDS = [
+    "id", "title", "creator", "category", "views", "likes", "engagement_rate",
+    "thumbnail", "video_url", "embed_url", "instagram_url", "hashtags"
+]
+
+# Trending list card fields; "title" is picked per endpoint (see CardTable.trend_cards)
+TREND_CARD_FIELDS = [
+    "id", "title", "creator", "thumbnail", "embed_url", "views", "likes",
+    "engagement_rate", "category", "hashtags", "instagram_url"
+]
+
+# Event segment / sample video fields
+EVENT_CARD_FIELDS = ["id", "thumbnail", "embed_url", "creator", "category", "views", "likes"]
+
+
+def _column(frame: pd.DataFrame, name: str) -> pd.Series:
+    return frame[name] if name in frame.columns else pd.Series([None] * len(frame), index=frame.index, dtype=object)
+
+
+def _present(s: pd.Series) -> pd.Series:
+    """Values as stripped strings, None where missing, blank or the literal 'nan'."""
+    text = s.astype(str)
+    valid = s.notna() & text.str.strip().ne("") & text.str.lower().ne("nan")
+    return text.str.strip().where(valid, None)
+
+
+def _or_none(s: pd.Series) -> np.ndarray:
+    """Object array with NaN/NaT replaced by None (JSON-safe)."""
+    return s.astype(object).where(s.notna(), None).to_numpy()
+
+
+def _clean_title(title: pd.Series, max_words: int = 5) -> pd.Series:
+    """Collapse whitespace and keep the first `max_words` words ("..." when cut)."""
+    title = title.str.replace(r"\s+", " ", regex=True).str.strip()
+    words = title.str.split(" ")
+    cut = words.str.len() > max_words
+    return title.where(~cut, words.str[:max_words].str.join(" ") + "...")
+
+
+def _build(columns: Dict[str, np.ndarray], fields: Sequence[str], rows: np.ndarray) -> List[Dict[str, Any]]:
+    picked = [columns[f][rows].tolist() for f in fields]
+    return [dict(zip(fields, values)) for values in zip(*picked)]
+
+
+class CardTable:
+    """
+    Card fields for every video, computed once from the prepared frame:
+    titles, thumbnails/embed urls and JSON-safe numerics. Cards for N rows are
+    built by indexing these columns with the row positions, so request paths
+    never touch `iterrows` or per-row cleanup. Row positions are corpus rows.
+
+    With fragments enabled, callers that pass `serialized=True` (and will not
+    modify the cards) get each card as pre-serialized orjson bytes instead,
+    rendered once per video and layout and spliced into ORJSONResponse output.
+    """
+
+    def __init__(self, frame: pd.DataFrame, hashtags: HashtagColumn):
+        self.fragments_enabled = False
+        self._fragments: Dict[tuple, np.ndarray] = {}  # (layout...) -> per-row Fragment or None
+        caption = _present(_column(frame, "caption"))
+        text = _present(_column(frame, "text"))
+        full_text = _present(_column(frame, "full_text"))
+        category = _column(frame, "category")
+        display_url = _column(frame, "display_url")
+        embed_url = _column(frame, "embed_url")
+        thumbnail_url = _column(frame, "thumbnail_url")
+        drive_id = _column(frame, "drive_file_id")
+
+        ids = pd.to_numeric(_column(frame, "Id"), errors="coerce").fillna(0).astype(np.int64)
+        views = pd.to_numeric(_column(frame, "view_count"), errors="coerce").fillna(0).astype(np.int64)
+        likes = pd.to_numeric(_column(frame, "like_count"), errors="coerce").fillna(0).astype(np.int64)
+        engagement = pd.to_numeric(_column(frame, "engagement_rate"), errors="coerce")
+        engagement = engagement.replace([np.inf, -np.inf], np.nan).fillna(0.0).astype(float)
+
+        # Explore title: caption, text, full_text, else "<category> video"
+        category_text = category.astype(str).str.strip()
+        category_ok = category.notna() & ~category_text.str.lower().isin(["nan", "none", ""])
+        fallback = pd.Series(np.where(category_ok, category_text + " video", "Video"), index=frame.index)
+        title = caption.combine_first(text).combine_first(full_text).combine_first(fallback)
+
+        thumbnail = thumbnail_url.where(thumbnail_url.notna(), display_url)
+        video_url = embed_url.where(embed_url.notna(), display_url)
+        tag_lists = np.empty(len(frame), dtype=object)
+        tag_lists[:] = [hashtags.tags_of(r) for r in range(len(frame))]
+
+        self.video_columns = {
+            "id": ids.to_numpy(),
+            "title": _clean_title(title).to_numpy(dtype=object),
+            "creator": _column(frame, "owner_username").astype(str).str.strip().replace("", "Unknown").to_numpy(),
+            "category": category_text.replace("", "General").to_numpy(),
+            "views": views.to_numpy(),
+            "likes": likes.to_numpy(),
+            # Python's round (not numpy's) so values match round(x, 5) exactly
+            "engagement_rate": np.array([round(v, 5) for v in engagement.tolist()], dtype=float),
+            "thumbnail": thumbnail.where(thumbnail.notna(), "").to_numpy(dtype=object),
+            "video_url": video_url.where(video_url.notna(), "").to_numpy(dtype=object),
+            "embed_url": _or_none(embed_url),
+            "instagram_url": display_url.where(display_url.notna(), "").to_numpy(dtype=object),
+            "hashtags": tag_lists,
+        }
+
+        # Trending lists link Drive directly and fall back to the Instagram CDN thumbnail
+        has_drive = drive_id.notna()
+        drive = drive_id.astype(str)
+        drive_thumbnail = ("https://drive.google.com/thumbnail?id=" + drive + "&sz=w400").where(has_drive, None)
+        instagram = _column(frame, "shortcode_url")
+        instagram = instagram.where(instagram.notna() & instagram.astype(bool), _column(frame, "video_url"))
+        id_title = "Video " + ids.astype(str)
+        short_title = caption.combine_first(full_text.str[:50])
+        long_title = caption.str[:100]
+        self.trend_columns = {
+            "id": ids.to_numpy(),
+            "title_short": short_title.where(short_title.notna(), id_title).to_numpy(dtype=object),
+            "title_long": long_title.where(long_title.notna(), id_title).to_numpy(dtype=object),
+            "creator": _or_none(_column(frame, "owner_username")),
+            "thumbnail": _or_none(drive_thumbnail.where(has_drive, display_url)),
+            "embed_url": _or_none(("https://drive.google.com/file/d/" + drive + "/preview").where(has_drive, None)),
+            "views": views.to_numpy(),
+            "likes": likes.to_numpy(),
+            "engagement_rate": engagement.to_numpy(),
+            "category": _or_none(category),
+            "hashtags": tag_lists,
+            "instagram_url": _or_none(instagram),
+            # Event videos show no thumbnail rather than the CDN one
+            "thumbnail_event": _or_none(drive_thumbnail),
+        }
+
+    def __len__(self):
+        return len(self.video_columns["id"])
+
+    def enable_fragments(self, enabled: bool = True):
+        self.fragments_enabled = enabled
+        self._fragments = {}
+
+    def _cards(self, layout: tuple, columns: Dict[str, np.ndarray], fields: Sequence[str],
+               rows: np.ndarray, serialized: bool) -> List[Any]:
+        rows = np.asarray(rows, dtype=np.int64)
+        if not (serialized and self.fragments_enabled):
+            return _build(columns, fields, rows)
+        cache = self._fragments.get(layout)
+        if cache is None:
+            cache = self._fragments.setdefault(layout, np.full(len(self), None, dtype=object))
+        missing = np.unique([r for r in rows.tolist() if cache[r] is None]).astype(np.int64)
+        # Concurrent fills render identical bytes, so racing writers are harmless
+        for r, card in zip(missing.tolist(), _build(columns, fields, missing)):
+            cache[r] = orjson.Fragment(orjson.dumps(card))
+        return cache[rows].tolist()
+
+    def video_cards(self, rows: np.ndarray, serialized: bool = False) -> List[Dict[str, Any]]:
+        """Explore/search cards for `rows`, in order."""
+        return self._cards(("video",), self.video_columns, VIDEO_CARD_FIELDS, rows, serialized)
+
+    def trend_cards(self, rows: np.ndarray, title: str = "short",
+                    fields: Sequence[str] = TREND_CARD_FIELDS, serialized: bool = False) -> List[Dict[str, Any]]:
+        """
+        Trending list cards for `rows` with the given `fields`. `title` "short"
+        is the caption or the first 50 chars of full_text, "long" the caption
+        cut at 100 chars.
+        """
+        columns = dict(self.trend_columns, title=self.trend_columns[f"title_{title}"])
+        return self._cards(("trend", title, tuple(fields)), columns, fields, rows, serialized)
+
+    def event_cards(self, rows: np.ndarray, serialized: bool = False) -> List[Dict[str, Any]]:
+        """Videos attached to event segments (Drive thumbnail only)."""
+        columns = dict(self.trend_columns, thumbnail=self.trend_columns["thumbnail_event"])
+        return self._cards(("event",), columns, EVENT_CARD_FIELDS, rows, serialized)
@@ -0,0 +1,131 @@
+import threading
+
+import numpy as np
+import pandas as pd
+from typing import List
+from .text_index import TextIndex, is_plain_pattern
+from .hashtag_index import HashtagColumn, HashtagIndex
+from .row_filter import RowFilter
+from .bm25 import BM25Index
+from .cards import CardTable
+from .video_store import VideoStore
+
+# Columns every route expects to exist on the videos frame
+VIDEO_COLUMNS = [
+    "Id", "caption", "text", "full_text", "owner_username", "category", "hashtags",
+    "raw_video_path", "display_url", "view_count", "like_count", "engagement_rate",
+    "embed_url", "thumbnail_url"
+]
+
+# Lowercased copies used for keyword matching: lc column -> source column
+LC_COLUMNS = {
+    "lc_caption": "caption",
+    "lc_text": "text",
+    "lc_full_text": "full_text",
+    "lc_creator": "owner_username",
+    "lc_category": "category",
+}
+
+# Columns joined into the case-insensitive blob used by the trending search endpoints
+SEARCH_BLOB_COLUMNS = ["caption", "full_text", "owner_username", "category", "hashtags"]
+SEARCH_BLOB = "search_blob"
+
+# Columns BM25 ranks over (hybrid search)
+BM25_COLUMNS = ["caption", "full_text"]
+
+
+def prepare_videos(df: pd.DataFrame, hashtags: HashtagColumn) -> pd.DataFrame:
+    """Fill missing columns, coerce numerics, attach parsed hashtags and add lowercased text columns (in place)."""
+    for c in VIDEO_COLUMNS:
+        if c not in df.columns:
+            df[c] = None
+
+    df["view_count"] = pd.to_numeric(df["view_count"], errors="coerce").fillna(0)
+    df["like_count"] = pd.to_numeric(df["like_count"], errors="coerce").fillna(0)
+    df["engagement_rate"] = pd.to_numeric(df["engagement_rate"], errors="coerce").fillna(0.0)
+    df["hashtags_list"] = hashtags.to_lists()
+    for lc_col, src_col in LC_COLUMNS.items():
+        df[lc_col] = df[src_col].astype(str).str.lower()
+    return df
+
+
+def search_blob(df: pd.DataFrame) -> pd.Series:
+    """Space-joined SEARCH_BLOB_COLUMNS, upper-cased the way str.contains(case=False) compares."""
+    text = None
+    for c in SEARCH_BLOB_COLUMNS:
+        col = df[c].fillna("").astype(str) if c in df.columns else pd.Series([""] * len(df), index=df.index)
+        text = col if text is None else text.str.cat(col, sep=" ")
+    return text.str.upper()
+
+
+class PreparedCorpus:
+    """
+    Videos normalized once at startup. Route handlers read `frame` directly and
+    must never mutate it - filter/sort into new frames instead.
+
+    The frame keeps a RangeIndex, so index positions returned by the text and
+    hashtag indexes are also row labels.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        df = df.reset_index(drop=True)
+        self.hashtags = HashtagColumn(df["hashtags"] if "hashtags" in df.columns else [None] * len(df))
+        self._frame = prepare_videos(df, self.hashtags)
+        fields = {lc_col: self._frame[lc_col].tolist() for lc_col in LC_COLUMNS}
+        fields[SEARCH_BLOB] = search_blob(self._frame).tolist()
+        self.text_index = TextIndex(fields)
+        self.hashtag_index = HashtagIndex(self.hashtags, self._frame["view_count"].to_numpy())
+        self.cards = CardTable(self._frame, self.hashtags)
+        self.videos = VideoStore(self._frame["Id"], self.cards)
+        self.row_filter = RowFilter(self._frame, self.hashtag_index, self.videos)
+        bm25_text = self._frame[BM25_COLUMNS[0]].fillna("").astype(str)
+        for c in BM25_COLUMNS[1:]:
+            bm25_text = bm25_text.str.cat(self._frame[c].fillna("").astype(str), sep=" ")
+        self._bm25_text = bm25_text.tolist()
+        self._bm25 = None
+        self._lock = threading.Lock()
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        return self._frame
+
+    @property
+    def bm25(self) -> BM25Index:
+        """Built on first use (only hybrid search ranks with it) or by warm()."""
+        if self._bm25 is None:
+            with self._lock:
+                if self._bm25 is None:
+                    self._bm25 = BM25Index(self._bm25_text)
+        return self._bm25
+
+    def warm(self):
+        """Build the text indexes now instead of on their first query."""
+        self.text_index.warm()
+        self.bm25
+
+    def __len__(self):
+        return len(self._frame)
+
+    def match_rows(self, lc_columns: List[str], q: str) -> np.ndarray:
+        """
+        Sorted row positions where any of `lc_columns` matches `q`, with the
+        semantics of `frame[col].str.contains(q, na=False)` (regex by default).
+        Plain queries resolve through the trigram index; regex ones fall back to a scan.
+        """
+        if is_plain_pattern(q):
+            return self.text_index.contains_any(lc_columns, q)
+        mask = np.zeros(len(self._frame), dtype=bool)
+        for c in lc_columns:
+            mask |= self._frame[c].str.contains(q, na=False).to_numpy()
+        return np.flatnonzero(mask)
+
+    def search_rows(self, q: str) -> np.ndarray:
+        """Sorted row positions matching `q` case-insensitively (no regex) across SEARCH_BLOB_COLUMNS."""
+        return self.text_index.contains(SEARCH_BLOB, q.upper())
+
+
+def build_corpus(df: pd.DataFrame) -> PreparedCorpus:
+    """Build the shared prepared corpus from the merged videos DataFrame."""
+    corpus = PreparedCorpus(df)
+    print(f"✅ Prepared corpus: {len(corpus)} videos")
+    return corpus
@@ -1,5 +1,7 @@
 import pandas as pd
 from collections import Counter
+import hashlib
+import os
 import re
 from .text_processing import STOPWORDS, is_interesting_query
 
@@ -26,4 +28,18 @@ def extract_topic_keywords(df_with_topics, topics_dict, top_n=20):
         if len(top_words) >= 2:
             topic_keywords[topic_name] = top_words
 
-    return topic_keywords
\ No newline at end of file
+    return topic_keywords
+
+def artifacts_version(paths) -> str:
+    """
+    Short token identifying the current data snapshot, derived from the
+    artifact files' sizes and modification times (missing files count too).
+    """
+    h = hashlib.sha1()
+    for path in paths:
+        try:
+            st = os.stat(path)
+            h.update(f"{path}:{st.st_size}:{st.st_mtime_ns};".encode())
+        except OSError:
+            h.update(f"{path}:missing;".encode())
+    return h.hexdigest()[:12]
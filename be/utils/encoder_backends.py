@@ -0,0 +1,105 @@
+import json
+import os
+from typing import Iterable, Optional
+
+import numpy as np
+
+# Selectable with ENCODER_BACKEND
+ENCODER_BACKENDS = ("torch", "onnx")
+
+# Written by scripts/export_onnx_encoder.py next to the tokenizer files
+ONNX_MODEL_FILE = "model.onnx"
+ONNX_INT8_MODEL_FILE = "model.int8.onnx"
+ONNX_META_FILE = "encoder.json"
+
+
+def onnx_model_path(onnx_dir: str, quantized: bool = True) -> str:
+    return os.path.join(onnx_dir, ONNX_INT8_MODEL_FILE if quantized else ONNX_MODEL_FILE)
+
+
+def pool(token_embeddings: np.ndarray, attention_mask: np.ndarray, mode: str = "mean") -> np.ndarray:
+    """Sentence vectors from (n, seq, dim) token embeddings, like sentence-transformers' Pooling module."""
+    if mode == "cls":
+        return token_embeddings[:, 0]
+    mask = attention_mask[..., None].astype(token_embeddings.dtype)
+    if mode == "max":
+        return np.where(mask > 0, token_embeddings, -1e9).max(axis=1)
+    return (token_embeddings * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+
+
+class OnnxQueryModel:
+    """
+    SentenceTransformer stand-in for query encoding on ONNX Runtime (CPU):
+    the transformer exported by scripts/export_onnx_encoder.py, int8
+    dynamically quantized by default, with the exported model's pooling.
+    Inputs are truncated to `max_seq_length` tokens - queries are short and
+    attention cost grows with sequence length.
+
+    Implements the part of the SentenceTransformer interface BatchingEncoder
+    and the scripts use: `encode(texts, normalize_embeddings=...)` and `tokenizer`.
+    """
+
+    def __init__(self, onnx_dir: str, quantized: bool = True, max_seq_length: int = 64, threads: int = 0):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        with open(os.path.join(onnx_dir, ONNX_META_FILE), "r") as f:
+            self.meta = json.load(f)
+        self.pooling = self.meta.get("pooling", "mean")
+        self.tokenizer = AutoTokenizer.from_pretrained(onnx_dir)
+        self.max_seq_length = min(max_seq_length or self.meta["max_seq_length"], self.meta["max_seq_length"])
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+        self.path = onnx_model_path(onnx_dir, quantized)
+        self.session = ort.InferenceSession(self.path, options, providers=["CPUExecutionProvider"])
+        self._inputs = [i.name for i in self.session.get_inputs()]
+
+    @property
+    def cache_namespace(self) -> str:
+        """Query-cache namespace: int8/ONNX vectors must not mix with the torch model's on disk."""
+        return f"{self.meta['model_name']}@{os.path.splitext(os.path.basename(self.path))[0]}"
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.meta["dim"]
+
+    def encode(self, texts: Iterable[str], normalize_embeddings: bool = False, batch_size: int = 32,
+               show_progress_bar: bool = False, **_) -> np.ndarray:
+        texts = [texts] if isinstance(texts, str) else list(texts)
+        out = []
+        for start in range(0, len(texts), batch_size):
+            features = self.tokenizer(texts[start:start + batch_size], padding=True, truncation=True,
+                                      max_length=self.max_seq_length, return_tensors="np")
+            feed = {name: features[name].astype(np.int64) for name in self._inputs}
+            token_embeddings = self.session.run(None, feed)[0]
+            out.append(pool(token_embeddings, features["attention_mask"], self.pooling))
+        vectors = np.concatenate(out).astype(np.float32) if out else np.empty((0, self.meta["dim"]), np.float32)
+        if normalize_embeddings:
+            vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        return vectors
+
+
+def load_query_model(backend: str, model_name: str, onnx_dir: Optional[str] = None, quantized: bool = True,
+                     max_seq_length: int = 64, threads: int = 0):
+    """
+    The query-encoding model for `backend`: "torch" (SentenceTransformer) or
+    "onnx" (OnnxQueryModel over `onnx_dir`; falls back to torch when no export
+    is there). `max_seq_length` caps tokens per query on both (0 = model default).
+    """
+    if backend not in ENCODER_BACKENDS:
+        raise ValueError(f"Unknown encoder backend {backend!r}, expected one of {ENCODER_BACKENDS}")
+    if backend == "onnx":
+        if onnx_dir and os.path.exists(onnx_model_path(onnx_dir, quantized)):
+            return OnnxQueryModel(onnx_dir, quantized, max_seq_length, threads)
+        print(f"⚠️ No ONNX encoder in {onnx_dir} (export one with: python -m scripts.export_onnx_encoder), "
+              f"falling back to torch")
+
+    # Imported here: sentence_transformers (torch) alone takes seconds to import
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer(model_name)
+    if max_seq_length:
+        model.max_seq_length = min(model.max_seq_length, max_seq_length)
+    return model
@@ -0,0 +1,74 @@
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from .video_store import VideoStore
+
+# "[864] First sentence [860] Second..." -> (video id, sentence) pairs
+_SEGMENT = re.compile(r'\[(\d+)\]\s*([^\[]+)')
+
+MAX_SEGMENTS = 10
+MAX_SAMPLE_VIDEOS = 6
+
+
+def parse_list(value: Any) -> List[Any]:
+    """A JSON-ish list column ("['a', 'b']" or '["a"]'); anything unparsable is empty."""
+    if isinstance(value, list):
+        return value
+    try:
+        parsed = json.loads(str(value).replace("'", '"'))
+    except (ValueError, TypeError):
+        return []
+    return parsed if isinstance(parsed, list) else []
+
+
+def split_segments(text: Any) -> List[Tuple[int, str]]:
+    """(video_id, sentence) for every [ID] marker in a summary text."""
+    if not isinstance(text, str):
+        return []
+    return [(int(vid_id), sentence.strip()) for vid_id, sentence in _SEGMENT.findall(text)]
+
+
+class EventCatalog:
+    """
+    Event payloads compiled once at load: list columns parsed, summary text
+    split into segments and every referenced video resolved to its card.
+    Requests only look up a category and slice; payloads are shared and must
+    not be mutated.
+    """
+
+    def __init__(self, event_data: Optional[pd.DataFrame], videos: VideoStore):
+        self._by_category: Dict[str, List[Dict[str, Any]]] = {}
+        if event_data is None:
+            return
+        for event in event_data.to_dict("records"):
+            self._by_category.setdefault(event.get("category"), []).append(self._compile(event, videos))
+
+    @staticmethod
+    def _compile(event: Dict[str, Any], videos: VideoStore) -> Dict[str, Any]:
+        member_ids = parse_list(event.get("member_ids"))
+        segments = split_segments(event.get("summary_text"))[:MAX_SEGMENTS]
+        sample_ids = [vid for vid in member_ids[:MAX_SAMPLE_VIDEOS] if isinstance(vid, int)]
+
+        # Segment and sample videos resolved in one keyed lookup
+        found = videos.get_many([vid for vid, _ in segments] + sample_ids, kind="event", serialized=True)
+        return {
+            "event_id": event.get("event_id"),
+            "cluster_size": int(event.get("cluster_size") or 0),
+            "time_start": event.get("time_start"),
+            "time_end": event.get("time_end"),
+            "summary_highlevel": event.get("summary_highlevel"),
+            "summary_text": event.get("summary_text"),
+            "top_hashtags": parse_list(event.get("top_hashtags")),
+            "member_ids": member_ids,
+            "sample_videos": [video for video in found[len(segments):] if video],
+            "segments": [{"text": sentence, "video": video} for (_, sentence), video in zip(segments, found)]
+        }
+
+    def __len__(self):
+        return sum(len(events) for events in self._by_category.values())
+
+    def events(self, category_name: str) -> List[Dict[str, Any]]:
+        return self._by_category.get(category_name, [])
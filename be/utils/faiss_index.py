@@ -0,0 +1,163 @@
+import math
+import os
+from typing import TYPE_CHECKING, Optional, Tuple
+
+import numpy as np
+
+# faiss is imported inside the functions that use it, so importing this module
+# (main.py, routes) does not pay for loading the FAISS library
+if TYPE_CHECKING:
+    import faiss
+
+# Index variants the build script can produce and lifespan can load
+INDEX_TYPES = ("flat", "ivf_flat", "hnsw", "ivf_pq")
+
+# FAISS recommends ~39 training points per centroid
+_MIN_POINTS_PER_CENTROID = 39
+
+
+def index_path(artifacts_dir: str, index_type: str) -> str:
+    """Artifact path for an index type; the exact index keeps its historical name."""
+    if index_type == "flat":
+        return os.path.join(artifacts_dir, "faiss.index")
+    return os.path.join(artifacts_dir, f"faiss_{index_type}.index")
+
+
+def load_index(path: str, mmap: bool = True) -> Tuple["faiss.Index", str]:
+    """
+    Read an index, memory-mapping it when possible so several workers share one
+    page-cache copy: IVF inverted lists via IO_FLAG_MMAP, flat codes via
+    IO_FLAG_MMAP_IFC on FAISS builds that have it. Falls back to a plain read.
+    Returns (index, "mmap" | "read").
+    """
+    import faiss
+    if mmap:
+        flags = faiss.IO_FLAG_MMAP | getattr(faiss, "IO_FLAG_MMAP_IFC", 0) | faiss.IO_FLAG_READ_ONLY
+        try:
+            return faiss.read_index(path, flags), "mmap"
+        except RuntimeError as e:
+            print(f"⚠️ Could not mmap {path} ({e}), reading it into memory")
+    return faiss.read_index(path), "read"
+
+
+def default_nlist(n: int) -> int:
+    """~4*sqrt(n) inverted lists, capped so each centroid still gets enough training points."""
+    return max(1, min(int(4 * math.sqrt(n)), n // _MIN_POINTS_PER_CENTROID))
+
+
+def _pq_nbits(n: int) -> int:
+    """8-bit PQ codes need 256 centroids per sub-quantizer; use fewer bits on small corpora."""
+    return max(1, min(8, int(math.log2(max(n // _MIN_POINTS_PER_CENTROID, 2)))))
+
+
+def build_index(
+    index_type: str,
+    vectors: np.ndarray,
+    nlist: Optional[int] = None,
+    pq_m: int = 64,
+    hnsw_m: int = 32,
+    ef_construction: int = 200,
+) -> "faiss.Index":
+    """
+    Build an inner-product index over L2-normalized `vectors` (cosine similarity),
+    so every variant ranks like the IndexFlatIP the app was built on.
+    """
+    import faiss
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    n, d = vectors.shape
+
+    if index_type == "flat":
+        index = faiss.IndexFlatIP(d)
+    elif index_type == "hnsw":
+        index = faiss.IndexHNSWFlat(d, hnsw_m, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = ef_construction
+    elif index_type in ("ivf_flat", "ivf_pq"):
+        nlist = nlist or default_nlist(n)
+        quantizer = faiss.IndexFlatIP(d)
+        if index_type == "ivf_flat":
+            index = faiss.IndexIVFFlat(quantizer, d, nlist, faiss.METRIC_INNER_PRODUCT)
+        else:
+            if d % pq_m:
+                raise ValueError(f"pq_m={pq_m} must divide the embedding dimension {d}")
+            index = faiss.IndexIVFPQ(quantizer, d, nlist, pq_m, _pq_nbits(n), faiss.METRIC_INNER_PRODUCT)
+        index.train(vectors)
+    else:
+        raise ValueError(f"Unknown FAISS index type '{index_type}', expected one of {INDEX_TYPES}")
+
+    index.add(vectors)
+    return index
+
+
+def apply_search_params(index: "faiss.Index", nprobe: int, ef_search: int) -> "faiss.Index":
+    """Set query-time knobs on whichever index type was loaded (no-op for flat)."""
+    import faiss
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is not None:
+        ivf.nprobe = min(nprobe, ivf.nlist)
+    if hasattr(index, "hnsw"):
+        index.hnsw.efSearch = ef_search
+    return index
+
+
+def describe(index: "faiss.Index") -> str:
+    import faiss
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is not None:
+        return f"{type(index).__name__} (nlist={ivf.nlist}, nprobe={ivf.nprobe})"
+    if hasattr(index, "hnsw"):
+        return f"{type(index).__name__} (efSearch={index.hnsw.efSearch})"
+    return type(index).__name__
+
+
+def search_filtered(
+    index: "faiss.Index",
+    queries: np.ndarray,
+    k: int,
+    row_mask: Optional[np.ndarray] = None,
+    max_expansions: int = 4,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    k-NN restricted to rows where `row_mask` is True (index ids are row positions).
+
+    The mask is pushed into FAISS as an IDSelectorBitmap, so filtered-out
+    vectors are skipped during the search instead of being dropped afterwards.
+    Approximate indexes can still come back short when the allowed rows are
+    rare among the probed lists / visited graph nodes; in that case nprobe or
+    efSearch is doubled (up to `max_expansions` times) until k results are found.
+    Missing results are padded with id -1, like a plain FAISS search.
+    """
+    if row_mask is None:
+        return index.search(queries, k)
+
+    allowed = int(row_mask.sum())
+    if allowed == 0:
+        return (np.full((len(queries), k), -np.inf, dtype=np.float32),
+                np.full((len(queries), k), -1, dtype=np.int64))
+    wanted = min(k, allowed)
+
+    import faiss
+    sel = faiss.IDSelectorBitmap(np.packbits(row_mask, bitorder="little"))
+    ivf = faiss.try_extract_index_ivf(index)
+    nprobe = ivf.nprobe if ivf is not None else 0
+    ef_search = max(index.hnsw.efSearch, k) if hasattr(index, "hnsw") else 0
+
+    for attempt in range(max_expansions + 1):
+        if ivf is not None:
+            params = faiss.SearchParametersIVF(sel=sel, nprobe=nprobe)
+        elif hasattr(index, "hnsw"):
+            params = faiss.SearchParametersHNSW(sel=sel, efSearch=ef_search)
+        else:
+            params = faiss.SearchParameters(sel=sel)  # exact: always complete
+
+        distances, ids = index.search(queries, k, params=params)
+        complete = (ids[:, :wanted] >= 0).all()
+        if complete or (ivf is None and not hasattr(index, "hnsw")):
+            break
+        if ivf is not None:
+            if nprobe >= ivf.nlist:
+                break
+            nprobe = min(nprobe * 2, ivf.nlist)
+        else:
+            ef_search *= 2
+
+    return distances, ids
@@ -0,0 +1,39 @@
+import datetime
+from typing import Any
+
+import numpy as np
+import orjson
+import pandas as pd
+from starlette.responses import JSONResponse
+
+# numpy scalars/arrays and int dict keys (e.g. value_counts().to_dict()) serialize natively
+OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj: Any):
+    """Types orjson does not handle itself; NaT/NA become null like NaN does."""
+    if obj is pd.NaT or obj is pd.NA:
+        return None
+    if isinstance(obj, (datetime.date, datetime.time)):  # includes pd.Timestamp
+        return obj.isoformat()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=OPTIONS)
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response rendered by orjson. Returning one from a handler also skips
+    FastAPI's jsonable_encoder pass, and lets payloads embed pre-serialized
+    card bytes (orjson.Fragment, see CardTable). Being fully rendered, it can
+    be cached and re-sent as is.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,114 @@
+import re
+from typing import Iterable, List, Optional
+
+import numpy as np
+
+from .text_index import NgramIndex, is_plain_pattern
+from .text_processing import parse_hashtags
+
+
+class HashtagColumn:
+    """
+    Hashtags parsed once at load, in Arrow list-array layout: the tags of video
+    r are vocab[tag_ids[offsets[r]:offsets[r + 1]]], in their original order.
+    """
+
+    def __init__(self, raw_values: Iterable):
+        lists = [parse_hashtags(v) for v in raw_values]
+        self.vocab = np.array(sorted({t for tags in lists for t in tags}), dtype=object)
+        lookup = {tag: i for i, tag in enumerate(self.vocab)}
+        self.tag_ids = np.fromiter((lookup[t] for tags in lists for t in tags), dtype=np.int32)
+        self.offsets = np.zeros(len(lists) + 1, dtype=np.int64)
+        np.cumsum([len(tags) for tags in lists], out=self.offsets[1:])
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def tags_of(self, row: int) -> List[str]:
+        return self.vocab[self.tag_ids[self.offsets[row]:self.offsets[row + 1]]].tolist()
+
+    def to_lists(self) -> List[List[str]]:
+        return [self.tags_of(r) for r in range(len(self))]
+
+
+class HashtagIndex:
+    """
+    Hashtag -> video posting index, built once per data load from a HashtagColumn.
+
+    - `vocab`: sorted array of tags, shared with the column (tag id = position)
+    - `offsets` / `rows`: CSR postings; rows[offsets[t]:offsets[t + 1]] are the
+      sorted row positions of videos tagged with tag t
+    - `tag_views` / `tag_counts`: per-tag view sum and video count
+    """
+
+    def __init__(self, column: HashtagColumn, view_counts: np.ndarray):
+        self.vocab = column.vocab
+        self.tag_ids = {tag: i for i, tag in enumerate(self.vocab)}
+
+        # (row, tag) pairs straight from the columnar layout
+        pair_rows = np.repeat(np.arange(len(column), dtype=np.int32), np.diff(column.offsets))
+        pair_tags = column.tag_ids
+
+        order = np.lexsort((pair_rows, pair_tags))
+        self.rows = pair_rows[order]
+        self.offsets = np.searchsorted(pair_tags[order], np.arange(len(self.vocab) + 1)).astype(np.int64)
+        self.tag_counts = np.diff(self.offsets)
+        self._tag_of_posting = np.repeat(np.arange(len(self.vocab)), self.tag_counts)
+        views = np.nan_to_num(np.asarray(view_counts, dtype=np.float64))
+        self.tag_views = np.bincount(pair_tags, weights=views[pair_rows], minlength=len(self.vocab))
+
+        self._vocab_index = NgramIndex(self.vocab.tolist())
+
+    def __len__(self):
+        return len(self.vocab)
+
+    def lookup(self, tag: str) -> Optional[int]:
+        return self.tag_ids.get(str(tag).lower())
+
+    def rows_for(self, tag_id: int) -> np.ndarray:
+        return self.rows[self.offsets[tag_id]:self.offsets[tag_id + 1]]
+
+    def match(self, q: str) -> np.ndarray:
+        """Ids of tags containing `q` (regex semantics when `q` has metacharacters), ascending."""
+        if is_plain_pattern(q):
+            return self._vocab_index.contains(q)
+        pattern = re.compile(q)
+        return np.asarray([i for i, tag in enumerate(self.vocab) if pattern.search(tag)], dtype=np.int32)
+
+    def top_matching(self, q: str, k: int) -> List[int]:
+        """Up to `k` tag ids containing `q`, by total views (ties: alphabetical)."""
+        ids = self.match(q)
+        order = np.argsort(-self.tag_views[ids], kind="stable")
+        return ids[order[:k]].tolist()
+
+    def rows_for_query(self, q: str) -> np.ndarray:
+        """
+        Sorted rows of videos with a tag containing `q` (case-insensitive; regex
+        when `q` has metacharacters) - the rows `hashtags.str.contains(q, case=False)`
+        selects, resolved as the union of the matching tags' postings.
+        """
+        try:
+            ids = self.match(str(q).lower())
+        except re.error:
+            ids = self._vocab_index.contains(str(q).lower())
+        if len(ids) == 0:
+            return np.empty(0, dtype=np.int32)
+        return np.unique(np.concatenate([self.rows_for(t) for t in ids]))
+
+    def top_tags(self, row_mask: Optional[np.ndarray] = None, k: int = 10) -> List[tuple]:
+        """
+        Up to `k` (tag, video_count) pairs, most frequent first (ties: alphabetical).
+        `row_mask` restricts counting to a boolean mask over corpus rows.
+        """
+        if row_mask is None:
+            counts = self.tag_counts
+        else:
+            counts = np.bincount(self._tag_of_posting[row_mask[self.rows]], minlength=len(self.vocab))
+        order = np.argsort(-counts, kind="stable")[:k]
+        return [(self.vocab[t], int(counts[t])) for t in order if counts[t] > 0]
+
+    def top_tags_for_rows(self, rows: np.ndarray, n_rows: int, k: int = 10) -> List[tuple]:
+        """`top_tags` restricted to the given row positions out of `n_rows` corpus rows."""
+        row_mask = np.zeros(n_rows, dtype=bool)
+        row_mask[np.asarray(rows, dtype=np.int64)] = True
+        return self.top_tags(row_mask, k)
@@ -0,0 +1,62 @@
+from typing import Dict, Tuple
+
+import numpy as np
+
+from .bm25 import rank_desc
+
+FUSION_METHODS = ("rrf", "weighted")
+
+# Candidates taken from each retriever before fusing
+HYBRID_DEPTH = 200
+
+
+def _minmax(scores: np.ndarray) -> np.ndarray:
+    if len(scores) == 0:
+        return scores
+    lo, hi = float(scores.min()), float(scores.max())
+    if hi - lo < 1e-12:
+        return np.ones_like(scores, dtype=np.float64)
+    return (scores - lo) / (hi - lo)
+
+
+def fuse(
+    keyword: Tuple[np.ndarray, np.ndarray],
+    semantic: Tuple[np.ndarray, np.ndarray],
+    n_rows: int,
+    method: str = "rrf",
+    alpha: float = 0.5,
+    rrf_k: int = 60,
+) -> Dict[str, np.ndarray]:
+    """
+    Fuse two ranked candidate lists, each (scores, rows) best first, into one
+    deterministic ranking over their union.
+
+    - rrf: sum of 1 / (rrf_k + rank) over the lists a row appears in
+    - weighted: alpha * semantic + (1 - alpha) * keyword, each min-max
+      normalized over its own candidates (0 when absent)
+
+    Ties break by row position. Returns rows, fused score and the per-source
+    raw scores (NaN where a source did not retrieve the row), all in ranked order.
+    """
+    if method not in FUSION_METHODS:
+        raise ValueError(f"Unknown fusion method '{method}', expected one of {FUSION_METHODS}")
+
+    kw_scores, kw_rows = keyword
+    sem_scores, sem_rows = semantic
+    fused = np.zeros(n_rows, dtype=np.float64)
+    if method == "rrf":
+        fused[kw_rows] += 1.0 / (rrf_k + 1 + np.arange(len(kw_rows)))
+        fused[sem_rows] += 1.0 / (rrf_k + 1 + np.arange(len(sem_rows)))
+    else:
+        fused[kw_rows] += (1 - alpha) * _minmax(kw_scores)
+        fused[sem_rows] += alpha * _minmax(sem_scores)
+
+    rows = np.union1d(kw_rows, sem_rows).astype(np.int64)
+    order = rank_desc(fused[rows], rows)
+    rows = rows[order]
+
+    raw_kw = np.full(n_rows, np.nan)
+    raw_kw[kw_rows] = kw_scores
+    raw_sem = np.full(n_rows, np.nan)
+    raw_sem[sem_rows] = sem_scores
+    return {"rows": rows, "score": fused[rows], "bm25": raw_kw[rows], "semantic": raw_sem[rows]}
@@ -0,0 +1,163 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict
+
+import numpy as np
+
+
+class InferenceBusy(Exception):
+    """Raised when the inference queue is full; routes turn it into a 503."""
+
+
+class InferenceTimeout(InferenceBusy):
+    """Raised when awaited external work (a queued encode) does not finish in time; also a 503."""
+
+
+class StageLatency:
+    """Rolling per-stage latency window (last `window` samples) with p50/p95/max in ms."""
+
+    def __init__(self, window: int = 1024):
+        self._samples: Dict[str, deque] = {}
+        self._counts: Dict[str, int] = {}
+        self._window = window
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, ms: float):
+        with self._lock:
+            self._samples.setdefault(stage, deque(maxlen=self._window)).append(ms)
+            self._counts[stage] = self._counts.get(stage, 0) + 1
+
+    @contextmanager
+    def track(self, stage: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, (time.perf_counter() - t0) * 1000.0)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            out = {}
+            for stage, samples in self._samples.items():
+                arr = np.fromiter(samples, dtype=np.float64)
+                out[stage] = {
+                    "count": self._counts[stage],
+                    "p50_ms": round(float(np.percentile(arr, 50)), 3),
+                    "p95_ms": round(float(np.percentile(arr, 95)), 3),
+                    "max_ms": round(float(arr.max()), 3),
+                }
+            return out
+
+
+# Shared by explore (keyword / card stages) and the inference executor (encode / search)
+stage_latency = StageLatency()
+
+
+class InferenceExecutor:
+    """
+    Dedicated thread pool for FAISS search, kept apart from the threadpool
+    that serves the sync routes so slow inference cannot starve cheap
+    endpoints. At most `max_queue` calls may be waiting or running; beyond
+    that `run` / `wait` raise InferenceBusy instead of queueing (load shedding).
+
+    Work that has its own thread (the query encoder's batcher) goes through
+    `wait`: admitted and timed like `run`, but no pool worker is held while
+    it waits, so encodes neither cap batch sizes nor block searches. A wait
+    longer than `wait_timeout` seconds gives up (InferenceTimeout) and frees
+    its slot, so a stalled encoder cannot hold admission forever.
+    """
+
+    def __init__(self, workers: int = 2, max_queue: int = 32, latency: StageLatency = stage_latency,
+                 wait_timeout: float = 10.0):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.wait_timeout = wait_timeout
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="inference")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._waiting = 0
+        self.completed = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.rejected = 0
+        self.latency = latency
+
+    def _admit(self):
+        with self._lock:
+            if self._pending >= self.max_queue:
+                self.rejected += 1
+                raise InferenceBusy(f"inference queue full ({self._pending}/{self.max_queue})")
+            self._pending += 1
+
+    def _release(self, ok: bool):
+        with self._lock:
+            self._pending -= 1
+            if ok:
+                self.completed += 1
+            else:
+                self.failed += 1
+
+    async def run(self, stage: str, fn: Callable, *args) -> Any:
+        """Run `fn(*args)` on the pool and await it; its run time is recorded under `stage`."""
+        self._admit()
+
+        def job():
+            with self._lock:
+                self._running += 1
+            try:
+                with self.latency.track(stage):
+                    return fn(*args)
+            finally:
+                with self._lock:
+                    self._running -= 1
+
+        ok = False
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(self._pool, job)
+            ok = True
+            return result
+        finally:
+            self._release(ok)
+
+    async def wait(self, stage: str, submit: Callable[..., Future], *args) -> Any:
+        """Await the concurrent Future returned by `submit(*args)` without a pool worker; timed under `stage`."""
+        self._admit()
+        with self._lock:
+            self._waiting += 1
+        ok = False
+        try:
+            with self.latency.track(stage):
+                # Cancelling the wrapper (timeout, client gone) cancels the submitted Future as well
+                result = await asyncio.wait_for(asyncio.wrap_future(submit(*args)), self.wait_timeout)
+            ok = True
+            return result
+        except asyncio.TimeoutError:
+            with self._lock:
+                self.timed_out += 1
+            raise InferenceTimeout(f"{stage} did not finish within {self.wait_timeout:g}s")
+        finally:
+            with self._lock:
+                self._waiting -= 1
+            self._release(ok)
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "queue_depth": self._pending - self._running - self._waiting,
+                "running": self._running,
+                "awaiting_external": self._waiting,
+                "completed": self.completed,
+                "failed": self.failed,
+                "timed_out": self.timed_out,
+                "rejected": self.rejected,
+            }
@@ -0,0 +1,91 @@
+import asyncio
+import threading
+import time
+import traceback
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional
+
+
+class LazyLoader:
+    """
+    Loads an expensive resource off the request path, once. `start()` begins
+    the load in a background thread (idempotent, callable from any thread);
+    `ensure(timeout)` lets an async caller start it and wait up to `timeout`
+    seconds. `load()` builds the resource, `apply(resource)` installs it
+    (on the loader thread). A failed load stays failed until `reset()`.
+    """
+
+    def __init__(self, name: str, load: Callable[[], Any], apply: Callable[[Any], None]):
+        self.name = name
+        self._load = load
+        self._apply = apply
+        self._lock = threading.Lock()
+        self._future: Optional[Future] = None
+        self.state = "not_loaded"  # not_loaded | loading | ready | failed
+        self.error: Optional[str] = None
+        self.load_seconds: Optional[float] = None
+        self.loaded_at: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.state == "ready"
+
+    def start(self) -> Future:
+        """Begin loading unless already loading/loaded; the Future resolves to True once ready."""
+        with self._lock:
+            if self._future is None:
+                self._future = Future()
+                self.state = "loading"
+                self.error = None
+                threading.Thread(
+                    target=self._run, args=(self._future,), name=f"lazy-{self.name}", daemon=True
+                ).start()
+            return self._future
+
+    def reset(self):
+        """Forget the loaded resource's status (e.g. after a data reload); the next start() loads again."""
+        with self._lock:
+            self._future = None
+            self.state = "not_loaded"
+            self.error = None
+
+    def _run(self, future: Future):
+        start = time.perf_counter()
+        try:
+            self._apply(self._load())
+        except Exception as e:
+            with self._lock:
+                if future is self._future:
+                    self.state = "failed"
+                    self.error = f"{type(e).__name__}: {e}"
+            print(f"❌ Loading {self.name} failed: {type(e).__name__}: {e}")
+            traceback.print_exc()
+            future.set_result(False)
+            return
+        with self._lock:
+            # A reset() while loading means this result is for superseded data
+            if future is self._future:
+                self.state = "ready"
+                self.load_seconds = round(time.perf_counter() - start, 3)
+                self.loaded_at = time.time()
+        future.set_result(True)
+
+    async def ensure(self, timeout: float) -> bool:
+        """Start the load if needed and wait up to `timeout` seconds; True if ready."""
+        future = self.start()
+        if not future.done():
+            if timeout <= 0:
+                return False
+            try:
+                await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout)
+            except asyncio.TimeoutError:
+                return False
+        return self.ready
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "error": self.error,
+            "load_seconds": self.load_seconds,
+            "loaded_at": self.loaded_at,
+        }
@@ -0,0 +1,81 @@
+import base64
+import hashlib
+import json
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+
+from .response_cache import ResponseCache
+
+# Longest ranking kept per (query, section); deeper pages are not offered
+MAX_RANKING = 500
+
+# Ranked row lists behind cursors; versioned by lifespan like the response cache
+ranking_cache = ResponseCache(max_entries=2048, max_bytes=16 * 1024 * 1024, ttl_seconds=1800.0)
+
+
+class CursorError(ValueError):
+    """Malformed cursor, or one that no longer refers to a cached ranking."""
+
+
+def encode_cursor(ranking_id: str, offset: int) -> str:
+    raw = json.dumps({"r": ranking_id, "o": offset}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        ranking_id, offset = str(data["r"]), int(data["o"])
+    except (ValueError, KeyError, TypeError):
+        raise CursorError("Malformed cursor")
+    if offset < 0:
+        raise CursorError("Malformed cursor")
+    return ranking_id, offset
+
+
+class RankingStore:
+    """
+    Ranked row-position lists behind pagination cursors.
+
+    Rankings (trending lists, explore sections) are stored under an id
+    derived from their params and the data version, so an evicted ranking is
+    simply rebuilt. Explore's shuffled first pages are drawn from a stored
+    ranking, never stored themselves.
+    """
+
+    def __init__(self, cache: ResponseCache = ranking_cache):
+        self.cache = cache
+
+    def _cache_key(self, ranking_id: str) -> tuple:
+        return self.cache.key("ranking", {"id": ranking_id})
+
+    def ranking_id(self, scope: str, params: dict) -> str:
+        raw = json.dumps([scope, sorted(params.items()), self.cache.data_version], default=str)
+        return hashlib.sha1(raw.encode()).hexdigest()[:16]
+
+    def put(self, rows: np.ndarray, ranking_id: str) -> str:
+        rows = np.asarray(rows, dtype=np.int32)[:MAX_RANKING]
+        rows.setflags(write=False)
+        self.cache.put(self._cache_key(ranking_id), rows)
+        return ranking_id
+
+    def get(self, ranking_id: str) -> Optional[np.ndarray]:
+        return self.cache.get(self._cache_key(ranking_id))
+
+    def get_or_build(self, scope: str, params: dict, build: Callable[[], np.ndarray]) -> Tuple[str, np.ndarray]:
+        ranking_id = self.ranking_id(scope, params)
+        rows = self.get(ranking_id)
+        if rows is None:
+            rows = np.asarray(build(), dtype=np.int32)[:MAX_RANKING]
+            self.put(rows, ranking_id)
+        return ranking_id, rows
+
+    @staticmethod
+    def next_cursor(ranking_id: str, rows: np.ndarray, offset: int, limit: int) -> Optional[str]:
+        end = offset + limit
+        return encode_cursor(ranking_id, end) if end < len(rows) else None
+
+
+rankings = RankingStore()
@@ -0,0 +1,217 @@
+import hashlib
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, InvalidStateError
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+
+def normalize_query(q: str, lowercase: bool = False) -> str:
+    """Cache key for a query: whitespace collapsed, lowercased only if the model's tokenizer lowercases anyway."""
+    q = " ".join(str(q).split())
+    return q.lower() if lowercase else q
+
+
+class QueryEmbeddingCache:
+    """
+    Bounded LRU of normalized query -> float32 embedding, with an optional
+    on-disk tier (one .npy per query under `disk_dir`, namespaced by model) so
+    popular queries survive restarts. Disk entries are promoted into memory on read.
+    """
+
+    def __init__(self, max_entries: int = 4096, disk_dir: Optional[str] = None, namespace: str = "default"):
+        self.max_entries = max_entries
+        self.disk_dir = os.path.join(disk_dir, namespace.replace("/", "__")) if disk_dir else None
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".npy")
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        with self._lock:
+            vec = self._entries.get(key)
+            if vec is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return vec
+
+        if self.disk_dir:
+            try:
+                vec = np.load(self._path(key))
+            except (OSError, ValueError):
+                vec = None
+            if vec is not None:
+                self._remember(key, vec)
+                with self._lock:
+                    self.disk_hits += 1
+                return vec
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, vec: np.ndarray):
+        vec = np.asarray(vec, dtype=np.float32)
+        vec.setflags(write=False)
+        self._remember(key, vec)
+        if self.disk_dir:
+            path = self._path(key)
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            try:
+                with open(tmp, "wb") as f:
+                    np.save(f, vec)
+                os.replace(tmp, path)
+            except OSError as e:
+                print(f"⚠️ Could not persist query embedding: {e}")
+
+    def _remember(self, key: str, vec: np.ndarray):
+        with self._lock:
+            self._entries[key] = vec
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "disk_dir": self.disk_dir,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+            }
+
+
+class BatchingEncoder:
+    """
+    Query encoder in front of a SentenceTransformer-like model.
+
+    Cache misses are queued for a background thread that waits up to
+    `window_ms` for more queries and encodes them together in one
+    `model.encode` call (at most `max_batch` per call), so concurrent explore
+    requests share a forward pass. `encode(q)` returns a (1, dim) float32
+    array of the normalized embedding, same as `model.encode([q])` did;
+    `submit(q)` returns a Future of it, so async callers can wait without
+    holding a thread.
+    """
+
+    def __init__(self, model, cache: QueryEmbeddingCache, window_ms: float = 5.0, max_batch: int = 32):
+        self.model = model
+        self.cache = cache
+        self.window = window_ms / 1000.0
+        self.max_batch = max_batch
+        tokenizer = getattr(model, "tokenizer", None)
+        self.lowercase = bool(getattr(tokenizer, "do_lower_case", False))
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._stopped = threading.Event()
+        self.batches = 0
+        self.batched_queries = 0
+        self._thread = threading.Thread(target=self._run, name="query-encoder", daemon=True)
+        self._thread.start()
+
+    def submit(self, q: str) -> Future:
+        key = normalize_query(q, self.lowercase)
+        future: Future = Future()
+        vec = self.cache.get(key)
+        if vec is not None:
+            future.set_result(vec.reshape(1, -1))
+        else:
+            self._queue.put((key, future))
+        return future
+
+    def encode(self, q: str, timeout: Optional[float] = 30.0) -> np.ndarray:
+        return self.submit(q).result(timeout=timeout)
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                first = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            if first is None:
+                break
+
+            batch = [first]
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._stopped.set()
+                    break
+                batch.append(item)
+
+            # One bad batch must not end the thread: every later submit() would hang
+            try:
+                self._encode_batch(batch)
+            except Exception as e:
+                print(f"❌ Query encoder batch failed: {e}")
+                for _, f in batch:
+                    try:
+                        f.set_exception(e)
+                    except InvalidStateError:  # resolved or cancelled already
+                        pass
+
+    def _encode_batch(self, batch: List[tuple]):
+        # Same query from several requests -> encoded once. Futures cancelled
+        # while queued (caller gone or timed out) are dropped; the rest are
+        # marked running, so they can no longer be cancelled under us.
+        pending: Dict[str, List[Future]] = {}
+        for key, future in batch:
+            if future.set_running_or_notify_cancel():
+                pending.setdefault(key, []).append(future)
+        if not pending:
+            return
+        texts = list(pending)
+
+        try:
+            vectors = self.model.encode(
+                texts,
+                normalize_embeddings=True,
+                show_progress_bar=False
+            ).astype('float32')
+        except Exception as e:
+            for futures in pending.values():
+                for f in futures:
+                    f.set_exception(e)
+            return
+
+        self.batches += 1
+        self.batched_queries += len(batch)
+        for text, vec in zip(texts, vectors):
+            self.cache.put(text, vec)
+            for f in pending[text]:
+                f.set_result(vec.reshape(1, -1))
+
+    def close(self):
+        self._stopped.set()
+        self._queue.put(None)
+        self._thread.join(timeout=2)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "cache": self.cache.stats(),
+            "batches": self.batches,
+            "batched_queries": self.batched_queries,
+            "avg_batch_size": round(self.batched_queries / self.batches, 2) if self.batches else 0.0,
+            "queue_depth": self._queue.qsize(),
+            "window_ms": self.window * 1000.0,
+            "max_batch": self.max_batch,
+        }
@@ -0,0 +1,147 @@
+import asyncio
+import time
+import traceback
+from typing import Any, Callable, Dict, Optional
+
+
+class SwapGate:
+    """
+    Lets a data swap happen between requests. HTTP requests `enter`/`exit` the
+    gate (SwapGateMiddleware); `swap(fn)` holds new requests back, waits for
+    the in-flight ones to finish, runs `fn` and reopens. Held requests are only
+    delayed, never dropped, and no request sees a mix of old and new data.
+
+    All methods run on the event loop thread (sync handlers run in the
+    threadpool, but the middleware wrapping them does not), so plain counters
+    suffice.
+    """
+
+    def __init__(self):
+        self._inflight = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._open = asyncio.Event()
+        self._open.set()
+        self._lock = asyncio.Lock()
+
+    async def enter(self):
+        while not self._open.is_set():
+            await self._open.wait()
+        self._inflight += 1
+        self._idle.clear()
+
+    def exit(self):
+        self._inflight -= 1
+        if self._inflight == 0:
+            self._idle.set()
+
+    async def swap(self, fn: Callable[[], None], drain_timeout: float) -> bool:
+        """Run `fn` with no request in flight; False if the drain timed out (fn ran anyway)."""
+        async with self._lock:
+            self._open.clear()
+            try:
+                try:
+                    await asyncio.wait_for(self._idle.wait(), drain_timeout)
+                    drained = True
+                except asyncio.TimeoutError:
+                    drained = False
+                fn()
+                return drained
+            finally:
+                self._open.set()
+
+
+class SwapGateMiddleware:
+    """ASGI middleware registering every HTTP request with a SwapGate."""
+
+    def __init__(self, app, gate: SwapGate):
+        self.app = app
+        self.gate = gate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        await self.gate.enter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.gate.exit()
+
+
+class Reloader:
+    """
+    Rebuilds the data in a worker thread with `build()` while the current data
+    keeps serving, then installs it with `apply(data)` through the SwapGate.
+    `version()` is a cheap token of the artifacts on disk (sizes + mtimes);
+    `watch` polls it and reloads when it changes.
+    """
+
+    def __init__(self, gate: SwapGate, build: Callable[[], Any], apply: Callable[[Any], None],
+                 version: Callable[[], str], drain_timeout: float = 10.0):
+        self.gate = gate
+        self.build = build
+        self.apply = apply
+        self.version = version
+        self.drain_timeout = drain_timeout
+        self.current_version = version()
+        self._task: Optional[asyncio.Task] = None
+        self.reloads = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+        self.last_reload_at: Optional[float] = None
+        self.last_build_seconds: Optional[float] = None
+        self.last_drained: Optional[bool] = None
+
+    @property
+    def in_progress(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def trigger(self) -> bool:
+        """Start a reload in the background; False if one is already running."""
+        if self.in_progress:
+            return False
+        self._task = asyncio.create_task(self.reload())
+        return True
+
+    async def reload(self):
+        version = self.version()
+        start = time.perf_counter()
+        try:
+            data = await asyncio.to_thread(self.build)
+        except Exception as e:
+            # Not retried until the artifacts change again
+            self.current_version = version
+            self.failures += 1
+            self.last_error = f"{type(e).__name__}: {e}"
+            print(f"❌ Reload failed, keeping the current data: {self.last_error}")
+            traceback.print_exc()
+            return
+        self.last_build_seconds = round(time.perf_counter() - start, 3)
+        self.last_drained = await self.gate.swap(lambda: self.apply(data), self.drain_timeout)
+        if not self.last_drained:
+            print(f"⚠️ Requests still running after {self.drain_timeout}s, swapped data anyway")
+        self.current_version = version
+        self.reloads += 1
+        self.last_error = None
+        self.last_reload_at = time.time()
+        print(f"✅ Reloaded data in {self.last_build_seconds:.2f}s (artifacts {version})")
+
+    async def watch(self, interval: float):
+        """Poll the artifacts every `interval` seconds and reload when they change."""
+        while True:
+            await asyncio.sleep(interval)
+            if not self.in_progress and self.version() != self.current_version:
+                print("🔄 Artifacts changed, reloading data")
+                self.trigger()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "artifacts_version": self.current_version,
+            "in_progress": self.in_progress,
+            "reloads": self.reloads,
+            "failures": self.failures,
+            "last_error": self.last_error,
+            "last_reload_at": self.last_reload_at,
+            "last_build_seconds": self.last_build_seconds,
+            "last_drained": self.last_drained,
+        }
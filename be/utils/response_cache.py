@@ -0,0 +1,162 @@
+import functools
+import inspect
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+
+def _approx_size(value: Any) -> int:
+    """Rough payload size in bytes (its JSON length, nbytes for arrays, body for rendered responses) used for the memory bound."""
+    if hasattr(value, "nbytes"):
+        return int(value.nbytes)
+    if isinstance(getattr(value, "body", None), bytes):
+        return len(value.body)
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return 0
+
+
+def normalize_params(params: Dict[str, Any]) -> tuple:
+    """
+    Order-independent key for endpoint params. Values arrive already coerced by
+    FastAPI (so ?limit=010 and ?limit=10 share an entry) and defaults filled in.
+    """
+    return tuple(sorted(params.items()))
+
+
+class ResponseCache:
+    """
+    In-process LRU cache for endpoint responses.
+
+    Keys are (route, normalized params, data version). `set_data_version` is
+    called by lifespan after every data load, so responses computed against an
+    older snapshot are never served. Entries also expire after `ttl_seconds`,
+    and the oldest entries are evicted once `max_entries` or `max_bytes` is hit.
+    Cached values are shared between requests and must not be mutated.
+    """
+
+    def __init__(self, max_entries: int = 512, max_bytes: int = 64 * 1024 * 1024, ttl_seconds: float = 300.0):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.data_version: Optional[str] = None
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()  # key -> (value, size, expires_at)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def configure(self, max_entries: int, max_bytes: int, ttl_seconds: float):
+        with self._lock:
+            self.max_entries = max_entries
+            self.max_bytes = max_bytes
+            self.ttl_seconds = ttl_seconds
+
+    def set_data_version(self, version: str):
+        """Switch to a new data snapshot; entries for the old one are dropped."""
+        with self._lock:
+            self.data_version = version
+            self._entries.clear()
+            self._bytes = 0
+
+    def key(self, route: str, params: Dict[str, Any]) -> tuple:
+        return (route, normalize_params(params), self.data_version)
+
+    def get(self, key: tuple):
+        """Cached value for `key`, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, size, expires_at = entry
+            if expires_at < time.monotonic():
+                self._drop(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: tuple, value: Any):
+        if key[-1] != self.data_version:
+            return  # computed against a snapshot that has since been replaced
+        size = _approx_size(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (value, size, time.monotonic() + self.ttl_seconds)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _drop(self, key: tuple):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "data_version": self.data_version,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+# Shared by all routers; sized from config and versioned by lifespan
+response_cache = ResponseCache()
+
+
+def cached_response(route: str, cache: ResponseCache = response_cache) -> Callable:
+    """
+    Decorator for idempotent endpoints: the response is cached per
+    (route, params, data version). Works for sync and async handlers and keeps
+    the wrapped signature, so FastAPI still sees the original query params.
+    Exceptions (e.g. HTTPException) are not cached.
+    """
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                key = cache.key(route, kwargs)
+                value = cache.get(key)
+                if value is None:
+                    value = await func(*args, **kwargs)
+                    cache.put(key, value)
+                return value
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = cache.key(route, kwargs)
+            value = cache.get(key)
+            if value is None:
+                value = func(*args, **kwargs)
+                cache.put(key, value)
+            return value
+        return wrapper
+
+    return decorator
@@ -0,0 +1,120 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .hashtag_index import HashtagColumn
+from .trend_stats import to_utc_aware
+
+NS_PER_HOUR = 3_600_000_000_000
+GRANULARITY_FREQ = {"hour": "h", "day": "D", "week": "W"}
+_NAT = np.iinfo(np.int64).min
+
+
+def _empty_series() -> Dict[str, List]:
+    return {"timestamps": [], "views": [], "engagement": [], "video_count": []}
+
+
+class _Cells:
+    """Non-empty (entity, hour) cells sorted by entity then hour, CSR-sliced per entity."""
+
+    def __init__(self, keys: np.ndarray, hours: np.ndarray, views: np.ndarray, eng: np.ndarray, n_keys: int):
+        h0 = int(hours.min()) if len(hours) else 0
+        span = int(hours.max()) - h0 + 1 if len(hours) else 1
+        cell = keys.astype(np.int64) * span + (hours - h0)
+        uniq, inverse = np.unique(cell, return_inverse=True)
+
+        has_eng = ~np.isnan(eng)
+        self.hours = uniq % span + h0
+        self.view_sum = np.bincount(inverse, weights=views, minlength=len(uniq))
+        self.eng_sum = np.bincount(inverse[has_eng], weights=eng[has_eng], minlength=len(uniq))
+        self.eng_count = np.bincount(inverse[has_eng], minlength=len(uniq))
+        self.video_count = np.bincount(inverse, minlength=len(uniq))
+        self.offsets = np.searchsorted(uniq // span, np.arange(n_keys + 1))
+
+    def slice(self, key: int) -> slice:
+        return slice(self.offsets[key], self.offsets[key + 1])
+
+
+class HourlyRollup:
+    """
+    Hourly rollup cube for /trending-detail, built once per data load.
+
+    For each scope ('recent' = latest quartile of the corpus, 'all') and entity
+    type (category, creator, hashtag) it stores per non-empty hour: view sum,
+    engagement sum/count and video count. Detail requests slice one entity out
+    of the cube and densify it at hour/day/week granularity.
+    """
+
+    def __init__(self, df: pd.DataFrame, hashtags: HashtagColumn):
+        taken_at = to_utc_aware(df['taken_at']) if 'taken_at' in df.columns else pd.Series(pd.NaT, index=df.index)
+        ts = pd.DatetimeIndex(taken_at).asi8
+        valid = ts != _NAT
+        self._valid = valid
+        self._hours = np.where(valid, ts // NS_PER_HOUR, 0)
+        self._views = np.nan_to_num(pd.to_numeric(df['view_count'], errors="coerce").to_numpy(dtype=np.float64))
+        self._eng = pd.to_numeric(df['engagement_rate'], errors="coerce").to_numpy(dtype=np.float64)
+
+        scopes = {"all": valid}
+        if valid.any():
+            cutoff = taken_at[valid].quantile(0.75)
+            scopes["recent"] = valid & (ts >= cutoff.value)
+        else:
+            scopes["recent"] = valid
+
+        cat_codes, cat_names = pd.factorize(df['category'])
+        creator_codes, creator_names = pd.factorize(df['owner_username'].str.lower())
+        pair_rows = np.repeat(np.arange(len(df)), np.diff(hashtags.offsets))
+        entities = {
+            "category": (cat_codes, np.arange(len(df)), cat_names),
+            "creator": (creator_codes, np.arange(len(df)), creator_names),
+            "hashtag": (hashtags.tag_ids, pair_rows, hashtags.vocab),
+        }
+
+        self._codes: Dict[str, Dict[str, int]] = {}
+        self._cells: Dict[tuple, _Cells] = {}
+        for kind, (keys, rows, names) in entities.items():
+            self._codes[kind] = {str(name): code for code, name in enumerate(names)}
+            for scope, mask in scopes.items():
+                keep = (keys >= 0) & mask[rows]
+                self._cells[(scope, kind)] = self._build(keys[keep], rows[keep], len(names))
+
+    def _build(self, keys: np.ndarray, rows: np.ndarray, n_keys: int) -> _Cells:
+        return _Cells(keys, self._hours[rows], self._views[rows], self._eng[rows], n_keys)
+
+    def timeseries(self, scope: str, kind: str, name: str, granularity: str = "hour") -> Optional[Dict[str, List]]:
+        """Series for one entity, or None if the entity is not in the cube."""
+        code = self._codes[kind].get(name)
+        if code is None:
+            return None
+        cells = self._cells[(scope, kind)]
+        return self._densify(cells, cells.slice(code), granularity)
+
+    def timeseries_for_rows(self, rows: np.ndarray, granularity: str = "hour") -> Dict[str, List]:
+        """Series for an arbitrary set of row positions (used when no cube entity matches)."""
+        rows = np.asarray(rows, dtype=np.int64)
+        rows = rows[self._valid[rows]]
+        cells = self._build(np.zeros(len(rows), dtype=np.int64), rows, 1)
+        return self._densify(cells, cells.slice(0), granularity)
+
+    @staticmethod
+    def _densify(cells: _Cells, sl: slice, granularity: str) -> Dict[str, List]:
+        hours = cells.hours[sl]
+        if len(hours) == 0:
+            return _empty_series()
+
+        frame = pd.DataFrame({
+            "views": cells.view_sum[sl],
+            "eng_sum": cells.eng_sum[sl],
+            "eng_count": cells.eng_count[sl],
+            "video_count": cells.video_count[sl],
+        }, index=pd.to_datetime(hours * NS_PER_HOUR, utc=True))
+        rolled = frame.resample(GRANULARITY_FREQ[granularity]).sum()
+        engagement = (rolled["eng_sum"] / rolled["eng_count"]).fillna(0)
+
+        return {
+            "timestamps": [str(ts) for ts in rolled.index],
+            "views": rolled["views"].tolist(),
+            "engagement": engagement.tolist(),
+            "video_count": rolled["video_count"].astype(int).tolist()
+        }
@@ -0,0 +1,91 @@
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from .hashtag_index import HashtagIndex
+from .trend_stats import to_utc_aware
+from .video_store import VideoStore
+
+_NAT = np.iinfo(np.int64).min
+
+
+class RowFilter:
+    """
+    Boolean row masks for category / creator / hashtag / date range / excluded
+    ids, built from per-row codes computed once at load - a request only does
+    integer comparisons over flat arrays, never a DataFrame scan.
+    """
+
+    def __init__(self, frame: pd.DataFrame, hashtag_index: HashtagIndex, videos: VideoStore):
+        self.n_rows = len(frame)
+        self._cat_codes, cats = pd.factorize(frame["category"])
+        self._cat_lookup = {str(c): i for i, c in enumerate(cats)}
+        self._creator_codes, creators = pd.factorize(frame["owner_username"].astype(str).str.lower())
+        self._creator_lookup = {c: i for i, c in enumerate(creators)}
+        taken_at = to_utc_aware(frame["taken_at"]) if "taken_at" in frame.columns else pd.Series(pd.NaT, index=frame.index)
+        self._ts = pd.DatetimeIndex(taken_at).asi8
+        self._recent = self._latest_quartile(frame, taken_at)
+        self._videos = videos
+        self._hashtags = hashtag_index
+
+    def _latest_quartile(self, frame: pd.DataFrame, taken_at: pd.Series) -> Optional[np.ndarray]:
+        """Rows in the latest 25% by taken_at (by Id without a taken_at column), None when there is no order."""
+        if "taken_at" in frame.columns:
+            valid = self._ts != _NAT
+            if not valid.any():
+                return None
+            cutoff = taken_at[valid].quantile(0.75)
+            return valid & (self._ts >= cutoff.value)
+        ids = frame["Id"].dropna() if "Id" in frame.columns else ()
+        if len(ids) == 0:
+            return None
+        return (frame["Id"] >= ids.quantile(0.75)).to_numpy()
+
+    def mask(
+        self,
+        category: Optional[str] = None,
+        creator: Optional[str] = None,
+        hashtag: Optional[str] = None,
+        date_from: Optional[pd.Timestamp] = None,
+        date_to: Optional[pd.Timestamp] = None,
+        exclude_ids: Optional[Iterable] = None,
+        recent: bool = False,
+    ) -> Optional[np.ndarray]:
+        """
+        Mask of rows passing every given filter, or None when no filter was
+        given. `recent` keeps the latest quartile (the trending 'recent' scope).
+        """
+        mask = None
+
+        def narrow(m: np.ndarray):
+            nonlocal mask
+            mask = m if mask is None else mask & m
+
+        if category:
+            code = self._cat_lookup.get(category, -2)
+            narrow(self._cat_codes == code)
+        if creator:
+            code = self._creator_lookup.get(creator.lstrip("@").lower(), -2)
+            narrow(self._creator_codes == code)
+        if hashtag:
+            tag_mask = np.zeros(self.n_rows, dtype=bool)
+            tag_id = self._hashtags.lookup(hashtag.lstrip("#"))
+            if tag_id is not None:
+                tag_mask[self._hashtags.rows_for(tag_id)] = True
+            narrow(tag_mask)
+        if date_from is not None or date_to is not None:
+            valid = self._ts != _NAT
+            if date_from is not None:
+                valid &= self._ts >= date_from.value
+            if date_to is not None:
+                valid &= self._ts <= date_to.value
+            narrow(valid)
+        if exclude_ids:
+            keep = np.ones(self.n_rows, dtype=bool)
+            keep[self._videos.rows_for_ids(exclude_ids)] = False
+            narrow(keep)
+        if recent and self._recent is not None:
+            narrow(self._recent)
+
+        return mask
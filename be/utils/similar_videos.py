@@ -0,0 +1,71 @@
+from typing import Tuple
+
+import numpy as np
+
+
+class SimilarVideos:
+    """
+    Video-to-video neighbours from the stored embeddings (no model encode).
+
+    Neighbours of the `top_n` most viewed videos are searched once at load
+    and kept in a compact (top_n, k) table of row positions and scores, so the
+    "related videos" rows on popular pages are a table lookup. Other videos
+    fall back to a FAISS search with their stored vector. Rows past the index
+    or the stored vectors (a misaligned build) have no neighbours.
+    """
+
+    def __init__(self, index, vectors: np.ndarray, view_counts: np.ndarray, top_n: int = 1000, k: int = 24,
+                 batch_size: int = 256):
+        self.index = index
+        self.vectors = vectors
+        self.k = k
+        self.n_vectors = min(index.ntotal, len(vectors))
+
+        views = np.nan_to_num(np.asarray(view_counts, dtype=np.float64))
+        self.n_rows = len(views)
+        top_rows = np.argsort(-views[:self.n_vectors], kind="stable")[:top_n]
+        self._slot = np.full(len(views), -1, dtype=np.int32)
+        self._slot[top_rows] = np.arange(len(top_rows), dtype=np.int32)
+
+        self.rows = np.full((len(top_rows), k), -1, dtype=np.int32)
+        self.scores = np.zeros((len(top_rows), k), dtype=np.float32)
+        for start in range(0, len(top_rows), batch_size):
+            chunk = top_rows[start:start + batch_size]
+            distances, ids = index.search(self._query(chunk), k + 1)
+            for i, row in enumerate(chunk):
+                scores, rows = self._drop_self(row, distances[i], ids[i], k)
+                self.rows[start + i, :len(rows)] = rows
+                self.scores[start + i, :len(rows)] = scores
+
+    @property
+    def precomputed(self) -> int:
+        return len(self.rows)
+
+    @property
+    def nbytes(self) -> int:
+        return self.rows.nbytes + self.scores.nbytes + self._slot.nbytes
+
+    def _query(self, rows: np.ndarray) -> np.ndarray:
+        return np.ascontiguousarray(self.vectors[rows], dtype=np.float32)
+
+    def _drop_self(self, row: int, distances: np.ndarray, ids: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        keep = (ids >= 0) & (ids < self.n_rows) & (ids != row)
+        return distances[keep][:k], ids[keep][:k]
+
+    def has_vector(self, row: int) -> bool:
+        return 0 <= row < self.n_vectors
+
+    def is_precomputed(self, row: int, k: int) -> bool:
+        return self._slot[row] >= 0 and k <= self.k
+
+    def lookup(self, row: int, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Neighbours from the table; only valid when `is_precomputed(row, k)`."""
+        slot = self._slot[row]
+        rows = self.rows[slot, :k]
+        found = rows >= 0
+        return self.scores[slot, :k][found], rows[found]
+
+    def search(self, row: int, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Neighbours via FAISS using the video's stored vector."""
+        distances, ids = self.index.search(self._query(np.asarray([row])), k + 1)
+        return self._drop_self(row, distances[0], ids[0], k)
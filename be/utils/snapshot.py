@@ -0,0 +1,277 @@
+import hashlib
+import json
+import os
+import time
+import traceback
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+import pyarrow.feather as feather
+
+from .data_loaders import extract_topic_keywords
+
+# Bump when the snapshot layout or the derived columns change
+SNAPSHOT_FORMAT = 2
+
+VIDEOS_TABLE = "videos.arrow"
+HASHTAG_STATS_TABLE = "hashtag_stats.arrow"
+EVENTS_TABLE = "events.arrow"
+META_FILE = "meta.json"
+# sha1 of each source keyed on (size, mtime), kept next to the snapshot so unchanged sources are not rehashed
+DIGEST_CACHE_FILE = "source_digests.json"
+
+
+# Source artifacts by role; callers pass the paths (config.SOURCE_FILES)
+SOURCE_KEYS = ["videos", "topics", "doc_topics", "hashtag_stats", "vidlink_map", "events"]
+
+
+# Source path -> {"size", "mtime_ns", "sha1"}; shared by every load in this process (reloads too)
+_digests: Dict[str, Dict[str, Any]] = {}
+_digest_files_read = set()
+
+
+def _read_digest_cache(cache_file: Optional[str]):
+    if not cache_file or cache_file in _digest_files_read:
+        return
+    _digest_files_read.add(cache_file)
+    try:
+        with open(cache_file, "r") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return
+    for path, entry in cached.items():
+        _digests.setdefault(path, entry)
+
+
+def _write_digest_cache(cache_file: Optional[str]):
+    if not cache_file:
+        return
+    tmp_path = f"{cache_file}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(cache_file) or ".", exist_ok=True)
+        with open(tmp_path, "w") as f:
+            json.dump(_digests, f)
+        os.replace(tmp_path, cache_file)
+    except OSError as e:
+        print(f"⚠️ Could not write {cache_file}: {e}")
+
+
+def _fingerprint(path: str, digest: bool = True) -> Optional[Dict[str, Any]]:
+    """
+    Size, mtime and (with `digest`) sha1 of a file, None when it is missing.
+    The sha1 is reused from the digest cache while size and mtime are unchanged.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    fp = {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+    if digest:
+        key = os.path.abspath(path)
+        cached = _digests.get(key)
+        if cached and cached["size"] == st.st_size and cached["mtime_ns"] == st.st_mtime_ns:
+            fp["sha1"] = cached["sha1"]
+        else:
+            h = hashlib.sha1()
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    h.update(chunk)
+            fp["sha1"] = h.hexdigest()
+            _digests[key] = dict(fp)
+    return fp
+
+
+def source_fingerprints(sources: Dict[str, str], digest_cache: Optional[str] = None) -> Dict[str, Optional[Dict[str, Any]]]:
+    """Fingerprint of every source artifact by role; stored in the snapshot meta."""
+    _read_digest_cache(digest_cache)
+    before = dict(_digests)
+    fingerprints = {k: _fingerprint(sources[k]) for k in SOURCE_KEYS}
+    if _digests != before:
+        _write_digest_cache(digest_cache)
+    return fingerprints
+
+
+def sources_version(fingerprints: Dict[str, Optional[Dict[str, Any]]]) -> str:
+    """Version token of the source artifacts' contents (stable across checkouts and copies)."""
+    h = hashlib.sha1()
+    for k in SOURCE_KEYS:
+        fp = fingerprints.get(k)
+        h.update(f"{k}:{fp['sha1'] if fp else 'missing'};".encode())
+    return h.hexdigest()[:12]
+
+
+def sources_match(sources: Dict[str, str], recorded: Dict[str, Optional[Dict[str, Any]]],
+                  digest_cache: Optional[str] = None) -> bool:
+    """
+    Whether the source artifacts still have the contents a snapshot was
+    compiled from. Size and mtime unchanged counts as unchanged; a file whose
+    mtime moved (a fresh checkout, a copy) is compared by content, hashed
+    once and then remembered in `digest_cache` under its new mtime.
+    """
+    _read_digest_cache(digest_cache)
+    before = dict(_digests)
+    try:
+        return _sources_match(sources, recorded)
+    finally:
+        if _digests != before:
+            _write_digest_cache(digest_cache)
+
+
+def _sources_match(sources: Dict[str, str], recorded: Dict[str, Optional[Dict[str, Any]]]) -> bool:
+    for k in SOURCE_KEYS:
+        expected = recorded.get(k)
+        current = _fingerprint(sources[k], digest=False)
+        if expected is None or current is None:
+            if expected is not current:
+                return False
+            continue
+        if current["size"] != expected["size"]:
+            return False
+        if current["mtime_ns"] != expected["mtime_ns"] and _fingerprint(sources[k])["sha1"] != expected["sha1"]:
+            return False
+    return True
+
+
+class DataBundle:
+    """Everything lifespan loads: merged videos, topics, hashtag stats and events."""
+
+    def __init__(self, df: pd.DataFrame, topics_data: Dict[str, str], topic_keywords: Dict[str, List[str]],
+                 hashtag_stats: pd.DataFrame, event_data: Optional[pd.DataFrame], version: str, source: str,
+                 fingerprints: Optional[Dict[str, Any]] = None):
+        self.df = df
+        self.topics_data = topics_data
+        self.topic_keywords = topic_keywords
+        self.hashtag_stats = hashtag_stats
+        self.event_data = event_data
+        self.version = version
+        self.source = source  # "snapshot" or "sources"
+        self.fingerprints = fingerprints  # source_fingerprints() the data was merged from
+
+
+def _attach_drive_links(df: pd.DataFrame, vidlink_map: pd.DataFrame) -> pd.DataFrame:
+    """Merge Drive file ids on Id and derive embed/thumbnail urls from them."""
+    # Numeric Id from the vidlink name (e.g., "0249.mp4" -> 249)
+    vidlink_map = vidlink_map.assign(
+        video_id=pd.to_numeric(vidlink_map['name'].astype(str).str.extract(r'^(\d+)', expand=False), errors='coerce')
+    )
+    df = df.merge(
+        vidlink_map[['video_id', 'id', 'webViewLink', 'preview_link', 'name']],
+        left_on='Id',
+        right_on='video_id',
+        how='left'
+    ).rename(columns={'id': 'drive_file_id', 'name': 'drive_filename'})
+
+    drive = df['drive_file_id']
+    has_drive = drive.notna()
+    df['embed_url'] = ("https://drive.google.com/file/d/" + drive.astype(str) + "/preview").where(has_drive, None)
+    # ALWAYS use Google Drive thumbnails (Instagram CDN gets blocked in browsers)
+    df['thumbnail_url'] = ("https://drive.google.com/thumbnail?id=" + drive.astype(str) + "&sz=w400").where(has_drive, None)
+    return df
+
+
+def merge_sources(sources: Dict[str, str], digest_cache: Optional[str] = None) -> DataBundle:
+    """Read every source artifact and build the merged frame the routes expect."""
+    fingerprints = source_fingerprints(sources, digest_cache)
+    version = sources_version(fingerprints)
+    df = pd.read_parquet(sources["videos"])
+    with open(sources["topics"], "r") as f:
+        topics_data = json.load(f)
+    doc_topics = pd.read_csv(sources["doc_topics"])
+    hashtag_stats = pd.read_parquet(sources["hashtag_stats"])
+
+    event_data = None
+    try:
+        vidlink_map = pd.read_csv(sources["vidlink_map"])
+        event_data = pd.read_parquet(sources["events"])
+        df = _attach_drive_links(df, vidlink_map)
+        print(f"✅ Merged {len(vidlink_map)} video links, "
+              f"drive_file_id for {df['drive_file_id'].notna().sum()}/{len(df)} videos")
+    except Exception as e:
+        print(f"⚠️ Could not load vidlink_map.csv: {e}")
+        traceback.print_exc()
+        df['embed_url'] = None
+        df['thumbnail_url'] = df.get('display_url')  # Fallback to IG thumbnail
+
+    # Merge topic assignments
+    df = df.merge(doc_topics, on='Id', how='left')
+    df['topic_name'] = df['Topic'].astype(str).map(topics_data)
+
+    topic_keywords = extract_topic_keywords(df, topics_data)
+    return DataBundle(df, topics_data, topic_keywords, hashtag_stats, event_data, version, "sources", fingerprints)
+
+
+def write_snapshot(bundle: DataBundle, out_dir: str) -> Dict[str, Any]:
+    """
+    Write `bundle` as uncompressed Arrow IPC (Feather v2) tables plus meta.json.
+    Uncompressed so loads can memory-map the tables instead of parsing them;
+    meta.json is written last (atomically), so a half-written snapshot is
+    never picked up.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    tables = {VIDEOS_TABLE: bundle.df, HASHTAG_STATS_TABLE: bundle.hashtag_stats}
+    if bundle.event_data is not None:
+        tables[EVENTS_TABLE] = bundle.event_data
+    for name, frame in tables.items():
+        feather.write_feather(frame.reset_index(drop=True), os.path.join(out_dir, name), compression="uncompressed")
+
+    meta = {
+        "format": SNAPSHOT_FORMAT,
+        "version": bundle.version,
+        "compiled_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "rows": len(bundle.df),
+        "tables": sorted(tables),
+        "sources": bundle.fingerprints,
+        "topics": bundle.topics_data,
+        "topic_keywords": bundle.topic_keywords,
+    }
+    tmp_path = os.path.join(out_dir, META_FILE + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(meta, f, ensure_ascii=False)
+    os.replace(tmp_path, os.path.join(out_dir, META_FILE))
+    return meta
+
+
+def read_meta(snapshot_dir: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(os.path.join(snapshot_dir, META_FILE), "r") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return meta if meta.get("format") == SNAPSHOT_FORMAT else None
+
+
+def load_snapshot(snapshot_dir: str, meta: Dict[str, Any]) -> DataBundle:
+    """
+    The snapshot's tables as DataFrames. Numeric columns without nulls stay
+    zero-copy (read-only) views of the memory-mapped file, so their pages are
+    shared by workers loading the same snapshot; string and nullable columns
+    are converted into each process's own memory.
+    """
+    def table(name: str) -> pd.DataFrame:
+        arrow_table = feather.read_table(os.path.join(snapshot_dir, name), memory_map=True)
+        # split_blocks: no consolidation copy; self_destruct: Arrow buffers released as columns convert
+        return arrow_table.to_pandas(split_blocks=True, self_destruct=True)
+
+    event_data = table(EVENTS_TABLE) if EVENTS_TABLE in meta["tables"] else None
+    return DataBundle(table(VIDEOS_TABLE), meta["topics"], meta["topic_keywords"],
+                      table(HASHTAG_STATS_TABLE), event_data, meta["version"], "snapshot", meta["sources"])
+
+
+def load_data(sources: Dict[str, str], snapshot_dir: Optional[str]) -> DataBundle:
+    """
+    The compiled snapshot when there is one for the current sources, else a
+    merge from the source artifacts. A snapshot whose sources' contents have
+    changed since compiling is skipped; one deployed without its sources is
+    used as is.
+    """
+    meta = read_meta(snapshot_dir) if snapshot_dir else None
+    digest_cache = os.path.join(snapshot_dir, DIGEST_CACHE_FILE) if snapshot_dir else None
+    if meta is not None:
+        sources_present = any(os.path.exists(sources[k]) for k in SOURCE_KEYS)
+        if not sources_present or sources_match(sources, meta["sources"], digest_cache):
+            return load_snapshot(snapshot_dir, meta)
+        print(f"⚠️ Snapshot in {snapshot_dir} is stale (sources changed), "
+              f"merging sources - recompile with: python -m scripts.compile_snapshot")
+    elif snapshot_dir:
+        print(f"ℹ️ No snapshot in {snapshot_dir}, merging sources - compile one with: python -m scripts.compile_snapshot")
+    return merge_sources(sources, digest_cache)
@@ -0,0 +1,33 @@
+import time
+from typing import Any, Dict, List
+
+
+class StartupReport:
+    """
+    Per-step load timings for lifespan. Call `lap(name)` after each step; the
+    time since the previous lap is attributed to it.
+    """
+
+    def __init__(self):
+        self._start = time.perf_counter()
+        self._last = self._start
+        self.steps: List[Dict[str, Any]] = []
+
+    def lap(self, name: str, **info):
+        now = time.perf_counter()
+        self.steps.append({"step": name, "seconds": round(now - self._last, 3), **info})
+        self._last = now
+
+    @property
+    def total_seconds(self) -> float:
+        return round(self._last - self._start, 3)
+
+    def print(self):
+        print("⏱️ Startup timings:")
+        for step in self.steps:
+            extra = ", ".join(f"{k}={v}" for k, v in step.items() if k not in ("step", "seconds"))
+            print(f"   {step['step']:<24} {step['seconds']:>8.3f}s" + (f"  ({extra})" if extra else ""))
+        print(f"   {'total':<24} {self.total_seconds:>8.3f}s")
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"total_seconds": self.total_seconds, "steps": self.steps}
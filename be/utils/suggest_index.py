@@ -0,0 +1,123 @@
+import re
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Set
+
+import numpy as np
+import pandas as pd
+
+from .text_processing import is_interesting_query
+
+# Prefixes shorter than this get no typo matches: one edit away from "ab" is nearly everything
+FUZZY_MIN_LENGTH = 3
+
+# Fuzzy candidates are pruned with the characters that follow each key prefix up to this length
+_NEXT_DEPTH = 12
+
+_SEPARATORS = re.compile(r"[\s_]+")
+_END = "\U0010ffff"
+
+
+def normalize_key(text: str) -> str:
+    """Lowercased, '#' dropped, underscores/whitespace collapsed to single spaces."""
+    return _SEPARATORS.sub(" ", str(text).lower().lstrip("#")).strip()
+
+
+class SuggestIndex:
+    """
+    Search-as-you-type over topic names, hashtags and topic keyword phrases.
+
+    Every word start of an entry is a key ("1_latihan_gerakan_otot_up" is
+    found by "lat", "gerakan o", "otot"...), all keys in one sorted list, so a
+    prefix is a bisect range. Entries are stored by descending popularity
+    (mean_eng: hashtag_stats.mean_eng, or the mean engagement_rate of a
+    topic's videos for topic names and phrases), so the top-k of a range are
+    its k smallest distinct entry ids. `suggest(..., fuzzy=True)` tops up with
+    keys one edit (insert, delete, substitute, transpose) away from the prefix.
+    Suggestion dicts are shared and must not be mutated.
+    """
+
+    def __init__(self, topics_data: Dict[str, str], topic_keywords: Dict[str, List[str]],
+                 hashtag_stats: Optional[pd.DataFrame], frame: pd.DataFrame):
+        topic_eng = frame.groupby("topic_name")["engagement_rate"].mean().to_dict() if "topic_name" in frame else {}
+        candidates: Dict[str, tuple] = {}  # text -> (score, suggestion); duplicates keep the best score
+
+        def add(text: str, kind: str, icon: str, score: float, min_length: int = 5):
+            score = float(score) if pd.notna(score) else 0.0
+            if not is_interesting_query(text.lstrip("#"), min_length=min_length):
+                return
+            if text not in candidates or score > candidates[text][0]:
+                candidates[text] = (score, {"text": text, "type": kind, "icon": icon})
+
+        for topic_name in topics_data.values():
+            add(topic_name, "category", "🏷", topic_eng.get(topic_name, 0.0))
+        if hashtag_stats is not None and len(hashtag_stats) > 0:
+            for tag, score in hashtag_stats.groupby(hashtag_stats["tag"].astype(str))["mean_eng"].max().items():
+                add(f"#{tag}", "hashtag", "#️⃣", score, min_length=3)
+        for topic_name, keywords in topic_keywords.items():
+            for first, second in zip(keywords, keywords[1:]):
+                add(f"{first} {second}", "topic_phrase", "🔍", topic_eng.get(topic_name, 0.0))
+
+        # Most popular first (ties by text), so entry id order is ranking order
+        ranked = sorted(candidates.values(), key=lambda c: (-c[0], c[1]["text"]))
+        self.entries: List[Dict[str, Any]] = [suggestion for _, suggestion in ranked]
+        self.scores = np.asarray([score for score, _ in ranked], dtype=np.float64)
+
+        keys = []
+        for entry_id, suggestion in enumerate(self.entries):
+            words = normalize_key(suggestion["text"]).split(" ")
+            keys.extend((" ".join(words[i:]), entry_id) for i in range(len(words)))
+        keys.sort()
+        self._keys: List[str] = [key for key, _ in keys]
+        self._entry_of = np.asarray([entry_id for _, entry_id in keys], dtype=np.int32)
+        self._alphabet = "".join(sorted(set("".join(self._keys))))
+        following = defaultdict(set)
+        for key in set(self._keys):
+            for i in range(min(len(key), _NEXT_DEPTH)):
+                following[key[:i]].add(key[i])
+        self._next: Dict[str, str] = {head: "".join(sorted(chars)) for head, chars in following.items()}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _span(self, prefix: str) -> tuple:
+        lo = bisect_left(self._keys, prefix)
+        if lo == len(self._keys) or not self._keys[lo].startswith(prefix):
+            return lo, lo
+        return lo, bisect_left(self._keys, prefix + _END, lo)
+
+    def _chars_after(self, head: str) -> str:
+        return self._next.get(head, "") if len(head) < _NEXT_DEPTH else self._alphabet
+
+    def _edits(self, prefix: str) -> Set[str]:
+        """
+        Prefixes one edit from `prefix` that some key starts with the head of.
+        An insertion at the end is already an exact-prefix match, so it is skipped.
+        """
+        out = set()
+        for i in range(len(prefix)):
+            head, tail = prefix[:i], prefix[i:]
+            out.add(head + tail[1:])
+            if len(tail) > 1:
+                out.add(head + tail[1] + tail[0] + tail[2:])
+            for c in self._chars_after(head):
+                out.add(head + c + tail[1:])
+                out.add(head + c + tail)
+        out.discard(prefix)
+        out.discard("")
+        return out
+
+    def suggest(self, q: str, limit: int = 10, fuzzy: bool = False) -> List[Dict[str, Any]]:
+        """Top-`limit` entries with a word starting with `q`, most popular first; typo matches after exact ones."""
+        prefix = normalize_key(q)
+        if not prefix:
+            return []
+        lo, hi = self._span(prefix)
+        found = np.unique(self._entry_of[lo:hi])[:limit]
+        if fuzzy and len(found) < limit and len(prefix) >= FUZZY_MIN_LENGTH:
+            spans = [span for span in map(self._span, self._edits(prefix)) if span[0] < span[1]]
+            if spans:
+                near = np.unique(np.concatenate([self._entry_of[lo:hi] for lo, hi in spans]))
+                near = near[~np.isin(near, found)][:limit - len(found)]
+                found = np.concatenate([found, near])
+        return [self.entries[i] for i in found.tolist()]
@@ -0,0 +1,99 @@
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+NGRAM = 3
+_REGEX_META = set(".^$*+?{}[]\\|()")
+_EMPTY = np.empty(0, dtype=np.int32)
+
+
+def _grams(s: str, n: int = NGRAM) -> set:
+    return {s[i:i + n] for i in range(len(s) - n + 1)}
+
+
+class NgramIndex:
+    """
+    Character trigram inverted index over one text column.
+
+    `contains(q)` returns the sorted row positions whose value contains `q`
+    as a plain substring - the same rows as `Series.str.contains(q, regex=False)`.
+    Candidates come from intersecting the posting lists of the query's
+    trigrams and are then verified, so results are exact.
+    """
+
+    def __init__(self, values: Iterable[str]):
+        self.values: List[str] = list(values)
+        postings: Dict[str, list] = defaultdict(list)
+        for pos, value in enumerate(self.values):
+            for gram in _grams(value):
+                postings[gram].append(pos)
+        self.postings: Dict[str, np.ndarray] = {
+            gram: np.asarray(rows, dtype=np.int32) for gram, rows in postings.items()
+        }
+
+    def __len__(self):
+        return len(self.values)
+
+    def contains(self, q: str) -> np.ndarray:
+        if not q:
+            return np.arange(len(self.values), dtype=np.int32)
+
+        if len(q) < NGRAM:
+            # Too short for trigrams - a plain scan is still cheaper than pandas
+            return np.asarray([i for i, v in enumerate(self.values) if q in v], dtype=np.int32)
+
+        lists = []
+        for gram in _grams(q):
+            rows = self.postings.get(gram)
+            if rows is None:
+                return _EMPTY
+            lists.append(rows)
+
+        lists.sort(key=len)
+        candidates = lists[0]
+        for rows in lists[1:]:
+            candidates = np.intersect1d(candidates, rows, assume_unique=True)
+            if len(candidates) == 0:
+                return _EMPTY
+
+        return np.asarray([i for i in candidates if q in self.values[i]], dtype=np.int32)
+
+
+class TextIndex:
+    """
+    Named NgramIndex per field, each built on its first query (or all at once
+    by `warm()`), so startup does not wait for indexes no request has needed yet.
+    """
+
+    def __init__(self, fields: Dict[str, Iterable[str]]):
+        self._values: Dict[str, Iterable[str]] = dict(fields)
+        self.fields: Dict[str, NgramIndex] = {}
+        self._lock = threading.Lock()
+
+    def field(self, name: str) -> NgramIndex:
+        index = self.fields.get(name)
+        if index is None:
+            with self._lock:
+                index = self.fields.get(name)
+                if index is None:
+                    index = self.fields[name] = NgramIndex(self._values[name])
+        return index
+
+    def warm(self):
+        for name in self._values:
+            self.field(name)
+
+    def contains(self, field: str, q: str) -> np.ndarray:
+        return self.field(field).contains(q)
+
+    def contains_any(self, fields: List[str], q: str) -> np.ndarray:
+        """Rows where any of `fields` contains `q` (OR across fields), sorted."""
+        hits = [self.contains(f, q) for f in fields]
+        return np.unique(np.concatenate(hits)) if hits else _EMPTY
+
+
+def is_plain_pattern(q: str) -> bool:
+    """True when `q` has no regex metacharacters, so regex and substring matching agree."""
+    return not any(c in _REGEX_META for c in q)
@@ -55,15 +55,25 @@ def normalize_text(s: str) -> str:
     return s
 
 
-def as_list(x) -> List[str]:
-    """Convert various formats to list"""
-    if isinstance(x, list):
-        return x
-    if isinstance(x, str):
-        if x.startswith("[") and x.endswith("]"):
-            try:
-                return [t.strip().strip("'\"") for t in x[1:-1].split(",") if t.strip()]
-            except Exception:
-                pass
-        return [t.strip("# ").strip() for t in re.split(r"[;, ]+", x) if t.strip()]
-    return []
\ No newline at end of file
+def parse_hashtags(x) -> List[str]:
+    """
+    Canonical hashtag parser - the only place raw hashtag values are parsed.
+    Accepts lists or strings like "['a', 'b']", "a, b" or "#a #b" and returns
+    unique, lowercased tags in order, without '#', quotes or 'none'/'nan'.
+    """
+    if isinstance(x, (list, tuple)):
+        items = x
+    elif isinstance(x, str):
+        s = x.strip()
+        if s.startswith("[") and s.endswith("]"):
+            s = s[1:-1]
+        items = re.split(r"[;,\s]+", s)
+    else:
+        return []
+
+    tags = []
+    for t in items:
+        t = str(t).strip().strip("#'\"").strip().lower()
+        if t and t not in ("none", "nan"):
+            tags.append(t)
+    return list(dict.fromkeys(tags))
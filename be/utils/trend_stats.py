@@ -0,0 +1,193 @@
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .hashtag_index import HashtagColumn
+
+ALL_CATEGORIES = "All categories"
+BUCKETS = ("recent", "all")
+MAX_TAGS = 200
+MAX_CREATORS = 100
+_NAT = np.iinfo(np.int64).min
+
+
+def to_utc_aware(s: pd.Series) -> pd.Series:
+    return pd.to_datetime(s, errors="coerce", utc=True)
+
+
+def trend_lines(keys: np.ndarray, ts_ns: np.ndarray, n_keys: int, points: int = 6) -> np.ndarray:
+    """
+    6-point sparklines for many entities in one vectorized pass.
+
+    `keys[i]` is the entity code of item i and `ts_ns[i]` its timestamp
+    (int64 ns, NaT = int64 min, ignored). Items are sorted once by
+    (entity, time); each entity's items are then split into `points`
+    consecutive buckets of max(n // points, 1) items, the last bucket taking
+    the remainder. Returns an (n_keys, points) int array of bucket counts.
+    """
+    valid = (ts_ns != _NAT) & (keys >= 0)
+    keys, ts_ns = keys[valid], ts_ns[valid]
+
+    order = np.lexsort((ts_ns, keys))
+    keys = keys[order]
+
+    sizes = np.bincount(keys, minlength=n_keys)
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    rank = np.arange(len(keys)) - starts[keys]
+    bucket_size = np.maximum(sizes // points, 1)
+    bucket = np.minimum(rank // bucket_size[keys], points - 1)
+
+    counts = np.bincount(keys * points + bucket, minlength=n_keys * points)
+    return counts.reshape(n_keys, points)
+
+
+class TrendStats:
+    """
+    Trend statistics for /trending-now, computed once per data load.
+
+    For every (category scope, time bucket) - scope is ALL_CATEGORIES or one
+    category, bucket is 'recent' (latest quartile of the scope) or 'all' - it
+    keeps per-entity (category / hashtag / creator) video counts, view sums,
+    engagement sums and max timestamps, and the trends ranked by share growth.
+    A request is then a lookup, a slice and formatting of the "hours ago" field.
+    """
+
+    def __init__(self, df: pd.DataFrame, hashtags: HashtagColumn):
+        self._frame = pd.DataFrame({
+            'taken_at_dt': to_utc_aware(df['taken_at']) if 'taken_at' in df.columns
+            else pd.Series(pd.NaT, index=df.index, dtype="datetime64[ns, UTC]")
+        })
+        self._ts = self._frame['taken_at_dt'].array.asi8.copy()
+        self._views = np.nan_to_num(pd.to_numeric(df['view_count'], errors="coerce").to_numpy(dtype=np.float64))
+        self._eng = pd.to_numeric(df['engagement_rate'], errors="coerce").to_numpy(dtype=np.float64)
+        self._cat_codes, self._cat_names = pd.factorize(df['category'], sort=True)
+        self._creator_codes, self._creator_names = pd.factorize(df['owner_username'], sort=True)
+        self._pair_rows = np.repeat(np.arange(len(df)), np.diff(hashtags.offsets))
+        self._pair_tags = hashtags.tag_ids.astype(np.int64)
+        self._tag_names = hashtags.vocab
+
+        self._ranked: Dict[tuple, List[Dict[str, Any]]] = {}
+        scopes = [(ALL_CATEGORIES, np.ones(len(df), dtype=bool))]
+        scopes += [(str(name), self._cat_codes == code) for code, name in enumerate(self._cat_names)]
+        for scope, scope_mask in scopes:
+            recent_mask = self._recent(scope_mask)
+            for bucket in BUCKETS:
+                selected = recent_mask if bucket == 'recent' else scope_mask
+                self._ranked[(scope, bucket)] = self._rank(selected, scope_mask)
+
+    def trends(self, category: Optional[str], time_range: str, limit: int, now_utc: pd.Timestamp) -> List[Dict[str, Any]]:
+        scope = category if category and category != ALL_CATEGORIES else ALL_CATEGORIES
+        ranked = self._ranked.get((scope, time_range), [])
+        out = []
+        for entry in ranked[:limit]:
+            trend = dict(entry)
+            ts = trend.pop('_max_ts')
+            trend['time'] = "N/A" if pd.isna(ts) else f"{int((now_utc - ts).total_seconds() / 3600)}h ago"
+            out.append(trend)
+        return out
+
+    def _recent(self, scope_mask: np.ndarray) -> np.ndarray:
+        """Latest quartile of the scope by timestamp (the whole scope if it has no timestamps)."""
+        valid = scope_mask & (self._ts != _NAT)
+        if not valid.any():
+            return scope_mask
+        cutoff = self._frame['taken_at_dt'][valid].quantile(0.75)
+        return valid & (self._ts >= cutoff.value)
+
+    def _aggregate(self, keys: np.ndarray, rows: np.ndarray, n_keys: int) -> Dict[str, np.ndarray]:
+        """Per-key count, view sum, engagement sum/count, max timestamp and dominant category."""
+        keep = keys >= 0
+        keys, rows = keys[keep], rows[keep]
+        eng = self._eng[rows]
+        has_eng = ~np.isnan(eng)
+        max_ts = np.full(n_keys, _NAT, dtype=np.int64)
+        np.maximum.at(max_ts, keys, self._ts[rows])
+
+        cats = self._cat_codes[rows]
+        has_cat = cats >= 0
+        n_cats = max(len(self._cat_names), 1)
+        cat_counts = np.bincount(keys[has_cat] * n_cats + cats[has_cat], minlength=n_keys * n_cats)
+        cat_counts = cat_counts.reshape(n_keys, n_cats)
+
+        return {
+            'count': np.bincount(keys, minlength=n_keys),
+            'view_sum': np.bincount(keys, weights=self._views[rows], minlength=n_keys),
+            'eng_sum': np.bincount(keys[has_eng], weights=eng[has_eng], minlength=n_keys),
+            'eng_count': np.bincount(keys[has_eng], minlength=n_keys),
+            'max_ts': max_ts,
+            'top_category': np.where(cat_counts.sum(axis=1) > 0, cat_counts.argmax(axis=1), -1),
+            'timeseries': trend_lines(keys, self._ts[rows], n_keys),
+        }
+
+    @staticmethod
+    def _counts(keys: np.ndarray, n_keys: int) -> np.ndarray:
+        return np.bincount(keys[keys >= 0], minlength=n_keys)
+
+    def _entry(self, name: str, kind: str, key: int, agg, all_counts, sel_total, all_total, related: str) -> Dict[str, Any]:
+        sel_share = float(agg['count'][key]) / sel_total
+        all_share = float(all_counts[key]) / all_total
+        growth_pct = 100.0 * ((sel_share - all_share) / all_share) if all_share > 0 else 100.0
+        eng_count = agg['eng_count'][key]
+        max_ts = agg['max_ts'][key]
+        return {
+            'name': name,
+            'type': kind,
+            'volume': f"{int(agg['count'][key])}+",
+            'growth': f"+{int(growth_pct)}%",
+            '_max_ts': pd.NaT if max_ts == _NAT else pd.Timestamp(max_ts, tz="UTC"),
+            'total_views': int(agg['view_sum'][key]),
+            'avg_engagement': float(agg['eng_sum'][key] / eng_count) if eng_count else float('nan'),
+            'related_tag': related,
+            'timeseries': agg['timeseries'][key].tolist(),
+        }
+
+    def _related(self, agg, key: int) -> str:
+        code = agg['top_category'][key]
+        return str(self._cat_names[code]) if code >= 0 else ''
+
+    def _rank(self, selected: np.ndarray, scope_mask: np.ndarray) -> List[Dict[str, Any]]:
+        if not selected.any():
+            return []
+
+        sel_rows = np.flatnonzero(selected)
+        scope_rows = np.flatnonzero(scope_mask)
+        trends = []
+
+        # ---------- Categories ----------
+        n_cats = len(self._cat_names)
+        sel = self._aggregate(self._cat_codes[sel_rows], sel_rows, n_cats)
+        all_counts = self._counts(self._cat_codes[scope_rows], n_cats)
+        sel_total, all_total = max(int(sel['count'].sum()), 1), max(int(all_counts.sum()), 1)
+        for code in np.flatnonzero(sel['count']):
+            name = self._cat_names[code]
+            if str(name).strip().lower() == 'none':
+                continue
+            trends.append(self._entry(name, 'category', code, sel, all_counts, sel_total, all_total, ''))
+
+        # ---------- Hashtags ----------
+        n_tags = len(self._tag_names)
+        pair_sel = selected[self._pair_rows]
+        pair_scope = scope_mask[self._pair_rows]
+        sel = self._aggregate(self._pair_tags[pair_sel], self._pair_rows[pair_sel], n_tags)
+        all_counts = self._counts(self._pair_tags[pair_scope], n_tags)
+        sel_total, all_total = max(int(sel['count'].sum()), 1), max(int(all_counts.sum()), 1)
+        top = np.argsort(-sel['count'], kind="stable")[:MAX_TAGS]
+        for tag in top:
+            if sel['count'][tag] < 2:
+                continue
+            trends.append(self._entry(f"#{self._tag_names[tag]}", 'hashtag', tag, sel, all_counts,
+                                      sel_total, all_total, self._related(sel, tag)))
+
+        # ---------- Creators ----------
+        n_creators = len(self._creator_names)
+        sel = self._aggregate(self._creator_codes[sel_rows], sel_rows, n_creators)
+        all_counts = self._counts(self._creator_codes[scope_rows], n_creators)
+        sel_total, all_total = max(int(sel['count'].sum()), 1), max(int(all_counts.sum()), 1)
+        creators = np.flatnonzero(sel['count'] >= 2)[:MAX_CREATORS]
+        for code in creators:
+            trends.append(self._entry(f"@{self._creator_names[code]}", 'creator', code, sel, all_counts,
+                                      sel_total, all_total, self._related(sel, code)))
+
+        trends.sort(key=lambda x: int(str(x['growth']).replace('+', '').replace('%', '') or 0), reverse=True)
+        return trends
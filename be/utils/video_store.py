@@ -0,0 +1,57 @@
+from typing import Any, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .cards import CardTable
+
+
+class VideoStore:
+    """
+    Video Id -> corpus row, built once at load as a sorted Id array, so a batch
+    of ids resolves with one `searchsorted` instead of a DataFrame scan per id.
+    Duplicate Ids resolve to their first row, like `df[df['Id'] == id].iloc[0]`.
+    """
+
+    def __init__(self, ids: pd.Series, cards: Optional[CardTable] = None):
+        ids = pd.to_numeric(ids, errors="coerce").to_numpy(dtype=np.float64)
+        rows = np.flatnonzero(~np.isnan(ids))
+        keys = ids[rows].astype(np.int64)
+        order = np.argsort(keys, kind="stable")
+        self._ids = keys[order]
+        self._rows = rows[order]
+        self.cards = cards
+
+    def __len__(self):
+        return len(self._ids)
+
+    def lookup(self, ids: Iterable) -> np.ndarray:
+        """Row position per id, in order; -1 where the id is unknown."""
+        ids = np.fromiter((int(i) for i in ids), dtype=np.int64)
+        out = np.full(len(ids), -1, dtype=np.int64)
+        if len(self._ids):
+            pos = np.minimum(np.searchsorted(self._ids, ids), len(self._ids) - 1)
+            hit = self._ids[pos] == ids
+            out[hit] = self._rows[pos[hit]]
+        return out
+
+    def row_of(self, video_id: int) -> Optional[int]:
+        row = int(self.lookup([video_id])[0])
+        return row if row >= 0 else None
+
+    def rows_for_ids(self, ids: Iterable) -> np.ndarray:
+        """Row positions of the given video ids (unknown ids are skipped)."""
+        rows = self.lookup(ids)
+        return rows[rows >= 0]
+
+    def get_many(self, ids: Iterable, kind: str = "video", serialized: bool = False, **options) -> List[Optional[Any]]:
+        """
+        Cards for `ids`, aligned with them (None for unknown ids), built in one
+        CardTable call. `kind` is "video", "trend" or "event"; `options` go to
+        the matching CardTable method (e.g. title/fields for trend cards).
+        """
+        rows = self.lookup(ids)
+        known = rows >= 0
+        build = {"video": self.cards.video_cards, "trend": self.cards.trend_cards, "event": self.cards.event_cards}[kind]
+        built = iter(build(rows[known], serialized=serialized, **options))
+        return [next(built) if ok else None for ok in known.tolist()]